@@ -0,0 +1,105 @@
+"""Komut yönlendirme maliyeti ölçümü
+
+Gerçekçi Türkçe komutlardan oluşan bir derlem üzerinde eski yöntemi (pattern'leri
+tek tek re.match ile denemek) CommandDispatcher ile karşılaştırır ve her komutun
+iki yöntemde de aynı kurala gittiğini doğrular.
+
+Kullanım (kahya_app klasöründen):
+    python benchmarks/bench_command_dispatch.py
+"""
+import os
+import re
+import sys
+import timeit
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.command_patterns import NATURAL_PATTERNS, COMMAND_PATTERNS
+from src.core.command_dispatcher import CommandDispatcher
+
+CORPUS = [
+    "not al yarın market alışverişi",
+    "kaydet toplantı notları hazırlanacak",
+    "notlarım",
+    "perşembe günü dişçi randevusu",
+    "11 temmuz hatırlatıcısını sil",
+    "sil doğum günü",
+    "hatırlat annemi ara",
+    "saat 14:30 proje toplantısı",
+    "hatırlatıcılar",
+    "bu ayın 15 günü kira ödemesi",
+    "20 ağustos tatil başlıyor",
+    "12/09 sınav var",
+    "03.11 fatura son gün",
+    "yapılacak çamaşırları as",
+    "listele yapılacak",
+    "görevler",
+    "ara python dekoratör örnekleri",
+    "aç github.com",
+    "müzik lofi hip hop",
+    "spotify barış manço",
+    "dosya ara rapor.pdf",
+    "belge aç özgeçmiş.docx",
+    "todo ekle faturaları öde",
+    "todo listele",
+    "todo sil 3",
+    "tarayıcı aç https://example.com",
+    "uygulama aç firefox",
+    "klasör aç belgeler",
+    "merhaba kahya nasılsın",
+    "bugün hava nasıl olacak",
+    "bana bir fıkra anlat",
+    "teşekkürler",
+]
+
+
+def _tables():
+    # İşleyici yerine ad kullanılır; router ile aynı dict çakışma kuralları geçerli
+    natural = {pattern: handler for pattern, handler in NATURAL_PATTERNS}
+    command = {pattern: handler for pattern, handler in COMMAND_PATTERNS}
+    return natural, command
+
+
+def legacy_match(natural, command, text):
+    """Eski CommandRouter.handle_command döngüsü"""
+    for patterns in (natural, command):
+        for pattern, handler in patterns.items():
+            match = re.match(pattern, text)
+            if match:
+                return handler, match.groups()
+    return None, None
+
+
+def main(repeat=2000):
+    natural, command = _tables()
+    dispatcher = CommandDispatcher([('natural', natural), ('command', command)])
+    corpus = [text.lower() for text in CORPUS]
+
+    # Aynı kural ve aynı gruplar seçilmeli
+    for text in corpus:
+        rule, match = dispatcher.match(text)
+        got = (rule.handler, match.groups()) if rule else (None, None)
+        expected = legacy_match(natural, command, text)
+        assert got == expected, f"{text!r}: {got} != {expected}"
+
+    legacy = timeit.timeit(lambda: [legacy_match(natural, command, t) for t in corpus], number=repeat)
+    compiled = timeit.timeit(lambda: [dispatcher.match(t) for t in corpus], number=repeat)
+    calls = repeat * len(corpus)
+
+    print(f"{len(corpus)} komut x {repeat} tekrar")
+    print(f"eski döngü       : {legacy / calls * 1e6:8.2f} µs/komut")
+    print(f"CommandDispatcher: {compiled / calls * 1e6:8.2f} µs/komut")
+    print(f"hızlanma         : {legacy / compiled:8.2f}x")
+
+    print("\nKomut başına (µs):")
+    for text in corpus:
+        t_legacy = timeit.timeit(lambda: legacy_match(natural, command, text), number=repeat) / repeat
+        t_compiled = timeit.timeit(lambda: dispatcher.match(text), number=repeat) / repeat
+        rule, _ = dispatcher.match(text)
+        name = rule.name if rule else "(LLM)"
+        print(f"{t_legacy * 1e6:7.2f} -> {t_compiled * 1e6:6.2f}  {name:45s} {text}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""Belge içeriği arama maliyeti ölçümü
+
+Geçici bir klasörde sentetik metin belgeleri oluşturur; her sorguda tüm dosyaları
+okuyup tarayan yöntemi (grep benzeri) ContentIndex (FTS5) sorgusuyla karşılaştırır.
+İlk indeksleme ve değişiklik olmayan yeniden eşitleme süreleri de yazdırılır.
+
+Kullanım (kahya_app klasöründen):
+    python benchmarks/bench_content_search.py [belge_sayısı]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.turkish_text import fold_text
+from src.modules.content_index import ContentIndex
+
+WORDS = [
+    'rapor', 'fatura', 'bütçe', 'toplantı', 'sözleşme', 'kira', 'vergi', 'proje', 'sunum', 'müşteri',
+    'teslim', 'ödeme', 'tarih', 'ekip', 'hedef', 'plan', 'taslak', 'onay', 'şirket', 'İstanbul',
+]
+QUERIES = ['bütçe', 'sozlesme kira', 'istanbul', 'yıllık', 'kahya_yok']
+
+
+def make_documents(folder, count, seed=42):
+    rng = random.Random(seed)
+    for i in range(count):
+        sub = os.path.join(folder, str(i % 50))
+        os.makedirs(sub, exist_ok=True)
+        text = '\n'.join(' '.join(rng.choices(WORDS, k=12)) for _ in range(rng.randint(20, 200)))
+        if i % 100 == 0:
+            text += '\nyıllık değerlendirme'
+        with open(os.path.join(sub, f'belge_{i}.md' if i % 3 else f'not_{i}.txt'), 'w', encoding='utf-8') as f:
+            f.write(text)
+
+
+def list_files(folder):
+    for root, _, names in os.walk(folder):
+        for name in names:
+            path = os.path.join(root, name)
+            st = os.stat(path)
+            yield path, st.st_size, st.st_mtime
+
+
+def grep(folder, query):
+    """Eski yöntem: her sorguda tüm dosyaları oku ve tara"""
+    words = fold_text(query).split()
+    results = []
+    for path, _, _ in list_files(folder):
+        with open(path, encoding='utf-8', errors='replace') as f:
+            text = fold_text(f.read())
+        if all(word in text for word in words):
+            results.append(path)
+    return results
+
+
+def main(count=2000):
+    with tempfile.TemporaryDirectory() as folder:
+        docs = os.path.join(folder, 'docs')
+        make_documents(docs, count)
+        index = ContentIndex(os.path.join(folder, 'content.db'))
+
+        started = time.perf_counter()
+        stats = index.refresh(lambda: list_files(docs))
+        print(f"{count} belge indekslendi: {time.perf_counter() - started:.2f} s ({index.workers} süreç), {stats}")
+        started = time.perf_counter()
+        stats = index.refresh(lambda: list_files(docs))
+        print(f"Değişiklik yokken eşitleme: {time.perf_counter() - started:.3f} s, {stats}")
+
+        print("\nSorgu (dosyaları tara -> indeks, ilk 20):")
+        for query in QUERIES:
+            started = time.perf_counter()
+            expected = grep(docs, query)
+            t_grep = time.perf_counter() - started
+            started = time.perf_counter()
+            got = index.search(query, 20)
+            t_index = time.perf_counter() - started
+            print(f"  {query:15s} {t_grep * 1e3:9.1f} -> {t_index * 1e3:7.2f} ms  ({len(expected)} / {len(got)} sonuç)")
+        index.close()
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,61 @@
+"""Soğuk tarama maliyeti ölçümü
+
+Eski FileSearch yöntemini (os.walk + dosya başına os.path.getmtime/getsize) paralel
+Crawler ile karşılaştırır. Crawler yok sayılan klasörlere (IGNORED_DIRS) inmediği
+için ikinci satır aynı ağacın yok sayma kuralları kapalı taramasını da gösterir.
+
+Kullanım (kahya_app klasöründen):
+    python benchmarks/bench_file_crawl.py [klasör ...]
+"""
+import os
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.modules.file_crawler import Crawler
+
+
+def legacy_walk(paths):
+    """Eski yöntem: her kök ayrı gezilir, her dosya için iki stat çağrısı"""
+    files = 0
+    for search_path in paths:
+        for root, dirs, names in os.walk(search_path):
+            for name in names:
+                file_path = os.path.join(root, name)
+                try:
+                    os.path.getmtime(file_path)
+                    os.path.getsize(file_path)
+                except OSError:
+                    continue
+                files += 1
+    return files
+
+
+def crawl(paths, **kwargs):
+    crawler = Crawler(**kwargs)
+    entries = sum(len(listing.entries) for listing in crawler.crawl(paths) if listing.status == 'listed')
+    return entries, crawler.stats
+
+
+def main(paths):
+    print(f"Kökler: {paths}")
+
+    started = time.perf_counter()
+    files = legacy_walk(paths)
+    legacy = time.perf_counter() - started
+    print(f"os.walk + getmtime/getsize : {legacy:7.2f} s  ({files} dosya)")
+
+    for label, kwargs in (("Crawler (yok sayma kapalı)", {'ignored': frozenset()}), ("Crawler", {})):
+        started = time.perf_counter()
+        entries, stats = crawl(paths, **kwargs)
+        elapsed = time.perf_counter() - started
+        print(f"{label:27s}: {elapsed:7.2f} s  ({entries} kayıt, {stats['dirs']} klasör, "
+              f"{stats['files_per_sec']} kayıt/s, {stats['workers']} worker, {legacy / elapsed:.1f}x)")
+
+
+if __name__ == '__main__':
+    home = os.path.expanduser("~")
+    default_paths = [home] + [os.path.join(home, name) for name in ("Desktop", "Documents", "Downloads")]
+    main(sys.argv[1:] or [p for p in default_paths if os.path.isdir(p)])
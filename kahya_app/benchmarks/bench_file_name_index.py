@@ -0,0 +1,87 @@
+"""Dosya adı arama maliyeti ölçümü
+
+Sentetik bir ev klasörü ad listesi üzerinde adları tek tek tarayan eski yöntemi
+(`query in name.lower()`) TrigramIndex ile karşılaştırır ve iki yöntemin aynı
+sonuçları verdiğini doğrular.
+
+Kullanım (kahya_app klasöründen):
+    python benchmarks/bench_file_name_index.py [dosya_sayısı]
+"""
+import os
+import random
+import sys
+import time
+
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.core.turkish_text import fold_text
+from src.modules.name_index import TrigramIndex
+
+WORDS = [
+    'rapor', 'fatura', 'özgeçmiş', 'sunum', 'proje', 'toplantı', 'notlar', 'bütçe', 'ödev',
+    'fotoğraf', 'IMG', 'DSC', 'screenshot', 'backup', 'index', 'main', 'test', 'config',
+    'şablon', 'sözleşme', 'kira', 'vergi', 'tatil', 'müzik', 'video', 'yedek', 'taslak',
+]
+EXTENSIONS = ['.pdf', '.docx', '.xlsx', '.jpg', '.png', '.txt', '.md', '.py', '.js', '.mp3', '.zip']
+QUERIES = ['rapor', 'ozgecmis', 'toplantı_2023', 'IMG_12', 'fatura', 'zzz_yok', 'config.js', 'şablon-v']
+PATTERNS = ['*.pdf', 'rapor*', 'img_1??.*', '*sozlesme*.docx']
+
+
+def make_names(count, seed=42):
+    rng = random.Random(seed)
+    names = []
+    for i in range(count):
+        parts = rng.sample(WORDS, rng.randint(1, 3))
+        separator = rng.choice(['_', '-', ' '])
+        name = separator.join(parts)
+        if rng.random() < 0.6:
+            name += f"{separator}{rng.randint(1, 2024)}"
+        names.append(('/home/kullanici/' + str(i % 500), name + rng.choice(EXTENSIONS)))
+    return names
+
+
+def timed(fn, repeat=20):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - started) / repeat, result
+
+
+def main(count=200000):
+    names = make_names(count)
+    started = time.perf_counter()
+    index = TrigramIndex()
+    index.build((parent, name, False) for parent, name in names)
+    print(f"{count} ad indekslendi: {time.perf_counter() - started:.2f} s, {index.get_stats()}")
+
+    folded = [(parent, name, fold_text(name)) for parent, name in names]
+
+    def linear(query, limit):
+        query = fold_text(query)
+        results = []
+        for parent, name, folded_name in folded:
+            if query in folded_name:
+                results.append(os.path.join(parent, name))
+                if len(results) >= limit:
+                    break
+        return results
+
+    print("\nAlt dizi (ilk sonuç / ilk 20 / tümü):")
+    for query in QUERIES:
+        row = []
+        for limit in (1, 20, count):
+            t_linear, expected = timed(lambda: linear(query, limit), repeat=3)
+            t_index, got = timed(lambda: index.search_substring(query, limit), repeat=3)
+            assert got == expected, query
+            row.append(f"{t_linear * 1e3:8.2f} -> {t_index * 1e3:7.3f} ms")
+        print(f"  {query:15s} " + " | ".join(row) + f"  ({len(expected)} sonuç)")
+
+    print("\nfnmatch (ilk 20):")
+    for pattern in PATTERNS:
+        t_index, got = timed(lambda: index.search_pattern(pattern, 20), repeat=3)
+        print(f"  {pattern:20s} {t_index * 1e3:7.3f} ms  ({len(got)} sonuç)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200000)
@@ -0,0 +1,52 @@
+import threading
+from src.core import usage_store
+
+# Konular
+NOTES = 'notes'
+TODOS = 'todos'
+REMINDERS = 'reminders'
+USAGE = 'usage'
+WIDGET_CONFIG = 'widget_config'
+
+# Yazma sorgusunun tablosu -> konu (Database.execute_query için)
+TABLE_TOPICS = {
+    'notes': NOTES,
+    'todos': TODOS,
+    'reminders': REMINDERS,
+    'app_usage': USAGE,
+    usage_store.HOURLY_TABLE: USAGE,
+    usage_store.DAILY_TABLE: USAGE,
+    usage_store.WEEKLY_TABLE: USAGE,
+}
+
+# Commit dinleyicileri: callback(topic); Qt'den bağımsızdır
+_listeners = []
+_lock = threading.Lock()
+
+
+def add_listener(callback):
+    """callback(topic) bir konuya ait yazma commit edilince çağrılır
+
+    Çağrı commit'i yapan thread'de (genellikle yazıcı thread'i) olur; arayüz
+    tarafı bildirimi kendi thread'ine kendisi taşımalıdır (bkz. ui.change_bus).
+    """
+    with _lock:
+        if callback not in _listeners:
+            _listeners.append(callback)
+
+
+def remove_listener(callback):
+    with _lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def on_commit(topic):
+    """Konunun değiştiğini dinleyicilere bildir"""
+    with _lock:
+        listeners = list(_listeners)
+    for callback in listeners:
+        try:
+            callback(topic)
+        except Exception as e:
+            print(f"Değişiklik bildirimi hatası ({topic}): {e}")
@@ -0,0 +1,52 @@
+import re
+from collections import Counter, namedtuple
+
+# name: "tablo:sıra:işleyici" biçiminde okunabilir kural adı
+CommandRule = namedtuple('CommandRule', ['name', 'pattern', 'regex', 'handler'])
+
+
+class CommandDispatcher:
+    """Tüm komut pattern'lerini tek bir derlenmiş alternasyonda eşleştirir
+
+    Kurallar verilen tablo sırasıyla `(?P<rN>pattern)|...` biçiminde birleştirilir.
+    re.match alternatifleri soldan sağa denediği için ilk eşleşen kural, pattern'leri
+    tek tek sırayla denemekle aynıdır; ancak tüm döngü tek bir C çağrısında çalışır.
+    Kazanan kuralın kendi derlenmiş regex'i bir kez daha çalıştırılır, böylece
+    işleyiciler grup numaraları değişmemiş match nesnesi alır.
+    """
+
+    def __init__(self, tables):
+        # tables: [(tablo_adı, {pattern: işleyici}), ...] öncelik sırasıyla
+        self.rules = []
+        alternatives = []
+        for table_name, patterns in tables:
+            for index, (pattern, handler) in enumerate(patterns.items()):
+                handler_name = getattr(handler, '__name__', str(handler))
+                rule = CommandRule(
+                    name=f"{table_name}:{index}:{handler_name}",
+                    pattern=pattern,
+                    regex=re.compile(pattern),
+                    handler=handler,
+                )
+                alternatives.append(f"(?P<r{len(self.rules)}>{pattern})")
+                self.rules.append(rule)
+
+        self.combined = re.compile('|'.join(alternatives)) if alternatives else None
+        self.hits = Counter()  # Kural adı -> eşleşme sayısı
+        self.misses = 0
+
+    def match(self, text):
+        """(kural, match) döndür; hiçbir kural eşleşmezse (None, None)"""
+        combined_match = self.combined.match(text) if self.combined else None
+        if combined_match is None:
+            self.misses += 1
+            return None, None
+
+        # En dıştaki (kural) grubu en son kapandığı için lastgroup kuralı verir
+        rule = self.rules[int(combined_match.lastgroup[1:])]
+        self.hits[rule.name] += 1
+        return rule, rule.regex.match(text)
+
+    def get_stats(self):
+        """Kural başına eşleşme sayıları"""
+        return {'hits': dict(self.hits), 'misses': self.misses}
@@ -0,0 +1,62 @@
+# Komut yönlendirici pattern tabloları
+# (regex, CommandRouter işleyici metodu adı) - komutlar küçük harfe çevrilip eşleştirilir
+
+# Doğal dil komut pattern'leri (sıra önceliktir: ilk eşleşen kazanır)
+NATURAL_PATTERNS = [
+    # Not alma
+    (r'(not|not al|not tut|kaydet|yaz)\s+(.+)', 'handle_note_add'),
+    (r'(perşembe|pazartesi|salı|çarşamba|cuma|cumartesi|pazar)\s+(günü|gün)\s+(.+)', 'handle_day_note'),
+    (r'(notlar|notlarım|kayıtlar)', 'handle_notes_list'),
+
+    # Hatırlatıcı silme (önce gelmeli)
+    (r'(.+)\s+(hatırlatıcısını|alarmını)\s+(sil|kaldır|iptal)', 'handle_reminder_delete'),
+    (r'(sil|kaldır|iptal)\s+(.+)', 'handle_reminder_delete'),
+    # Tekrarlayan hatırlatıcı: "her pazartesi 9:00 toplantı", "her ayın 15'i 10.00 fatura"
+    (r"her\s+(gün|hafta içi|ayın\s+\d{1,2}\S*|(?:(?:pazartesi|salı|çarşamba|perşembe|cuma|cumartesi|pazar)(?:\s*,\s*|\s+ve\s+)?)+)"
+     r'\s+(?:saat\s+)?(\d{1,2})[:.](\d{2})\s+(.+)', 'handle_recurring_reminder'),
+    # Hatırlatıcı - gelişmiş tarih algılama
+    (r'(hatırlat|hatırlatıcı|alarm)\s+(.+)', 'handle_reminder_natural'),
+    (r'(saat)\s+(\d{1,2}):(\d{2})\s+(.+)', 'handle_time_reminder'),
+    (r'(hatırlatıcılar|alarmlar)', 'handle_reminder_list_natural'),
+    # Not: aynı pattern yukarıda handle_day_note için de var; router bu tabloyu dict'e
+    # çevirdiğinden ilk sıradaki yerinde bu işleyici geçerli olur
+    (r'(perşembe|pazartesi|salı|çarşamba|cuma|cumartesi|pazar)\s+(günü|gün)\s+(.+)', 'handle_day_reminder'),
+    (r'(bu ayın|ayın)\s+(\d{1,2})\s+(günü|gün|sinde|sında)\s+(.+)', 'handle_month_day_reminder'),
+    (r'(\d{1,2})\s+(ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)\s+(.+)', 'handle_month_name_reminder'),
+    (r'(\d{1,2})/(\d{1,2})\s+(.+)', 'handle_date_reminder'),
+    (r'(\d{1,2})\.(\d{1,2})\s+(.+)', 'handle_date_dot_reminder'),
+
+    # Todo
+    (r'(yapılacak|todo|görev|task)\s+(.+)', 'handle_todo_natural'),
+    (r'(listele|göster|bak)\s+(yapılacak|todo|görev)', 'handle_todo_list_natural'),
+    (r'(yapılacaklar|görevler)', 'handle_todo_list_natural'),
+
+    # İnternet
+    (r'(ara|google|internet)\s+(.+)', 'handle_web_search'),
+    (r'(aç|git)\s+(.+)', 'handle_web_open'),
+
+    # Müzik
+    (r'(müzik|şarkı|çal|aç)\s+(.+)', 'handle_music'),
+    (r'(spotify|youtube)\s+(.+)', 'handle_music_platform'),
+
+    # Dosya
+    (r'(dosya|belge)\s+(ara|bul)\s+(.+)', 'handle_file_search_natural'),
+    (r'(dosya|belge)\s+(aç|göster)\s+(.+)', 'handle_file_open_natural'),
+    (r'(içerik|metin)\s+(ara|bul)\s+(.+)', 'handle_content_search'),
+]
+
+# Eski komut pattern'leri (geriye uyumluluk için, doğal dil pattern'lerinden sonra denenir)
+COMMAND_PATTERNS = [
+    (r'todo\s+ekle\s+(.+)', 'handle_todo_add'),
+    (r'todo\s+listele', 'handle_todo_list'),
+    (r'todo\s+sil\s+(\d+)', 'handle_todo_delete'),
+    (r'todo\s+tamamla\s+(\d+)', 'handle_todo_complete'),
+    (r'hatırlat\s+(.+?)\s+saat\s+(\d{1,2}):(\d{2})', 'handle_reminder_add'),
+    (r'hatırlatıcı\s+listele', 'handle_reminder_list'),
+    (r'dosya\s+ara\s+(.+)', 'handle_file_search'),
+    (r'dosya\s+aç\s+(.+)', 'handle_file_open'),
+    (r'tarayıcı\s+aç\s+(.+)', 'handle_browser_open'),
+    (r'uygulama\s+aç\s+(.+)', 'handle_app_open'),
+    (r'klasör\s+aç\s+(.+)', 'handle_folder_open'),
+]
+
@@ -1,147 +1,102 @@
+import os
 import re
-import threading
 import json
 from datetime import datetime, timedelta
 from PyQt5.QtCore import QObject, pyqtSignal
 from src.modules.todo import TodoManager
+from src.modules.notes import NoteManager
 from src.modules.reminder import ReminderManager
+from src.modules.recurrence import Rule, WEEKDAY_NAMES, describe_rule, parse_rule
 from src.modules.file_ops import FileOperations
 from src.modules.file_search import FileSearch
 from src.modules.browser_control import BrowserControl
 from src.modules.os_control import OSControl
 from src.core.llm_client import LLMClient
+from src.core.command_patterns import NATURAL_PATTERNS, COMMAND_PATTERNS
+from src.core.command_dispatcher import CommandDispatcher
+from src.core.task_pool import TaskPool
 
 class CommandRouter(QObject):
     command_processed = pyqtSignal(str)  # Yanıt sinyali
     
-    def __init__(self, db_path, chatbox=None):
+    def __init__(self, db_path, chatbox=None, llm_client=None):
         super().__init__()
         self.db_path = db_path
         self.chatbox = chatbox
         
         # Modülleri başlat
         self.todo_manager = TodoManager(db_path)
+        self.note_manager = NoteManager(db_path)
         self.reminder_manager = ReminderManager(db_path)
-        self.file_ops = FileOperations()
-        self.file_search = FileSearch()
+        self.file_ops = FileOperations(db_path)
+        data_dir = os.path.dirname(db_path)
+        self.file_search = FileSearch(
+            index_path=os.path.join(data_dir, 'file_index.db'),
+            db_path=db_path,
+            content_index_path=os.path.join(data_dir, 'content_index.db'),
+        )
         self.browser_control = BrowserControl()
         self.os_control = OSControl()
-        self.llm_client = LLMClient()
-        
-        # Doğal dil komut pattern'leri
-        self.natural_patterns = {
-            # Not alma
-            r'(not|not al|not tut|kaydet|yaz)\s+(.+)': self.handle_note_add,
-            r'(perşembe|pazartesi|salı|çarşamba|cuma|cumartesi|pazar)\s+(günü|gün)\s+(.+)': self.handle_day_note,
-            r'(notlar|notlarım|kayıtlar)': self.handle_notes_list,
-            
-            # Hatırlatıcı silme (önce gelmeli)
-            r'(.+)\s+(hatırlatıcısını|alarmını)\s+(sil|kaldır|iptal)': self.handle_reminder_delete,
-            r'(sil|kaldır|iptal)\s+(.+)': self.handle_reminder_delete,
-            # Hatırlatıcı - gelişmiş tarih algılama
-            r'(hatırlat|hatırlatıcı|alarm)\s+(.+)': self.handle_reminder_natural,
-            r'(saat)\s+(\d{1,2}):(\d{2})\s+(.+)': self.handle_time_reminder,
-            r'(hatırlatıcılar|alarmlar)': self.handle_reminder_list_natural,
-            r'(perşembe|pazartesi|salı|çarşamba|cuma|cumartesi|pazar)\s+(günü|gün)\s+(.+)': self.handle_day_reminder,
-            r'(bu ayın|ayın)\s+(\d{1,2})\s+(günü|gün|sinde|sında)\s+(.+)': self.handle_month_day_reminder,
-            r'(\d{1,2})\s+(ocak|şubat|mart|nisan|mayıs|haziran|temmuz|ağustos|eylül|ekim|kasım|aralık)\s+(.+)': self.handle_month_name_reminder,
-            r'(\d{1,2})/(\d{1,2})\s+(.+)': self.handle_date_reminder,
-            r'(\d{1,2})\.(\d{1,2})\s+(.+)': self.handle_date_dot_reminder,
-            
-            # Todo
-            r'(yapılacak|todo|görev|task)\s+(.+)': self.handle_todo_natural,
-            r'(listele|göster|bak)\s+(yapılacak|todo|görev)': self.handle_todo_list_natural,
-            r'(yapılacaklar|görevler)': self.handle_todo_list_natural,
-            
-            # İnternet
-            r'(ara|google|internet)\s+(.+)': self.handle_web_search,
-            r'(aç|git)\s+(.+)': self.handle_web_open,
-            
-            # Müzik
-            r'(müzik|şarkı|çal|aç)\s+(.+)': self.handle_music,
-            r'(spotify|youtube)\s+(.+)': self.handle_music_platform,
-            
-            # Dosya
-            r'(dosya|belge)\s+(ara|bul)\s+(.+)': self.handle_file_search_natural,
-            r'(dosya|belge)\s+(aç|göster)\s+(.+)': self.handle_file_open_natural,
-        }
+        # Uygulama tek istemciyi (HTTP oturumu, önbellek, sağlık yoklaması) paylaşır
+        self.llm_client = llm_client or LLMClient(db_path=db_path)
         
-        # Eski komut pattern'leri (geriye uyumluluk için)
-        self.command_patterns = {
-            r'todo\s+ekle\s+(.+)': self.handle_todo_add,
-            r'todo\s+listele': self.handle_todo_list,
-            r'todo\s+sil\s+(\d+)': self.handle_todo_delete,
-            r'todo\s+tamamla\s+(\d+)': self.handle_todo_complete,
-            r'hatırlat\s+(.+?)\s+saat\s+(\d{1,2}):(\d{2})': self.handle_reminder_add,
-            r'hatırlatıcı\s+listele': self.handle_reminder_list,
-            r'dosya\s+ara\s+(.+)': self.handle_file_search,
-            r'dosya\s+aç\s+(.+)': self.handle_file_open,
-            r'tarayıcı\s+aç\s+(.+)': self.handle_browser_open,
-            r'uygulama\s+aç\s+(.+)': self.handle_app_open,
-            r'klasör\s+aç\s+(.+)': self.handle_folder_open,
-        }
+        # Doğal dil ve eski komut pattern'leri (sıra önceliktir)
+        self.natural_patterns = {pattern: getattr(self, handler) for pattern, handler in NATURAL_PATTERNS}
+        self.command_patterns = {pattern: getattr(self, handler) for pattern, handler in COMMAND_PATTERNS}
+        
+        # Tüm pattern'ler tek bir derlenmiş regex'te; doğal dil önce denenir
+        self.dispatcher = CommandDispatcher([
+            ('natural', self.natural_patterns),
+            ('command', self.command_patterns),
+        ])
+        self.last_rule = None  # Son eşleşen kuralın adı
+        
+        # Komutlar paylaşılan, sınırlı iş havuzunda çalışır
+        self.task_pool = TaskPool.shared()
+        self._llm_generation = 0
         
     def handle_command(self, command):
         """Komutu işle ve uygun modüle yönlendir"""
         command = command.strip()
-        print(f"Router handle_command çağrıldı: '{command}'")
         
         # Yeni komut formatlarını kontrol et (chatbox'tan gelen)
         if command.startswith("hatırlatıcı_ekle "):
             content = command[16:]  # "hatırlatıcı_ekle " kısmını çıkar
-            thread = threading.Thread(target=self._process_natural_reminder, args=(content,))
-            thread.daemon = True
-            thread.start()
+            self._submit(TaskPool.FAST, self._process_natural_reminder, content)
             return
         elif command.startswith("not_al "):
             content = command[7:]  # "not_al " kısmını çıkar
-            thread = threading.Thread(target=self._process_note_add, args=(content,))
-            thread.daemon = True
-            thread.start()
+            self._submit(TaskPool.FAST, self._process_note_add, content)
             return
         elif command.startswith("todo_ekle "):
             content = command[10:]  # "todo_ekle " kısmını çıkar
-            thread = threading.Thread(target=self._process_todo_add, args=(content,))
-            thread.daemon = True
-            thread.start()
+            self._submit(TaskPool.FAST, self._process_todo_add, content)
             return
         elif command == "hatırlatıcılar":
-            thread = threading.Thread(target=self._process_reminder_list)
-            thread.daemon = True
-            thread.start()
+            self._submit(TaskPool.FAST, self._process_reminder_list)
             return
         elif command == "notlar":
-            thread = threading.Thread(target=self._process_notes_list)
-            thread.daemon = True
-            thread.start()
+            self._submit(TaskPool.FAST, self._process_notes_list)
             return
         
-        # Doğal dil pattern'lerini kontrol et
+        # Doğal dil ve eski pattern'leri tek geçişte kontrol et
         command_lower = command.lower()
-        print(f"Komut kontrol ediliyor: '{command_lower}'")
-        for pattern, handler in self.natural_patterns.items():
-            match = re.match(pattern, command_lower)
-            if match:
-                print(f"Pattern eşleşti: {pattern}")
-                thread = threading.Thread(target=self._process_command, args=(handler, match))
-                thread.daemon = True
-                thread.start()
-                return
-        
-        # Eski pattern'leri kontrol et
-        for pattern, handler in self.command_patterns.items():
-            match = re.match(pattern, command_lower)
-            if match:
-                thread = threading.Thread(target=self._process_command, args=(handler, match))
-                thread.daemon = True
-                thread.start()
-                return
-        
-        # Hiçbiri eşleşmezse LLM'e gönder
-        thread = threading.Thread(target=self._process_llm_command, args=(command,))
-        thread.daemon = True
-        thread.start()
+        rule, match = self.dispatcher.match(command_lower)
+        if rule:
+            self.last_rule = rule.name
+            self._submit(TaskPool.FAST, self._process_command, rule.handler, match)
+            return
+        self.last_rule = None
+        
+        # Hiçbiri eşleşmezse LLM'e gönder (yeni istek bekleyen eskisini iptal eder)
+        self._llm_generation += 1
+        self._submit(TaskPool.LLM, self._process_llm_command, command, self._llm_generation)
         
+    def _submit(self, kind, fn, *args):
+        """İşi paylaşılan havuza gönder; kuyruk doluysa kullanıcıyı bilgilendir"""
+        if self.task_pool.submit(kind, fn, *args) is None:
+            self.command_processed.emit("⏳ Çok fazla komut bekliyor, lütfen biraz sonra tekrar deneyin.")
+            
     def _process_command(self, handler, match):
         """Komutu arka planda işle"""
         try:
@@ -150,13 +105,23 @@ class CommandRouter(QObject):
         except Exception as e:
             self.command_processed.emit(f"Hata: {str(e)}")
             
-    def _process_llm_command(self, command):
-        """LLM komutunu arka planda işle"""
+    def _process_llm_command(self, command, generation):
+        """LLM komutunu arka planda işle
+
+        Yanıt akış olarak okunur; bu sırada daha yeni bir LLM isteği gelirse akış
+        bırakılır (bağlantı kapanır) ve eski yanıt ya da hatası gösterilmez.
+        """
         try:
-            response = self.llm_client.get_response(command)
-            self.command_processed.emit(response)
+            parts = []
+            for chunk in self.llm_client.stream_response(command):
+                if generation != self._llm_generation:
+                    return
+                parts.append(chunk)
+            if generation == self._llm_generation:
+                self.command_processed.emit("".join(parts).strip() or "Yanıt alınamadı")
         except Exception as e:
-            self.command_processed.emit(f"LLM hatası: {str(e)}")
+            if generation == self._llm_generation:
+                self.command_processed.emit(f"LLM hatası: {str(e)}")
     
     def _process_natural_reminder(self, content):
         """Doğal hatırlatıcı işleme"""
@@ -229,15 +194,6 @@ class CommandRouter(QObject):
             # Hatırlatıcı ekle
             self.reminder_manager.add_reminder(clean_title, content, target_time.hour, target_time.minute, target_time.date())
             
-            # Takvimi güncelle
-            if hasattr(self, 'chatbox') and self.chatbox:
-                # Chatbox'ın parent'ına eriş (KahyaWallpaper)
-                parent = self.chatbox.parent()
-                if parent and hasattr(parent, 'calendar'):
-                    # Ana thread'de güncelle
-                    from PyQt5.QtCore import QTimer
-                    QTimer.singleShot(0, parent.calendar.update_reminders)
-            
             result = f"⏰ Hatırlatıcı eklendi: {clean_title}\n📅 Tarih: {target_time.strftime('%d.%m.%Y %H:%M')}"
             self.command_processed.emit(result)
             
@@ -247,12 +203,7 @@ class CommandRouter(QObject):
     def _process_note_add(self, content):
         """Not ekleme işleme"""
         try:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-            
-            # Dosyaya kaydet
-            with open("kahya_notes.txt", "a", encoding="utf-8") as f:
-                f.write(f"{timestamp}: {content}\n")
-                
+            self.note_manager.add_note(content)
             result = f"📝 Not kaydedildi: {content}"
             self.command_processed.emit(result)
             
@@ -280,7 +231,7 @@ class CommandRouter(QObject):
                 for reminder in reminders:
                     reminder_time = datetime.fromisoformat(reminder[3])
                     status = "✅" if reminder[5] else "⏳"
-                    result += f"{status} {reminder_time.strftime('%d.%m.%Y %H:%M')} - {reminder[1]}\n"
+                    result += f"{status} {reminder_time.strftime('%d.%m.%Y %H:%M')} - {reminder[1]}{self._recurrence_label(reminder)}\n"
             
             self.command_processed.emit(result)
             
@@ -290,19 +241,13 @@ class CommandRouter(QObject):
     def _process_notes_list(self):
         """Notlar listesi işleme"""
         try:
-            try:
-                with open("kahya_notes.txt", "r", encoding="utf-8") as f:
-                    notes = f.readlines()
-                
-                if not notes:
-                    result = "📝 Henüz not yok"
-                else:
-                    result = "📝 Notlarınız:\n"
-                    for note in notes[-10:]:  # Son 10 not
-                        result += f"• {note.strip()}\n"
-                        
-            except FileNotFoundError:
+            notes = self.note_manager.get_recent_notes(10)  # Son 10 not
+            if not notes:
                 result = "📝 Henüz not yok"
+            else:
+                result = "📝 Notlarınız:\n"
+                for note in reversed(notes):
+                    result += f"• {self.note_manager.format_note(note)}\n"
             
             self.command_processed.emit(result)
             
@@ -423,32 +368,14 @@ class CommandRouter(QObject):
     def handle_note_add(self, match):
         """Not alma işleyicisi"""
         content = match.group(2)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        note = f"📝 Not ({timestamp}): {content}"
-        
-        # Dosyaya kaydet
-        try:
-            with open("kahya_notes.txt", "a", encoding="utf-8") as f:
-                f.write(f"{timestamp}: {content}\n")
-        except:
-            pass
-            
+        self.note_manager.add_note(content)
         return f"✅ Not kaydedildi: {content}"
     
     def handle_day_note(self, match):
         """Günlük not alma işleyicisi"""
         day = match.group(1)
         content = match.group(3)
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-        note = f"📅 {day.capitalize()} notu: {content}"
-        
-        # Dosyaya kaydet
-        try:
-            with open("kahya_notes.txt", "a", encoding="utf-8") as f:
-                f.write(f"{timestamp} - {day.capitalize()}: {content}\n")
-        except:
-            pass
-            
+        self.note_manager.add_note(content, label=day.capitalize())
         return f"✅ {day.capitalize()} notu kaydedildi: {content}"
     
     def handle_reminder_natural(self, match):
@@ -466,7 +393,45 @@ class CommandRouter(QObject):
         content = match.group(4)
         self.reminder_manager.add_reminder(content, content, hour, minute)
         return f"⏰ Hatırlatıcı eklendi: {content} saat {hour:02d}:{minute:02d}"
-    
+
+    def handle_recurring_reminder(self, match):
+        """Tekrarlayan hatırlatıcı işleyicisi ("her pazartesi 9:00 toplantı")"""
+        when = match.group(1)
+        hour = int(match.group(2))
+        minute = int(match.group(3))
+        content = match.group(4)
+        if hour > 23 or minute > 59:
+            return f"❌ Geçersiz saat: {hour:02d}:{minute:02d}"
+
+        if when == 'gün':
+            rule = Rule('DAILY', 1, (), (), None, None)
+        elif when == 'hafta içi':
+            rule = Rule('WEEKLY', 1, (0, 1, 2, 3, 4), (), None, None)
+        elif when.startswith('ayın'):
+            day = int(re.search(r'\d+', when).group())
+            if not 1 <= day <= 31:
+                return f"❌ Geçersiz gün: {day}"
+            rule = Rule('MONTHLY', 1, (), (day,), None, None)
+        else:
+            days = tuple(sorted({WEEKDAY_NAMES.index(word) for word in re.findall(r'\w+', when) if word in WEEKDAY_NAMES}))
+            rule = Rule('WEEKLY', 1, days, (), None, None)
+
+        first = self.reminder_manager.add_recurring_reminder(content, content, rule, hour, minute)
+        if first is None:
+            return f"❌ Tekrarlayan hatırlatıcı eklenemedi: {content}"
+        return (f"🔁 Tekrarlayan hatırlatıcı eklendi: {content} ({describe_rule(rule)} {hour:02d}:{minute:02d})\n"
+                f"İlk hatırlatma: {first.strftime('%d.%m.%Y %H:%M')}")
+
+    def _recurrence_label(self, reminder):
+        """Seri satırları için listelerde gösterilecek tekrar açıklaması"""
+        recurrence = reminder[7] if len(reminder) > 7 else None
+        if not recurrence:
+            return ""
+        try:
+            return f" 🔁 {describe_rule(parse_rule(recurrence))}"
+        except ValueError:
+            return " 🔁"
+
     def handle_todo_natural(self, match):
         """Doğal todo işleyicisi"""
         content = match.group(2)
@@ -537,39 +502,67 @@ class CommandRouter(QObject):
     def handle_file_search_natural(self, match):
         """Doğal dosya arama işleyicisi"""
         query = match.group(3)
-        results = self.file_search.search_files(query)
+        # En iyi 5 sonuç; sıralı arama daha fazlasını hesaplamaz
+        results = self.file_search.search_best(query, 5)
         if not results:
             return f"🔍 '{query}' için dosya bulunamadı"
         
         result = f"🔍 '{query}' için bulunan dosyalar:\n"
-        for file_path in results[:5]:
+        for file_path in results:
             result += f"📄 {file_path}\n"
         return result
     
+    def handle_content_search(self, match):
+        """Belge içeriğinde arama (içerik indeksinden)"""
+        query = match.group(3)
+        results = self.file_search.search_content(query, 5)
+        if results is None:
+            return "❌ İçerik araması kullanılamıyor"
+        if not results:
+            if self.file_search.content_index.is_refreshing():
+                return f"🔍 '{query}' bulunamadı (içerik indeksi hâlâ hazırlanıyor)"
+            return f"🔍 '{query}' içeren belge bulunamadı"
+        
+        result = f"🔍 '{query}' içeren belgeler:\n"
+        for file_path, snippet in results:
+            result += f"📄 {file_path}\n   {' '.join(snippet.split())}\n"
+        return result
+    
+    def _open_file(self, file_path):
+        """Verilen yolu aç; yol yoksa yalnızca adı birebir eşleşen tek kaydı aç
+
+        Hiçbir şey açılmadıysa en iyi arama sonuçları öneri olarak yanıta eklenir.
+        """
+        if not os.path.exists(file_path):
+            exact = self.file_search.search_exact(file_path, 2)
+            if len(exact) != 1:
+                suggestions = self.file_search.search_best(file_path, 5)
+                result = f"❌ Dosya bulunamadı: {file_path}"
+                if suggestions:
+                    result += "\n🔍 Bunlardan birini mi demek istediniz?\n"
+                    result += "".join(f"📄 {path}\n" for path in suggestions)
+                return result
+            file_path = exact[0]
+        if self.file_ops.open_file(file_path):
+            self.file_search.record_open(file_path)
+            return f"📄 Dosya açıldı: {file_path}"
+        return f"❌ Dosya açılamadı: {file_path}"
+    
     def handle_file_open_natural(self, match):
         """Doğal dosya açma işleyicisi"""
-        file_path = match.group(3)
-        success = self.file_ops.open_file(file_path)
-        if success:
-            return f"📄 Dosya açıldı: {file_path}"
-        else:
-            return f"❌ Dosya açılamadı: {file_path}"
+        return self._open_file(match.group(3))
     
     def handle_notes_list(self, match):
         """Notları listele"""
         try:
-            with open("kahya_notes.txt", "r", encoding="utf-8") as f:
-                notes = f.readlines()
-            
+            notes = self.note_manager.get_recent_notes(10)  # Son 10 not
             if not notes:
                 return "📝 Henüz not yok"
             
             result = "📝 Notlarınız:\n"
-            for i, note in enumerate(notes[-10:], 1):  # Son 10 not
-                result += f"{i}. {note.strip()}\n"
+            for i, note in enumerate(reversed(notes), 1):
+                result += f"{i}. {self.note_manager.format_note(note)}\n"
             return result
-        except FileNotFoundError:
-            return "📝 Henüz not yok"
         except Exception as e:
             return f"❌ Notlar okunamadı: {str(e)}"
     
@@ -583,7 +576,7 @@ class CommandRouter(QObject):
         result = "⏰ Hatırlatıcılarınız:\n"
         for i, reminder in enumerate(reminders, 1):
             print(f"  Router: Hatırlatıcı {i}: {reminder}")
-            result += f"{i}. {reminder[1]} - {reminder[3]}\n"
+            result += f"{i}. {reminder[1]} - {reminder[3]}{self._recurrence_label(reminder)}\n"
         return result
     
     def handle_reminder_delete(self, match):
@@ -655,14 +648,6 @@ class CommandRouter(QObject):
                 if self.reminder_manager.delete_reminder(reminder[0]):  # reminder[0] = id
                     deleted_count += 1
             
-            # Takvimi güncelle (ana thread'de)
-            if hasattr(self, 'chatbox') and self.chatbox:
-                parent = self.chatbox.parent()
-                if parent and hasattr(parent, 'calendar'):
-                    # Ana thread'de güncelle
-                    from PyQt5.QtCore import QTimer
-                    QTimer.singleShot(0, parent.calendar.update_reminders)
-            
             return f"🗑️ {deleted_count} hatırlatıcı silindi."
             
         except Exception as e:
@@ -816,27 +801,22 @@ class CommandRouter(QObject):
         
         result = "⏰ Hatırlatıcılar:\n"
         for reminder in reminders:
-            result += f"📅 {reminder[1]} - {reminder[3]}\n"
+            result += f"📅 {reminder[1]} - {reminder[3]}{self._recurrence_label(reminder)}\n"
         return result
     
     def handle_file_search(self, match):
         query = match.group(1)
-        results = self.file_search.search_files(query)
+        results = self.file_search.search_best(query, 5)
         if not results:
             return f"🔍 '{query}' için dosya bulunamadı"
         
         result = f"🔍 '{query}' için bulunan dosyalar:\n"
-        for file_path in results[:5]:
+        for file_path in results:
             result += f"📄 {file_path}\n"
         return result
         
     def handle_file_open(self, match):
-        file_path = match.group(1)
-        success = self.file_ops.open_file(file_path)
-        if success:
-            return f"📄 Dosya açıldı: {file_path}"
-        else:
-            return f"❌ Dosya açılamadı: {file_path}"
+        return self._open_file(match.group(1))
     
     def handle_browser_open(self, match):
         url = match.group(1)
@@ -1,192 +1,397 @@
-import sqlite3
-from datetime import datetime, timedelta
+import re
+from datetime import datetime
+from src.core.db_pool import ConnectionPool
+from src.core.db_writer import WriteQueue
+from src.core.migrations import migrate, to_timestamp
+from src.core import usage_store
+from src.core import changes
+from src.core.changes import NOTES, REMINDERS, TABLE_TOPICS, TODOS, USAGE
+
+# Yazma gerektirmeyen sorguların ilk anahtar kelimeleri (execute_query için)
+READ_ONLY_PREFIXES = ('select', 'values', 'pragma', 'explain')
+
+# Yazma sorgusunun hedef tablosu (değişiklik bildirimi için)
+_WRITE_TABLE = re.compile(r'^\s*(?:insert(?:\s+or\s+\w+)?\s+into|replace\s+into|update|delete\s+from)\s+["`]?(\w+)', re.IGNORECASE)
+
+# WITH önekini atlamak için: metin sabitleri, tırnaklı adlar, parantezler ve kelimeler
+_SQL_TOKEN = re.compile(r"'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|`[^`]*`|\[[^\]]*\]|[()]|\w+")
+_CTE_STATEMENTS = ('select', 'values', 'insert', 'replace', 'update', 'delete')
+
+
+def _main_statement(query):
+    """Sorgunun WITH önekindeki CTE tanımları atlanmış ana komutu
+
+    "WITH x AS (...) DELETE FROM ..." için "DELETE FROM ..." döner; CTE gövdeleri
+    parantez içinde olduğundan ilk derinlik-0 komut kelimesi ana komuttur.
+    """
+    query = query.lstrip()
+    if not query[:4].lower() == 'with':
+        return query
+    depth = 0
+    for token in _SQL_TOKEN.finditer(query):
+        text = token.group()
+        if text == '(':
+            depth += 1
+        elif text == ')':
+            depth -= 1
+        elif depth == 0 and text.lower() in _CTE_STATEMENTS:
+            return query[token.start():]
+    return query
 
 class Database:
     def __init__(self, db_path):
         self.db_path = db_path
-        self._init_db()
+        # Aynı dosyayı kullanan tüm Database nesneleri tek havuzu paylaşır
+        self.pool = ConnectionPool.get(db_path)
+        with self.pool.init_lock:
+            if not self.pool.schema_ready:
+                self._init_db()
+                self.pool.schema_ready = True
+            if self.pool.writer is None:
+                self.pool.writer = WriteQueue(self.pool)
+        self.writer = self.pool.writer
 
     def _init_db(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        # Kullanıcı profili tablosu
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS user_profile (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT,
-                preferences TEXT,
-                created_at TEXT,
-                updated_at TEXT
-            )
-        ''')
-        # Uygulama kullanım logları
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS app_usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                app_name TEXT,
-                session_count INTEGER DEFAULT 1,
-                duration INTEGER,
-                last_used TEXT
-            )
-        ''')
-        # Hatırlatıcılar tablosu
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS reminders (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT,
-                message TEXT,
-                reminder_time TEXT,
-                triggered INTEGER DEFAULT 0,
-                created_at TEXT
-            )
-        ''')
-        # Todo tablosu
-        c.execute('''
-            CREATE TABLE IF NOT EXISTS todos (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                title TEXT,
-                completed INTEGER DEFAULT 0,
-                created_at TEXT
-            )
-        ''')
-        conn.commit()
-        conn.close()
-        
+        # Şemayı en son sürüme yükselt (zaten güncelse bir şey yapmaz)
+        with self.pool.connection() as conn:
+            migrate(conn)
+
+    def submit_write(self, fn, callback=None, topic=None):
+        """Yazma işini (fn(cursor)) tek yazıcı thread'ine gönder, Future döndür
+
+        topic verilirse yazma başarıyla commit edilince changes.on_commit ile bildirilir.
+        """
+        if topic is not None:
+            def notify(future, callback=callback):
+                if future.exception() is None:
+                    changes.on_commit(topic)
+                if callback is not None:
+                    callback(future)
+
+            return self.writer.submit(fn, notify)
+        return self.writer.submit(fn, callback)
+
+    def _sync(self):
+        """Okumadan önce bu thread'in gönderdiği yazmaların commit edilmesini bekle
+
+        Diğer thread'lerin kuyruktaki yazmaları beklenmez; WAL modunda okuma
+        son commit edilmiş durumu görür.
+        """
+        self.writer.wait_own()
+
+    def flush(self, timeout=None):
+        """Bekleyen tüm yazmaları hemen commit et"""
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """Bekleyen yazmaları commit et ve boştaki bağlantıları kapat"""
+        self.writer.close()
+        self.pool.close()
+
     # Kullanıcı profilini getir
     def get_user_profile(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('SELECT * FROM user_profile ORDER BY id DESC LIMIT 1')
-        row = c.fetchone()
-        conn.close()
-        return row
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT * FROM user_profile ORDER BY id DESC LIMIT 1')
+            return c.fetchone()
 
     # Kullanıcı profilini kaydet/güncelle
-    def save_user_profile(self, name, preferences_json):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+    def save_user_profile(self, name, preferences_json, callback=None):
         now = datetime.now().isoformat()
-        # Eğer profil varsa güncelle, yoksa ekle
-        c.execute('SELECT id FROM user_profile ORDER BY id DESC LIMIT 1')
-        row = c.fetchone()
-        if row:
-            c.execute('UPDATE user_profile SET name=?, preferences=?, updated_at=? WHERE id=?',
-                      (name, preferences_json, now, row[0]))
-        else:
+
+        def write(c):
+            # Eğer profil varsa güncelle, yoksa ekle
+            c.execute('SELECT id FROM user_profile ORDER BY id DESC LIMIT 1')
+            row = c.fetchone()
+            if row:
+                c.execute('UPDATE user_profile SET name=?, preferences=?, updated_at=? WHERE id=?',
+                          (name, preferences_json, now, row[0]))
+                return row[0]
             c.execute('INSERT INTO user_profile (name, preferences, created_at, updated_at) VALUES (?, ?, ?, ?)',
                       (name, preferences_json, now, now))
-            conn.commit()
-            conn.close()
+            return c.lastrowid
+
+        return self.submit_write(write, callback)
 
     # Uygulama kullanımını logla
-    def log_app_usage(self, app_name, duration):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        now = datetime.now().isoformat()
-        # Eğer aynı gün içinde aynı uygulama varsa güncelle
-        c.execute('SELECT id, session_count, duration FROM app_usage WHERE app_name=? AND last_used>=?',
-                  (app_name, (datetime.now() - timedelta(days=1)).isoformat()))
-        row = c.fetchone()
-        if row:
-            new_count = row[1] + 1
-            new_duration = row[2] + duration
-            c.execute('UPDATE app_usage SET session_count=?, duration=?, last_used=? WHERE id=?',
-                      (new_count, new_duration, now, row[0]))
-        else:
-            c.execute('INSERT INTO app_usage (app_name, session_count, duration, last_used) VALUES (?, ?, ?, ?)',
-                      (app_name, 1, duration, now))
-        conn.commit()
-        conn.close()
+    def log_app_usage(self, app_name, duration, callback=None):
+        """Kullanım oturumunu saatlik/günlük/haftalık kovalara ekle"""
+        now = datetime.now()
+
+        def write(c):
+            usage_store.record_usage(c, app_name, duration, now)
+
+        return self.submit_write(write, callback, USAGE)
+
+    def log_app_usage_batch(self, events, journal, last_seq, callback=None):
+        """Biriken kullanım oturumlarını tek transaction'da yaz
+
+        events: (app_name, süre, bitiş epoch) kayıtları. Günlüğün last_seq'e kadar
+        işlendiği aynı transaction'da kaydedilir; çökme sonrası tekrar oynatmada
+        aynı oturum iki kez yazılmaz.
+        """
+        def write(c):
+            for app_name, duration, ended_ts in events:
+                usage_store.record_usage(c, app_name, duration, datetime.fromtimestamp(ended_ts))
+            usage_store.set_journal_seq(c, journal, last_seq)
+
+        return self.submit_write(write, callback, USAGE)
+
+    def get_usage_journal_seq(self, journal):
+        """Günlüğün veritabanına işlenmiş son sıra numarası"""
+        self._sync()
+        with self.pool.read_connection() as conn:
+            return usage_store.get_journal_seq(conn.cursor(), journal)
 
     # Son X günün uygulama kullanım istatistiklerini getir
-    def get_app_usage_stats(self, days=7):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        since = (datetime.now() - timedelta(days=days)).isoformat()
-        c.execute('SELECT app_name, session_count, duration, last_used FROM app_usage WHERE last_used>=? ORDER BY duration DESC', (since,))
-        rows = c.fetchall()
-        conn.close()
-        return rows
+    def get_app_usage_stats(self, days=7, limit=None):
+        self._sync()
+        with self.pool.read_connection() as conn:
+            return usage_store.query_usage_stats(conn.cursor(), days, limit)
+
+    def get_app_usage_stats_with_seq(self, journal, days=7):
+        """(istatistikler, günlüğün işlenmiş son sıra numarası) aynı okuma anından
+
+        Çağıran, günlükte bu sıra numarasından sonraki oturumları (henüz yazılmamış)
+        istatistiklere ekleyebilir; arada biten toplu yazma iki kez sayılmaz.
+        """
+        self._sync()
+        with self.pool.read_connection() as conn:
+            if not conn.in_transaction:
+                conn.execute('BEGIN')  # İki sorgu aynı anlık görüntüyü görsün
+            c = conn.cursor()
+            return usage_store.query_usage_stats(c, days), usage_store.get_journal_seq(c, journal)
+
+    def prune_usage(self, callback=None):
+        """Saklama süresi dolan kullanım kovalarını sil"""
+        return self.submit_write(usage_store.prune_usage, callback, USAGE)
 
     # Hatırlatıcı fonksiyonları
-    def add_reminder(self, title, message, reminder_time):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+    def add_reminder(self, title, message, reminder_time, recurrence=None, until=None, callback=None):
+        """Hatırlatıcı ekle; yeni satır id'sini taşıyan Future döndürür
+
+        recurrence verilirse (RRULE metni) reminder_time serinin ilk tekrarıdır;
+        until serinin son tekrarıdır (sonsuz seride None).
+        """
         now = datetime.now().isoformat()
-        
+
         # reminder_time datetime objesi ise string'e çevir
         if isinstance(reminder_time, datetime):
             reminder_time_str = reminder_time.isoformat()
         else:
             reminder_time_str = str(reminder_time)
-            
-        c.execute('INSERT INTO reminders (title, message, reminder_time, created_at) VALUES (?, ?, ?, ?)',
-                  (title, message, reminder_time_str, now))
-        conn.commit()
-        conn.close()
-        
+
+        def write(c):
+            c.execute('INSERT INTO reminders (title, message, reminder_time, reminder_ts, created_at, recurrence, until_ts) '
+                      'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                      (title, message, reminder_time_str, to_timestamp(reminder_time), now,
+                       recurrence, to_timestamp(until)))
+            return c.lastrowid
+
+        return self.submit_write(write, callback, REMINDERS)
+
     def get_reminders(self, triggered=None):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        if triggered is not None:
-            c.execute('SELECT * FROM reminders WHERE triggered = ? ORDER BY reminder_time', (1 if triggered else 0,))
-        else:
-            c.execute('SELECT * FROM reminders ORDER BY reminder_time')
-        rows = c.fetchall()
-        conn.close()
-        return rows
-            
-    def update_reminder(self, reminder_id, **kwargs):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        if 'triggered' in kwargs:
-            c.execute('UPDATE reminders SET triggered = ? WHERE id = ?', (1 if kwargs['triggered'] else 0, reminder_id))
-        conn.commit()
-        conn.close()
-        
-    def delete_reminder(self, reminder_id):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('DELETE FROM reminders WHERE id = ?', (reminder_id,))
-        conn.commit()
-        conn.close()
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            if triggered is not None:
+                c.execute('SELECT * FROM reminders WHERE triggered = ? ORDER BY reminder_ts', (1 if triggered else 0,))
+            else:
+                c.execute('SELECT * FROM reminders ORDER BY reminder_ts')
+            return c.fetchall()
+
+    def get_pending_reminders(self, reminder_id=None):
+        """Tetiklenmemiş hatırlatıcılar: (id, title, message, reminder_ts, recurrence, until_ts, last_fired_ts)
+
+        reminder_id verilirse yalnızca o hatırlatıcı döner.
+        """
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            query = ('SELECT id, title, message, reminder_ts, recurrence, until_ts, last_fired_ts '
+                     'FROM reminders WHERE triggered = 0 AND reminder_ts IS NOT NULL')
+            if reminder_id is not None:
+                c.execute(query + ' AND id = ?', (reminder_id,))
+            else:
+                c.execute(query + ' ORDER BY reminder_ts')
+            return c.fetchall()
+
+    def get_reminders_in_window(self, start_ts, end_ts):
+        """[start_ts, end_ts) aralığına düşebilecek hatırlatıcılar
+
+        Tek seferlikler zamanı aralıkta olanlardır; seriler aralık bitmeden başlamış
+        ve aralık başlamadan bitmemiş olanlardır (tekrarlarını çağıran açar).
+        Satırlar: (id, title, message, reminder_ts, triggered, recurrence, until_ts, last_fired_ts)
+        """
+        self._sync()
+        columns = 'id, title, message, reminder_ts, triggered, recurrence, until_ts, last_fired_ts'
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute(f'''
+                SELECT {columns} FROM reminders
+                WHERE recurrence IS NULL AND reminder_ts >= ? AND reminder_ts < ?
+                UNION ALL
+                SELECT {columns} FROM reminders
+                WHERE recurrence IS NOT NULL AND reminder_ts < ? AND (until_ts IS NULL OR until_ts >= ?)
+                ORDER BY reminder_ts
+            ''', (start_ts, end_ts, end_ts, start_ts))
+            return c.fetchall()
+
+    def update_reminder(self, reminder_id, callback=None, **kwargs):
+        def write(c):
+            if 'triggered' in kwargs:
+                c.execute('UPDATE reminders SET triggered = ? WHERE id = ?', (1 if kwargs['triggered'] else 0, reminder_id))
+            if 'last_fired_ts' in kwargs:
+                c.execute('UPDATE reminders SET last_fired_ts = ? WHERE id = ?', (kwargs['last_fired_ts'], reminder_id))
+            return c.rowcount
+
+        return self.submit_write(write, callback, REMINDERS)
+
+    def mark_reminders_triggered(self, reminder_ids, callback=None):
+        """Hatırlatıcıları bildirim göstermeden tetiklenmiş say (kaçırılmış eski kayıtlar)"""
+        rows = [(reminder_id,) for reminder_id in reminder_ids]
+
+        def write(c):
+            c.executemany('UPDATE reminders SET triggered = 1 WHERE id = ?', rows)
+            return len(rows)
+
+        return self.submit_write(write, callback, REMINDERS)
+
+    def delete_reminder(self, reminder_id, callback=None):
+        def write(c):
+            c.execute('DELETE FROM reminders WHERE id = ?', (reminder_id,))
+            return c.rowcount
+
+        return self.submit_write(write, callback, REMINDERS)
 
     def execute_query(self, query, params=()):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute(query, params)
-        rows = c.fetchall()
-        conn.commit()
-        conn.close()
-        return rows
+        statement = _main_statement(query)
+        if not statement.lower().startswith(READ_ONLY_PREFIXES):
+            # Yazma sorgusu: yazıcı thread'inde çalıştır ve sonucu bekle
+            def write(c):
+                c.execute(query, params)
+                return c.fetchall()
+
+            match = _WRITE_TABLE.match(statement)
+            topic = TABLE_TOPICS.get(match.group(1).lower()) if match else None
+            if self.writer.in_writer_thread():
+                # Yazma callback'i içinden: kendi kuyruğunu beklemek kilitlenir
+                with self.pool.connection() as conn:
+                    rows = write(conn.cursor())
+                if topic is not None:
+                    changes.on_commit(topic)
+                return rows
+            return self.submit_write(write, topic=topic).result()
+
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute(query, params)
+            return c.fetchall()
+
+    # Açılan dosya geçmişi
+    def record_file_open(self, path, callback=None):
+        """Dosyanın açılma sayısını artır"""
+        now = int(datetime.now().timestamp())
+
+        def write(c):
+            c.execute('''
+                INSERT INTO file_opens (path, open_count, last_opened_ts) VALUES (?, 1, ?)
+                ON CONFLICT (path) DO UPDATE SET
+                    open_count = open_count + 1,
+                    last_opened_ts = excluded.last_opened_ts
+            ''', (path, now))
+
+        return self.submit_write(write, callback)
+
+    def get_file_open_counts(self):
+        """{yol: (açılma sayısı, son açılma zamanı)}"""
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT path, open_count, last_opened_ts FROM file_opens')
+            return {path: (count, last_ts) for path, count, last_ts in c.fetchall()}
 
     # Todo fonksiyonları
-    def add_todo(self, title):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
+    def add_todo(self, title, callback=None):
+        """Todo ekle; yeni satır id'sini taşıyan Future döndürür"""
         now = datetime.now().isoformat()
-        c.execute('INSERT INTO todos (title, created_at) VALUES (?, ?)', (title, now))
-        conn.commit()
-        conn.close()
-            
+
+        def write(c):
+            c.execute('INSERT INTO todos (title, created_at) VALUES (?, ?)', (title, now))
+            return c.lastrowid
+
+        return self.submit_write(write, callback, TODOS)
+
     def get_todos(self):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('SELECT * FROM todos ORDER BY created_at DESC')
-        rows = c.fetchall()
-        conn.close()
-        return rows
-
-    def complete_todo(self, todo_id):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('UPDATE todos SET completed = 1 WHERE id = ?', (todo_id,))
-        conn.commit()
-        conn.close()
-        
-    def delete_todo(self, todo_id):
-        conn = sqlite3.connect(self.db_path)
-        c = conn.cursor()
-        c.execute('DELETE FROM todos WHERE id = ?', (todo_id,))
-        conn.commit()
-        conn.close() 
\ No newline at end of file
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT * FROM todos ORDER BY created_at DESC')
+            return c.fetchall()
+
+    def complete_todo(self, todo_id, callback=None):
+        def write(c):
+            c.execute('UPDATE todos SET completed = 1 WHERE id = ?', (todo_id,))
+            return c.rowcount
+
+        return self.submit_write(write, callback, TODOS)
+
+    def delete_todo(self, todo_id, callback=None):
+        def write(c):
+            c.execute('DELETE FROM todos WHERE id = ?', (todo_id,))
+            return c.rowcount
+
+        return self.submit_write(write, callback, TODOS)
+
+    # Not fonksiyonları
+    def add_note(self, content, label=None, created_at=None, callback=None):
+        """Not ekle; yeni satır id'sini taşıyan Future döndürür"""
+        created_ts = to_timestamp(created_at or datetime.now())
+
+        def write(c):
+            c.execute('INSERT INTO notes (content, label, created_ts) VALUES (?, ?, ?)', (content, label, created_ts))
+            return c.lastrowid
+
+        return self.submit_write(write, callback, NOTES)
+
+    def get_recent_notes(self, limit=20):
+        """En yeni notlar: (id, content, label, created_ts), yeniden eskiye"""
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT id, content, label, created_ts FROM notes ORDER BY id DESC LIMIT ?', (limit,))
+            return c.fetchall()
+
+    def delete_note(self, note_id, callback=None):
+        def write(c):
+            c.execute('DELETE FROM notes WHERE id = ?', (note_id,))
+            return c.rowcount
+
+        return self.submit_write(write, callback, NOTES)
+
+    def get_change_counter(self, name):
+        """Tablonun (değişiklik sayacı, satır sayısı); tablo sayaç tutmuyorsa (0, 0)"""
+        self._sync()
+        with self.pool.read_connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT version, row_count FROM change_counters WHERE name = ?', (name,))
+            return c.fetchone() or (0, 0)
+
+    def import_notes(self, source, notes, callback=None):
+        """Eski not dosyasındaki notları tek transaction'da ekle
+
+        notes: (content, label, created_ts) kayıtları. Aynı kaynak daha önce
+        aktarıldıysa hiçbir şey yapmaz ve None döndürür; aksi halde eklenen sayıyı.
+        """
+        def write(c):
+            c.execute('SELECT 1 FROM note_imports WHERE path = ?', (source,))
+            if c.fetchone():
+                return None
+            c.executemany('INSERT INTO notes (content, label, created_ts) VALUES (?, ?, ?)', notes)
+            c.execute('INSERT INTO note_imports (path, note_count, imported_at) VALUES (?, ?, ?)',
+                      (source, len(notes), datetime.now().isoformat()))
+            return len(notes)
+
+        return self.submit_write(write, callback, NOTES)
@@ -0,0 +1,154 @@
+import os
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+
+class ConnectionPool:
+    """Aynı veritabanı dosyası için paylaşılan, sınırlı boyutlu SQLite bağlantı havuzu
+
+    Her veritabanı yolu için tek bir havuz vardır (ConnectionPool.get). Bağlantılar
+    bir kez açılır, WAL modu ve ayarlı pragmalarla hazırlanır ve thread'ler arasında
+    yeniden kullanılır. Aynı thread içinde iç içe kullanımda aynı bağlantı döner.
+    """
+
+    _pools = {}
+    _pools_lock = threading.Lock()
+
+    PRAGMAS = (
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        "PRAGMA temp_store=MEMORY",
+        "PRAGMA cache_size=-8000",
+        "PRAGMA busy_timeout=5000",
+    )
+
+    def __init__(self, db_path, max_size=4, timeout=5.0):
+        self.db_path = db_path
+        self.max_size = max_size
+        self.timeout = timeout
+        self.schema_ready = False  # _init_db bu havuz için çalıştı mı
+        self.writer = None  # Paylaşılan WriteQueue (Database tarafından kurulur)
+        self.init_lock = threading.Lock()
+
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    @classmethod
+    def get(cls, db_path, **kwargs):
+        """Verilen yol için paylaşılan havuzu getir (yoksa oluştur)"""
+        key = os.path.abspath(db_path) if db_path != ":memory:" else db_path
+        with cls._pools_lock:
+            pool = cls._pools.get(key)
+            if pool is None:
+                pool = cls(db_path, **kwargs)
+                cls._pools[key] = pool
+            return pool
+
+    @classmethod
+    def close_all(cls):
+        """Tüm havuzlardaki boştaki bağlantıları kapat"""
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+        for pool in pools:
+            pool.close()
+
+    def _create_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=self.timeout, check_same_thread=False)
+        for pragma in self.PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+            else:
+                create = False
+
+        if create:
+            try:
+                return self._create_connection()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        # Havuz dolu, bir bağlantının geri dönmesini bekle
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError("Veritabanı bağlantı havuzu dolu")
+
+    def _release(self, conn):
+        self._idle.put(conn)
+
+    @contextmanager
+    def connection(self):
+        """Havuzdan bağlantı al; blok başarılıysa commit, hata olursa rollback yap"""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            # Aynı thread içinde iç içe kullanım: dış blok commit eder
+            self._local.depth += 1
+            try:
+                yield conn
+            finally:
+                self._local.depth -= 1
+            return
+
+        conn = self._acquire()
+        self._local.conn = conn
+        self._local.depth = 1
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._local.conn = None
+            self._local.depth = 0
+            self._release(conn)
+
+    @contextmanager
+    def read_connection(self):
+        """Okuma bağlantısı: blok boyunca PRAGMA query_only açıktır
+
+        Yanlışlıkla buradan yapılan yazma, yazıcı thread'iyle yarışmak yerine hata
+        verir. Aynı thread'de zaten açık bir (yazma) bloğu varsa onun bağlantısı
+        olduğu gibi kullanılır.
+        """
+        if getattr(self._local, "conn", None) is not None:
+            with self.connection() as conn:
+                yield conn
+            return
+
+        with self.connection() as conn:
+            conn.execute("PRAGMA query_only=1")
+            try:
+                yield conn
+            finally:
+                conn.execute("PRAGMA query_only=0")
+
+    def close(self):
+        """Boştaki bağlantıları kapat (sonraki kullanımda yeniden açılır)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+            with self._lock:
+                self._created -= 1
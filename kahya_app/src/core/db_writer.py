@@ -0,0 +1,155 @@
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future
+
+# Yazıcı thread'ini durduran işaret (None yalnızca gecikme penceresini kapatır)
+_STOP = object()
+
+
+class WriteQueue:
+    """Veritabanı yazmalarını tek bir arka plan thread'inde toplu işleyen kuyruk
+
+    Yazma işlemleri (cursor alan fonksiyonlar) kuyruğa atılır ve hemen bir Future
+    döner. Yazıcı thread kuyruktaki işleri en fazla `max_latency` saniye bekleyerek
+    toplar ve tek bir transaction içinde commit eder (group commit). Her iş kendi
+    SAVEPOINT'inde çalıştığı için birinin hatası diğerlerini geri almaz.
+
+    İşlere sıra numarası verilir; wait_own() yalnızca çağıran thread'in kendi
+    gönderdiği yazmaları bekler, başka thread'lerin kuyruktaki işlerini beklemez.
+    """
+
+    def __init__(self, pool, max_batch=256, max_latency=0.05):
+        self.pool = pool
+        self.max_batch = max_batch
+        self.max_latency = max_latency
+
+        self._queue = queue.Queue()
+        self._pending = 0
+        self._submitted = 0  # Kuyruğa verilen son sıra numarası
+        self._committed = 0  # İşlenen (commit ya da hata) son sıra numarası
+        self._idle = threading.Condition()
+        self._closed = False
+        self._local = threading.local()
+        self._thread = threading.Thread(target=self._run, name="kahya-db-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, fn, callback=None):
+        """Yazma işini kuyruğa ekle; fn(cursor) sonucunu taşıyan Future döndür"""
+        future = Future()
+        if callback is not None:
+            future.add_done_callback(callback)
+
+        # Kapanış kontrolü ve kuyruğa ekleme close() ile aynı kilit altında:
+        # iş asla durdurma işaretinden sonra kuyruğa girmez
+        with self._idle:
+            closed = self._closed
+            if not closed:
+                self._pending += 1
+                self._submitted += 1
+                self._local.seq = self._submitted
+                self._queue.put((fn, future))
+
+        if closed:
+            # Kapanıştan sonra gelen yazmalar doğrudan işlenir
+            self._execute_batch([(fn, future)])
+        return future
+
+    def in_writer_thread(self):
+        return threading.current_thread() is self._thread
+
+    def wait_idle(self, timeout=None):
+        """Kuyruktaki tüm yazmalar commit edilene kadar bekle"""
+        if self.in_writer_thread():
+            return True
+        with self._idle:
+            return self._idle.wait_for(lambda: self._pending == 0, timeout)
+
+    def wait_own(self, timeout=None):
+        """Bu thread'in gönderdiği yazmalar commit edilene kadar bekle"""
+        seq = getattr(self._local, 'seq', 0)
+        if self.in_writer_thread():
+            return True
+        with self._idle:
+            if self._committed >= seq:
+                return True
+        self._queue.put(None)  # Kendi yazmamız için gecikme penceresini bekleme
+        with self._idle:
+            return self._idle.wait_for(lambda: self._committed >= seq, timeout)
+
+    def flush(self, timeout=None):
+        """Bekleyen yazmaları hemen işlet ve bitmelerini bekle"""
+        self._queue.put(None)  # Gecikme penceresini erken kapatır
+        return self.wait_idle(timeout)
+
+    def close(self, timeout=5.0):
+        """Kuyruğu boşalt ve yazıcı thread'i durdur"""
+        if self._closed:
+            return
+        self.flush(timeout)
+        with self._idle:
+            self._closed = True
+            self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+            if item is None:
+                continue
+
+            batch = [item]
+            deadline = time.monotonic() + self.max_latency
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._execute_batch(batch)
+            with self._idle:
+                self._pending -= len(batch)
+                self._committed += len(batch)
+                self._idle.notify_all()
+
+    def _execute_batch(self, batch):
+        results = []
+        try:
+            with self.pool.connection() as conn:
+                if not conn.in_transaction:
+                    conn.execute("BEGIN IMMEDIATE")
+                c = conn.cursor()
+                for fn, future in batch:
+                    c.execute("SAVEPOINT kahya_write")
+                    try:
+                        results.append((future, fn(c), None))
+                        c.execute("RELEASE kahya_write")
+                    except Exception as e:
+                        c.execute("ROLLBACK TO kahya_write")
+                        c.execute("RELEASE kahya_write")
+                        print(f"Veritabanı yazma hatası: {e}")
+                        results.append((future, None, e))
+        except sqlite3.Error as e:
+            # Commit başarısız oldu, tüm işler hata alır
+            print(f"Veritabanı yazma hatası: {e}")
+            results = [(future, None, e) for _, future in batch]
+
+        # Sonuçlar commit'ten sonra bildirilir
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
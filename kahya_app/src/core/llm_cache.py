@@ -0,0 +1,123 @@
+import hashlib
+import json
+import re
+import threading
+import time
+from src.core.turkish_text import tr_lower, fold_text
+
+# Anlamı değiştirmeyen nezaket/hitap kelimeleri (aksansız). Soru ekleri (mi, mu...)
+# ve "bir", "bana" gibi kelimeler anlamı değiştirebildiği için anahtarda kalır
+_FILLER_WORDS = {'acaba', 'lutfen', 'hey', 'kahya'}
+
+
+def normalize_prompt(text):
+    """Tam eşleşme anahtarı: Türkçe küçük harf + boşlukları sadeleştir"""
+    return ' '.join(tr_lower(text).split())
+
+
+def fuzzy_prompt(text):
+    """Yakın eşleşme anahtarı: aksansız, noktalamasız, nezaket kelimesiz
+
+    Kelime sırası, tekrarlar ve soru ekleri korunur; yalnızca yazımı farklı
+    aynı cümleler eşleşir.
+    """
+    text = fold_text(normalize_prompt(text))
+    words = re.sub(r'[^\w\s]', ' ', text).split()
+    return ' '.join(w for w in words if w not in _FILLER_WORDS)
+
+
+def _digest(*parts):
+    return hashlib.sha1('\x1f'.join(parts).encode('utf-8')).hexdigest()
+
+
+class ResponseCache:
+    """LLM yanıtları için Kahya veritabanında kalıcı önbellek
+
+    Anahtar (model, sistem prompt'u, normalize prompt, seçenekler) dörtlüsüdür. Kayıtlar `ttl` saniye
+    geçerlidir; `max_entries` aşılınca en uzun süredir kullanılmayanlar silinir (LRU).
+    Tam eşleşme yoksa isteğe bağlı olarak yakın eşleşme anahtarı denenir.
+    """
+
+    def __init__(self, db, max_entries=500, ttl=7 * 24 * 3600, fuzzy=True):
+        self.db = db
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.fuzzy = fuzzy
+
+        self.stats = {'hits': 0, 'fuzzy_hits': 0, 'misses': 0, 'stores': 0}
+        self._stats_lock = threading.Lock()
+
+    def _keys(self, model, prompt, options, system=''):
+        options_json = json.dumps(options or {}, sort_keys=True)
+        exact_key = _digest(model, system, normalize_prompt(prompt), options_json)
+        fuzzy_key = _digest(model, system, fuzzy_prompt(prompt), options_json)
+        return exact_key, fuzzy_key
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def get(self, model, prompt, options=None, system=''):
+        """Önbellekteki yanıtı getir, yoksa None"""
+        exact_key, fuzzy_key = self._keys(model, prompt, options, system)
+        min_created = int(time.time() - self.ttl)
+
+        rows = self.db.execute_query(
+            'SELECT key, response FROM llm_cache WHERE key = ? AND created_ts >= ?',
+            (exact_key, min_created)
+        )
+        stat = 'hits'
+        if not rows and self.fuzzy:
+            rows = self.db.execute_query(
+                'SELECT key, response FROM llm_cache WHERE fuzzy_key = ? AND created_ts >= ? '
+                'ORDER BY last_hit_ts DESC LIMIT 1',
+                (fuzzy_key, min_created)
+            )
+            stat = 'fuzzy_hits'
+
+        if not rows:
+            self._count('misses')
+            return None
+
+        key, response = rows[0]
+        self._count(stat)
+        now = int(time.time())
+
+        def touch(c):
+            c.execute('UPDATE llm_cache SET hits = hits + 1, last_hit_ts = ? WHERE key = ?', (now, key))
+
+        self.db.submit_write(touch)
+        return response
+
+    def put(self, model, prompt, options, response, system=''):
+        """Yanıtı önbelleğe yaz, süresi dolan ve fazla kayıtları temizle"""
+        exact_key, fuzzy_key = self._keys(model, prompt, options, system)
+        now = int(time.time())
+        max_entries = self.max_entries
+        min_created = now - self.ttl
+
+        def write(c):
+            c.execute('''
+                INSERT OR REPLACE INTO llm_cache (key, fuzzy_key, model, prompt, response, created_ts, last_hit_ts, hits)
+                VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+            ''', (exact_key, fuzzy_key, model, normalize_prompt(prompt), response, now, now))
+            c.execute('DELETE FROM llm_cache WHERE created_ts < ?', (min_created,))
+            c.execute('''
+                DELETE FROM llm_cache WHERE key IN (
+                    SELECT key FROM llm_cache ORDER BY last_hit_ts DESC LIMIT -1 OFFSET ?
+                )
+            ''', (max_entries,))
+
+        self._count('stores')
+        return self.db.submit_write(write)
+
+    def clear(self):
+        return self.db.submit_write(lambda c: c.execute('DELETE FROM llm_cache'))
+
+    def get_stats(self):
+        """İsabet/kaçırma sayaçları ve isabet oranı"""
+        with self._stats_lock:
+            stats = dict(self.stats)
+        lookups = stats['hits'] + stats['fuzzy_hits'] + stats['misses']
+        stats['hit_rate'] = ((stats['hits'] + stats['fuzzy_hits']) / lookups * 100) if lookups else 0
+        return stats
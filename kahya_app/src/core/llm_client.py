@@ -2,14 +2,74 @@ import requests
 import json
 import os
 import random
+import threading
 from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.core.llm_health import OllamaHealth
+from src.core.llm_cache import ResponseCache
+from src.core.database import Database
+
+# Kahya'nın sistem prompt'u
+SYSTEM_PROMPT = """Sen Kahya adında yardımcı bir AI asistanısın. 
+        Kullanıcıya Türkçe olarak yanıt ver. 
+        Kısa, öz ve yardımcı ol.
+        
+        ÖNEMLİ: Eğer kullanıcı aşağıdaki işlemlerden birini istiyorsa, 
+        sadece işlemi gerçekleştir ve kısa bir onay mesajı ver:
+        
+        HATIRLATICI İŞLEMLERİ:
+        - "20 sinde sınav var" → Hatırlatıcı ekle
+        - "cumartesi piknik var" → Hatırlatıcı ekle  
+        - "yarın 14:30 toplantı" → Hatırlatıcı ekle
+        - "bu ayın 15'inde doğum günü" → Hatırlatıcı ekle
+        
+        NOT ALMA İŞLEMLERİ:
+        - "not al bu önemli" → Not kaydet
+        - "kaydet alışveriş listesi" → Not kaydet
+        - "yaz önemli bilgi" → Not kaydet
+        
+        TODO İŞLEMLERİ:
+        - "yapılacak alışveriş yap" → Todo ekle
+        - "görev ev temizliği" → Todo ekle
+        
+        LİSTELEME İŞLEMLERİ:
+        - "hatırlatıcılarım" → Hatırlatıcıları listele
+        - "notlarım" → Notları listele
+        - "yapılacaklarım" → Todo'ları listele
+        
+        Eğer bu işlemlerden biri değilse, normal sohbet yanıtı ver."""
+
 
 class LLMClient:
-    def __init__(self, model: str = "qwen2.5:7b", base_url: str = "http://localhost:11434"):
+    def __init__(self, model: str = "qwen2.5:7b", base_url: str = "http://localhost:11434",
+                 pool_size: int = 4, retries: int = 2, backoff: float = 0.3,
+                 connect_timeout: float = 3.0, read_timeout: float = 30.0,
+                 keep_alive: str = "30m", db_path: str = None):
         self.model = model
         self.base_url = base_url.rstrip('/')
         self.api_url = f"{self.base_url}/api/generate"
         
+        # Bağlantı (connect) ve okuma (read) zaman aşımları ayrı
+        self.timeout = (connect_timeout, read_timeout)
+        self.probe_timeout = (connect_timeout, 2.0)
+        # Modelin Ollama belleğinde kalma süresi (her istekte gönderilir)
+        self.keep_alive = keep_alive
+        self.session = self._create_session(pool_size, retries, backoff)
+        
+        # Üretim seçenekleri (önbellek anahtarının da parçası)
+        self.options = {
+            "num_predict": 200,
+            "temperature": 0.7,
+            "top_p": 0.9
+        }
+        
+        # Sistem prompt'u (önbellek anahtarının da parçası)
+        self.system_prompt = SYSTEM_PROMPT
+        
+        # Tekrarlanan sorular için kalıcı yanıt önbelleği (veritabanı verilirse)
+        self.cache = ResponseCache(Database(db_path)) if db_path else None
+        
         # Eğer Ollama çalışmıyorsa, basit yanıtlar ver
         self.fallback_responses = [
             "Anlıyorum, size nasıl yardımcı olabilirim?",
@@ -24,88 +84,200 @@ class LLMClient:
             "Bu konuda size rehberlik edebilirim."
         ]
         
-    def get_response(self, message):
-        """LLM'den yanıt al"""
-        if not self.is_available():
-            return self._get_fallback_response(message)
+        # Önbellekli erişilebilirlik ve devre kesici
+        self.health = OllamaHealth(self._probe)
+        
+    def _create_session(self, pool_size, retries, backoff):
+        """Keep-alive bağlantı havuzlu HTTP oturumu oluştur"""
+        session = requests.Session()
+        # Yalnızca bağlantı kurulamadığında ve geçici 502/503/504'te tekrar dene;
+        # okuma hatasında POST tekrarlanmaz (aynı yanıt iki kez üretilmesin)
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=0,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=(502, 503, 504),
+            allowed_methods=frozenset(["GET", "POST"]),
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+        
+    def warm_up(self):
+        """Modeli arka planda belleğe yükle (boş prompt modeli yalnızca yükler)"""
+        def load():
+            try:
+                self.session.post(self.api_url, json={"model": self.model, "keep_alive": self.keep_alive},
+                                  timeout=(self.timeout[0], 120))
+            except requests.exceptions.RequestException:
+                pass
+        threading.Thread(target=load, daemon=True).start()
+        
+    def close(self):
+        """HTTP oturumunu ve sağlık yoklamasını kapat"""
+        self.health.stop()
+        self.session.close()
+        
+    def _build_payload(self, message, stream=False):
+        """Ollama /api/generate istek gövdesini oluştur"""
+        # Ollama API formatı
+        full_prompt = f"{self.system_prompt}\n\nKullanıcı: {message}\nKahya:"
+        
+        return {
+            "model": self.model,
+            "prompt": full_prompt,
+            "stream": stream,
+            "keep_alive": self.keep_alive,
+            "options": self.options
+        }
+        
+    def _record_status(self, status_code):
+        """HTTP durumunu devre kesiciye bildir (5xx servis hatası sayılır)"""
+        if status_code >= 500:
+            self.health.record_failure()
+        else:
+            self.health.record_success()
             
+    def _cached_response(self, message):
+        if self.cache is None:
+            return None
         try:
-            # Ollama API formatı
-            system_prompt = """Sen Kahya adında yardımcı bir AI asistanısın. 
-            Kullanıcıya Türkçe olarak yanıt ver. 
-            Kısa, öz ve yardımcı ol.
-            
-            ÖNEMLİ: Eğer kullanıcı aşağıdaki işlemlerden birini istiyorsa, 
-            sadece işlemi gerçekleştir ve kısa bir onay mesajı ver:
-            
-            HATIRLATICI İŞLEMLERİ:
-            - "20 sinde sınav var" → Hatırlatıcı ekle
-            - "cumartesi piknik var" → Hatırlatıcı ekle  
-            - "yarın 14:30 toplantı" → Hatırlatıcı ekle
-            - "bu ayın 15'inde doğum günü" → Hatırlatıcı ekle
-            
-            NOT ALMA İŞLEMLERİ:
-            - "not al bu önemli" → Not kaydet
-            - "kaydet alışveriş listesi" → Not kaydet
-            - "yaz önemli bilgi" → Not kaydet
-            
-            TODO İŞLEMLERİ:
-            - "yapılacak alışveriş yap" → Todo ekle
-            - "görev ev temizliği" → Todo ekle
-            
-            LİSTELEME İŞLEMLERİ:
-            - "hatırlatıcılarım" → Hatırlatıcıları listele
-            - "notlarım" → Notları listele
-            - "yapılacaklarım" → Todo'ları listele
+            return self.cache.get(self.model, message, self.options, self.system_prompt)
+        except Exception as e:
+            print(f"Yanıt önbelleği okuma hatası: {e}")
+            return None
             
-            Eğer bu işlemlerden biri değilse, normal sohbet yanıtı ver."""
+    def _store_response(self, message, response):
+        if self.cache is None or not response:
+            return
+        try:
+            self.cache.put(self.model, message, self.options, response, self.system_prompt)
+        except Exception as e:
+            print(f"Yanıt önbelleği yazma hatası: {e}")
             
-            full_prompt = f"{system_prompt}\n\nKullanıcı: {message}\nKahya:"
+    def get_cache_stats(self):
+        """Yanıt önbelleği isabet/kaçırma sayaçları"""
+        return self.cache.get_stats() if self.cache else {}
+        
+    def get_response(self, message):
+        """LLM'den yanıt al"""
+        cached = self._cached_response(message)
+        if cached is not None:
+            return cached
             
-            data = {
-                "model": self.model,
-                "prompt": full_prompt,
-                "stream": False,
-                "options": {
-                    "num_predict": 200,
-                    "temperature": 0.7,
-                    "top_p": 0.9
-                }
-            }
+        # Devre açıksa Ollama'yı hiç beklemeden yedek yanıt ver
+        if not self.health.allow_request():
+            return self._get_fallback_response(message)
             
-            response = requests.post(self.api_url, json=data, timeout=30)
+        try:
+            data = self._build_payload(message)
+            response = self.session.post(self.api_url, json=data, timeout=self.timeout)
+            self._record_status(response.status_code)
             
             if response.status_code == 200:
                 result = response.json()
-                return result.get("response", "Yanıt alınamadı").strip()
+                text = result.get("response", "").strip()
+                self._store_response(message, text)
+                return text or "Yanıt alınamadı"
             else:
                 return f"Ollama API hatası: {response.status_code} - {response.text}"
                 
         except requests.exceptions.Timeout:
+            self.health.record_failure()
             return "Yanıt zaman aşımına uğradı. Ollama servisinin çalıştığından emin olun."
         except requests.exceptions.ConnectionError:
-            return "Ollama servisine bağlanılamadı. Ollama'nın çalıştığından emin olun."
+            self.health.record_failure()
+            return self._get_fallback_response(message)
         except requests.exceptions.RequestException as e:
+            self.health.record_failure()
             return f"Bağlantı hatası: {str(e)}"
         except Exception as e:
+            # Bozuk yanıt vb.; yarım açık devredeki deneme isteği de böylece kapanır
+            self.health.record_failure()
             return f"Beklenmeyen hata: {str(e)}"
             
+    def stream_response(self, message):
+        """LLM yanıtını parça parça üret (Ollama NDJSON akışı)
+
+        Her parça geldiği anda döner; hata durumunda get_response ile aynı
+        hata metinleri tek parça olarak üretilir.
+        """
+        cached = self._cached_response(message)
+        if cached is not None:
+            yield cached
+            return
+            
+        if not self.health.allow_request():
+            yield self._get_fallback_response(message)
+            return
+            
+        try:
+            data = self._build_payload(message, stream=True)
+            with self.session.post(self.api_url, json=data, stream=True, timeout=self.timeout) as response:
+                self._record_status(response.status_code)
+                if response.status_code != 200:
+                    yield f"Ollama API hatası: {response.status_code} - {response.text}"
+                    return
+                    
+                parts = []
+                for line in response.iter_lines():
+                    if not line:
+                        continue
+                    chunk = json.loads(line)
+                    if chunk.get("error"):
+                        yield f"Ollama API hatası: {chunk['error']}"
+                        return
+                    text = chunk.get("response", "")
+                    if text:
+                        parts.append(text)
+                        yield text
+                    if chunk.get("done"):
+                        # Yalnızca eksiksiz tamamlanan yanıtlar önbelleğe girer
+                        self._store_response(message, "".join(parts).strip())
+                        break
+                        
+        except requests.exceptions.Timeout:
+            self.health.record_failure()
+            yield "Yanıt zaman aşımına uğradı. Ollama servisinin çalıştığından emin olun."
+        except requests.exceptions.ConnectionError:
+            self.health.record_failure()
+            yield self._get_fallback_response(message)
+        except requests.exceptions.RequestException as e:
+            self.health.record_failure()
+            yield f"Bağlantı hatası: {str(e)}"
+        except Exception as e:
+            # Bozuk NDJSON satırı vb.; yarım açık devredeki deneme isteği de böylece kapanır
+            self.health.record_failure()
+            yield f"Beklenmeyen hata: {str(e)}"
+            
     def _get_fallback_response(self, message):
         """Ollama çalışmıyorsa basit yanıt ver"""
         return random.choice(self.fallback_responses)
         
-    def is_available(self):
-        """Ollama servisinin kullanılabilir olup olmadığını kontrol et"""
+    def _probe(self):
+        """Ollama'yı doğrudan yokla (OllamaHealth tarafından çağrılır)"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.probe_timeout)
             return response.status_code == 200
         except:
             return False
+            
+    def is_available(self):
+        """Ollama servisinin kullanılabilir olup olmadığını kontrol et (önbellekli)"""
+        return self.health.is_available()
+        
+    def get_health_metrics(self):
+        """Devre kesici durumu ve sayaçları"""
+        return self.health.get_metrics()
     
     def get_available_models(self):
         """Kullanılabilir modelleri listele"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
             if response.status_code == 200:
                 result = response.json()
                 return [model["name"] for model in result.get("models", [])]
@@ -116,7 +288,8 @@ class LLMClient:
     def test_connection(self):
         """Ollama bağlantısını test et"""
         try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
+            response = self.session.get(f"{self.base_url}/api/tags", timeout=self.timeout)
+            self._record_status(response.status_code)
             if response.status_code == 200:
                 return True, "Ollama servisi çalışıyor"
             else:
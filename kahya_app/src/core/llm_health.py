@@ -0,0 +1,165 @@
+import threading
+import time
+
+
+class OllamaHealth:
+    """Ollama servis durumu: önbellekli erişilebilirlik + devre kesici
+
+    - Erişilebilirlik sonucu `ttl` saniye önbellekte tutulur; süresi dolunca sohbet
+      yolu beklemez, yenileme arka planda yapılır.
+    - Art arda `failure_threshold` hata devreyi açar (OPEN); bu sürede istekler
+      hiç gönderilmeden yedek yanıta düşer.
+    - `reset_timeout` sonra devre yarı açılır (HALF_OPEN) ve tek bir deneme isteğine
+      izin verilir; başarılıysa kapanır, değilse yeniden açılır.
+    - Açık devrede arka plan thread'i servisi `probe_interval` aralıkla yoklar.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, probe, ttl=30.0, failure_threshold=3, reset_timeout=15.0, probe_interval=10.0):
+        self.probe = probe  # Erişilebilirse True döndüren fonksiyon
+        self.ttl = ttl
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.probe_interval = probe_interval
+
+        self.state = self.CLOSED
+        self.available = None  # None: henüz bilinmiyor
+        self.checked_at = 0.0
+        self.opened_at = 0.0
+        self.consecutive_failures = 0
+        self._trial_in_flight = False
+
+        self.metrics = {
+            'probes': 0,
+            'probe_failures': 0,
+            'successes': 0,
+            'failures': 0,
+            'fast_fails': 0,
+            'transitions': {},  # "eski->yeni": sayı
+        }
+        self.transition_log = []  # (zaman, eski, yeni) - son 50 geçiş
+
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._probe_loop, name="kahya-ollama-health", daemon=True)
+        self._thread.start()
+        self._wakeup.set()  # İlk yoklama arka planda
+
+    # Durum geçişleri
+    def _set_state(self, new_state):
+        """Kilit altında çağrılmalı"""
+        old_state = self.state
+        if old_state == new_state:
+            return
+        self.state = new_state
+        key = f"{old_state}->{new_state}"
+        self.metrics['transitions'][key] = self.metrics['transitions'].get(key, 0) + 1
+        self.transition_log.append((time.time(), old_state, new_state))
+        del self.transition_log[:-50]
+        if new_state == self.OPEN:
+            self.opened_at = time.monotonic()
+            self._wakeup.set()  # Arka plan yoklamasını başlat
+
+    def _mark(self, available):
+        self.available = available
+        self.checked_at = time.monotonic()
+
+    def is_available(self):
+        """Önbellekteki erişilebilirlik durumu (sohbet yolunu asla bekletmez)"""
+        with self._lock:
+            if self.state == self.OPEN and not self._reset_elapsed():
+                return False
+            stale = time.monotonic() - self.checked_at > self.ttl
+            available = self.available
+        if stale:
+            self._wakeup.set()
+        # Bilinmiyorsa iyimser davran; asıl istek sonucu durumu günceller
+        return available is not False
+
+    def _reset_elapsed(self):
+        return time.monotonic() - self.opened_at >= self.reset_timeout
+
+    def allow_request(self):
+        """İstek gönderilebilir mi? Açık devrede hızlıca False döner"""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN:
+                if not self._reset_elapsed():
+                    self.metrics['fast_fails'] += 1
+                    return False
+                self._set_state(self.HALF_OPEN)
+            # HALF_OPEN: aynı anda yalnızca bir deneme isteği
+            if self._trial_in_flight:
+                self.metrics['fast_fails'] += 1
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.metrics['successes'] += 1
+            self.consecutive_failures = 0
+            self._trial_in_flight = False
+            self._mark(True)
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self.metrics['failures'] += 1
+            self.consecutive_failures += 1
+            self._trial_in_flight = False
+            self._mark(False)
+            if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                self._set_state(self.OPEN)
+
+    def check_now(self):
+        """Servisi hemen yokla ve durumu güncelle"""
+        with self._lock:
+            self.metrics['probes'] += 1
+        try:
+            ok = bool(self.probe())
+        except Exception:
+            ok = False
+        with self._lock:
+            self._mark(ok)
+            if ok:
+                self.consecutive_failures = 0
+                self._set_state(self.CLOSED)
+            else:
+                self.metrics['probe_failures'] += 1
+                self.consecutive_failures += 1
+                if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                    self._set_state(self.OPEN)
+        return ok
+
+    def _probe_loop(self):
+        while not self._stopped:
+            requested = self._wakeup.wait(self.probe_interval)
+            self._wakeup.clear()
+            if self._stopped:
+                break
+            with self._lock:
+                stale = time.monotonic() - self.checked_at > self.ttl
+                # Kapalı devrede yalnızca istenince, açıkken düzenli yokla
+                needs_probe = self.state != self.CLOSED or (requested and stale)
+            if needs_probe:
+                self.check_now()
+
+    def get_metrics(self):
+        """Durum ve sayaçların kopyası"""
+        with self._lock:
+            metrics = dict(self.metrics)
+            metrics['transitions'] = dict(self.metrics['transitions'])
+            metrics['state'] = self.state
+            metrics['available'] = self.available
+            metrics['consecutive_failures'] = self.consecutive_failures
+            return metrics
+
+    def stop(self):
+        self._stopped = True
+        self._wakeup.set()
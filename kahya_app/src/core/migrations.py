@@ -0,0 +1,251 @@
+from datetime import datetime, date
+from src.core import usage_store
+
+
+def to_timestamp(value):
+    """datetime/date/ISO metni sıralanabilir tam sayı zaman damgasına çevir (saniye)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, date) and not isinstance(value, datetime):
+        value = datetime.combine(value, datetime.min.time())
+    if not isinstance(value, datetime):
+        try:
+            value = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    return int(value.timestamp())
+
+
+def _backfill_timestamps(c, table, text_column, ts_column):
+    """Metin tarih sütunundan tam sayı zaman damgası sütununu doldur"""
+    c.execute(f'SELECT id, {text_column} FROM {table} WHERE {ts_column} IS NULL')
+    rows = [(to_timestamp(value), row_id) for row_id, value in c.fetchall()]
+    c.executemany(f'UPDATE {table} SET {ts_column} = ? WHERE id = ?', rows)
+
+
+def _add_column(c, table, column, definition):
+    c.execute(f'PRAGMA table_info({table})')
+    if column not in [row[1] for row in c.fetchall()]:
+        c.execute(f'ALTER TABLE {table} ADD COLUMN {column} {definition}')
+
+
+# Migrasyon adımları
+def _m001_base_tables(c):
+    # Kullanıcı profili tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS user_profile (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT,
+            preferences TEXT,
+            created_at TEXT,
+            updated_at TEXT
+        )
+    ''')
+    # Uygulama kullanım logları
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS app_usage (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            app_name TEXT,
+            session_count INTEGER DEFAULT 1,
+            duration INTEGER,
+            last_used TEXT
+        )
+    ''')
+    # Hatırlatıcılar tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS reminders (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            message TEXT,
+            reminder_time TEXT,
+            triggered INTEGER DEFAULT 0,
+            created_at TEXT
+        )
+    ''')
+    # Todo tablosu
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS todos (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT,
+            completed INTEGER DEFAULT 0,
+            created_at TEXT
+        )
+    ''')
+
+
+def _m002_integer_timestamps(c):
+    # Yeni sütunlar sona eklenir, SELECT * ile dönen satırlarda eski indeksler korunur
+    _add_column(c, 'reminders', 'reminder_ts', 'INTEGER')
+    _add_column(c, 'app_usage', 'last_used_ts', 'INTEGER')
+    _backfill_timestamps(c, 'reminders', 'reminder_time', 'reminder_ts')
+    _backfill_timestamps(c, 'app_usage', 'last_used', 'last_used_ts')
+
+
+def _m003_indexes(c):
+    # Vadesi gelen / yaklaşan hatırlatıcı sorguları
+    c.execute('CREATE INDEX IF NOT EXISTS idx_reminders_triggered_ts ON reminders (triggered, reminder_ts)')
+    # Tüm hatırlatıcıların zaman sıralı listesi
+    c.execute('CREATE INDEX IF NOT EXISTS idx_reminders_ts ON reminders (reminder_ts)')
+    # log_app_usage: uygulamanın son kaydını bul
+    c.execute('CREATE INDEX IF NOT EXISTS idx_app_usage_app_ts ON app_usage (app_name, last_used_ts)')
+    # get_app_usage_stats: zaman aralığı taraması
+    c.execute('CREATE INDEX IF NOT EXISTS idx_app_usage_ts ON app_usage (last_used_ts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_todos_created ON todos (created_at)')
+
+
+def _m004_usage_time_series(c):
+    usage_store.create_tables(c)
+    # Eski app_usage satırlarını kovalara taşı (tablo artık yazılmıyor)
+    c.execute('SELECT app_name, session_count, duration, last_used_ts FROM app_usage WHERE last_used_ts IS NOT NULL')
+    for app_name, session_count, duration, last_used_ts in c.fetchall():
+        usage_store.record_usage(c, app_name, duration or 0, datetime.fromtimestamp(last_used_ts),
+                                 sessions=session_count or 1)
+    usage_store.prune_usage(c)
+
+
+def _m005_llm_cache(c):
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS llm_cache (
+            key TEXT PRIMARY KEY,
+            fuzzy_key TEXT NOT NULL,
+            model TEXT,
+            prompt TEXT,
+            response TEXT,
+            created_ts INTEGER NOT NULL,
+            last_hit_ts INTEGER NOT NULL,
+            hits INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    # Yakın eşleşme araması ve LRU/TTL temizliği
+    c.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_fuzzy ON llm_cache (fuzzy_key, last_hit_ts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_last_hit ON llm_cache (last_hit_ts)')
+    c.execute('CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache (created_ts)')
+
+
+def _m006_file_opens(c):
+    # Kahya üzerinden açılan dosyalar (dosya arama sıralamasında sıklık puanı)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS file_opens (
+            path TEXT PRIMARY KEY,
+            open_count INTEGER NOT NULL DEFAULT 0,
+            last_opened_ts INTEGER NOT NULL
+        )
+    ''')
+
+
+def _m007_usage_journal(c):
+    # Toplu kullanım yazmalarının hangi günlük kaydına kadar işlendiği
+    usage_store.create_journal_table(c)
+
+
+def _m008_recurring_reminders(c):
+    # Tekrar kuralı (RRULE alt kümesi), seri bitişi ve son tetiklenen tekrar
+    _add_column(c, 'reminders', 'recurrence', 'TEXT')
+    _add_column(c, 'reminders', 'until_ts', 'INTEGER')
+    _add_column(c, 'reminders', 'last_fired_ts', 'INTEGER')
+    # Pencere sorgularında yalnızca seriler taranır
+    c.execute('CREATE INDEX IF NOT EXISTS idx_reminders_series ON reminders (reminder_ts) WHERE recurrence IS NOT NULL')
+
+
+def _m009_notes(c):
+    # Notlar (kahya_notes.txt yerine); en yeni notlar id sırasıyla okunur
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS notes (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            content TEXT NOT NULL,
+            label TEXT,
+            created_ts INTEGER NOT NULL
+        )
+    ''')
+    # Tablo başına değişiklik sayacı ve satır sayısı; tetikleyicilerle güncel tutulur
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS change_counters (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL DEFAULT 0,
+            row_count INTEGER NOT NULL DEFAULT 0
+        )
+    ''')
+    c.execute("INSERT OR IGNORE INTO change_counters (name, version, row_count) "
+              "SELECT 'notes', 0, COUNT(*) FROM notes")
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS notes_after_insert AFTER INSERT ON notes BEGIN
+            UPDATE change_counters SET version = version + 1, row_count = row_count + 1 WHERE name = 'notes';
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS notes_after_delete AFTER DELETE ON notes BEGIN
+            UPDATE change_counters SET version = version + 1, row_count = row_count - 1 WHERE name = 'notes';
+        END
+    ''')
+    c.execute('''
+        CREATE TRIGGER IF NOT EXISTS notes_after_update AFTER UPDATE ON notes BEGIN
+            UPDATE change_counters SET version = version + 1 WHERE name = 'notes';
+        END
+    ''')
+    # İçe aktarılmış eski not dosyaları (aynı dosya iki kez aktarılmaz)
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS note_imports (
+            path TEXT PRIMARY KEY,
+            note_count INTEGER NOT NULL,
+            imported_at TEXT NOT NULL
+        )
+    ''')
+
+
+# (sürüm, açıklama, fonksiyon) - sürümler artan sırada olmalı
+MIGRATIONS = [
+    (1, "temel tablolar", _m001_base_tables),
+    (2, "tam sayı zaman damgaları", _m002_integer_timestamps),
+    (3, "sorgu indeksleri", _m003_indexes),
+    (4, "kullanım zaman serisi kovaları", _m004_usage_time_series),
+    (5, "LLM yanıt önbelleği", _m005_llm_cache),
+    (6, "açılan dosya geçmişi", _m006_file_opens),
+    (7, "kullanım günlüğü durumu", _m007_usage_journal),
+    (8, "tekrarlayan hatırlatıcılar", _m008_recurring_reminders),
+    (9, "not tablosu", _m009_notes),
+]
+
+
+def get_schema_version(conn):
+    """Veritabanının mevcut şema sürümünü getir"""
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS schema_version (
+            version INTEGER PRIMARY KEY,
+            description TEXT,
+            applied_at TEXT
+        )
+    ''')
+    row = conn.execute('SELECT MAX(version) FROM schema_version').fetchone()
+    return row[0] or 0
+
+
+def migrate(conn, migrations=MIGRATIONS):
+    """Uygulanmamış migrasyonları sırayla uygula, son şema sürümünü döndür
+
+    Her adım kendi transaction'ında çalışır ve sürüm yazma kilidi alındıktan sonra
+    yeniden kontrol edilir; aynı anda açılan iki süreç aynı adımı iki kez uygulamaz.
+    """
+    if conn.in_transaction:
+        conn.commit()
+    version = get_schema_version(conn)
+    conn.commit()
+
+    for step_version, description, step in migrations:
+        if step_version <= version:
+            continue
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            version = get_schema_version(conn)
+            if step_version > version:
+                c = conn.cursor()
+                step(c)
+                c.execute('INSERT INTO schema_version (version, description, applied_at) VALUES (?, ?, ?)',
+                          (step_version, description, datetime.now().isoformat()))
+                version = step_version
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+    return version
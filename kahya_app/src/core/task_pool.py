@@ -0,0 +1,160 @@
+import queue
+import threading
+
+
+class Task:
+    """Havuza gönderilmiş iş; iptal bayrağı işin kendisi tarafından kontrol edilir"""
+
+    def __init__(self, fn, args, kwargs, on_cancel=None):
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.on_cancel = on_cancel
+        self.cancelled = False
+        self.epoch = 0  # Şeridin gönderim anındaki iptal dönemi
+        self.done = threading.Event()
+
+    def cancel(self):
+        if self.cancelled or self.done.is_set():
+            return
+        self.cancelled = True
+        if self.on_cancel:
+            try:
+                self.on_cancel()
+            except Exception as e:
+                print(f"İptal hatası: {e}")
+
+
+class TaskLane:
+    """Sınırlı sayıda worker thread'i ve sınırlı kuyruğu olan iş şeridi
+
+    - Kuyruk doluysa submit None döndürür (geri basınç).
+    - `supersede=True` ise yeni iş, bekleyen ve çalışan eski işleri iptal eder
+      (ör. kullanıcı yeni mesaj yazınca eski LLM isteğinin sonucu artık gereksizdir).
+    - Worker thread'leri ilk işte açılır ve yeniden kullanılır.
+    """
+
+    def __init__(self, name, max_workers, max_pending, supersede=False):
+        self.name = name
+        self.max_workers = max_workers
+        self.supersede = supersede
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._running = set()
+        self._workers = []
+        self._lock = threading.Lock()
+        self._stopped = False
+        # cancel_all her çağrıldığında artar; kuyruktan alınmış ama henüz
+        # _running'e girmemiş işler de bu sayede iptal edilmiş sayılır
+        self._epoch = 0
+
+    def submit(self, fn, *args, on_cancel=None, **kwargs):
+        if self._stopped:
+            return None
+        task = Task(fn, args, kwargs, on_cancel)
+
+        with self._lock:
+            if self.supersede:
+                self._cancel_all_locked()
+            task.epoch = self._epoch
+            self._ensure_workers_locked()
+            try:
+                self._queue.put_nowait(task)
+            except queue.Full:
+                return None
+        return task
+
+    def _cancel_all_locked(self):
+        self._epoch += 1
+        while True:
+            try:
+                pending = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            pending.cancel()
+            pending.done.set()
+        for running in list(self._running):
+            running.cancel()
+
+    def cancel_all(self):
+        """Bekleyen ve çalışan tüm işleri iptal et"""
+        with self._lock:
+            self._cancel_all_locked()
+
+    def _ensure_workers_locked(self):
+        if len(self._workers) >= self.max_workers:
+            return
+        # Boşta worker yoksa yeni thread aç (üst sınıra kadar)
+        if len(self._running) + self._queue.qsize() >= len(self._workers):
+            worker = threading.Thread(target=self._work, name=f"kahya-{self.name}-{len(self._workers)}", daemon=True)
+            self._workers.append(worker)
+            worker.start()
+
+    def pending_count(self):
+        return self._queue.qsize() + len(self._running)
+
+    def _work(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                break
+            # İptal yolu ile aynı kilit altında: ya burada iptal görülür ya da
+            # iş _running'e girer ve sonraki cancel_all onu bulur
+            with self._lock:
+                if task.epoch != self._epoch:
+                    task.cancel()
+                if task.cancelled:
+                    task.done.set()
+                    continue
+                self._running.add(task)
+            try:
+                task.fn(*task.args, **task.kwargs)
+            except Exception as e:
+                print(f"{self.name} görev hatası: {e}")
+            finally:
+                with self._lock:
+                    self._running.discard(task)
+                task.done.set()
+
+    def shutdown(self):
+        with self._lock:
+            self._stopped = True
+            self._cancel_all_locked()
+            workers = list(self._workers)
+        for _ in workers:
+            self._queue.put(None)
+
+
+class TaskPool:
+    """Uygulama genelinde paylaşılan iş havuzu (hızlı yerel komutlar / yavaş LLM)"""
+
+    FAST = 'fast'
+    LLM = 'llm'
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.lanes = {
+            # Yerel komutlar: kısa işler, birkaç paralel worker
+            self.FAST: TaskLane(self.FAST, max_workers=2, max_pending=16),
+            # LLM istekleri: Ollama'ya aynı anda tek istek, yenisi eskisini iptal eder
+            self.LLM: TaskLane(self.LLM, max_workers=1, max_pending=1, supersede=True),
+        }
+
+    @classmethod
+    def shared(cls):
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def submit(self, kind, fn, *args, on_cancel=None, **kwargs):
+        """İşi ilgili şeride gönder; kuyruk doluysa None döner"""
+        return self.lanes[kind].submit(fn, *args, on_cancel=on_cancel, **kwargs)
+
+    def cancel(self, kind):
+        self.lanes[kind].cancel_all()
+
+    def shutdown(self):
+        for lane in self.lanes.values():
+            lane.shutdown()
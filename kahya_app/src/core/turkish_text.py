@@ -0,0 +1,24 @@
+import unicodedata
+
+# Türkçe büyük/küçük harf dönüşümü (Python'un lower() fonksiyonu İ/I için yanlış)
+_TR_LOWER = str.maketrans({'I': 'ı', 'İ': 'i'})
+# Türkçe harflerin aksansız karşılıkları
+_TR_ASCII = str.maketrans('çğıöşüâîû', 'cgiosuaiu')
+
+
+def tr_lower(text):
+    """Türkçe kurallarıyla küçük harfe çevir (I -> ı, İ -> i)"""
+    return (text or '').translate(_TR_LOWER).lower()
+
+
+def fold_text(text):
+    """Aksansız, Türkçe küçük harfli karşılaştırma biçimi ("Özgeçmiş" -> "ozgecmis")
+
+    Türkçe harfler doğrudan, diğer aksanlı harfler (é, ñ...) ve ayrışık (NFD) yazılmış
+    dosya adları birleşik işaretleri atılarak sadeleştirilir.
+    """
+    text = tr_lower(text).translate(_TR_ASCII)
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).translate(_TR_ASCII)
@@ -0,0 +1,160 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+
+# Veritabanı uzun süre yazılamazsa bellekte en fazla bu kadar oturum tutulur (en eskiler düşer)
+MAX_BUFFERED_EVENTS = 10000
+
+
+class UsageBuffer:
+    """Uygulama kullanım oturumlarını biriktirip toplu yazan tampon
+
+    Her oturum önce sıra numarasıyla birlikte ekleme-yalnız bir günlük (journal)
+    dosyasına yazılır, sonra bellekteki kuyruğa eklenir. Kuyruk `flush_interval`
+    saniyede bir ya da `max_events` oturuma ulaşınca tek transaction'da
+    veritabanına yazılır; aynı transaction günlüğün hangi sıra numarasına kadar
+    işlendiğini de kaydeder. Uygulama çökerse açılışta günlükteki işlenmemiş
+    oturumlar yeniden oynatılır, işlenmişler atlanır.
+    """
+
+    def __init__(self, db, journal_path, flush_interval=60.0, max_events=500):
+        self.db = db
+        self.journal_path = journal_path
+        self.journal_name = os.path.basename(journal_path)
+        self.flush_interval = flush_interval
+        self.max_events = max_events
+
+        self._events = deque(maxlen=MAX_BUFFERED_EVENTS)  # (seq, app_name, süre, bitiş epoch)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._journal = None
+        self.stats = {'events': 0, 'flushes': 0, 'recovered': 0}
+
+        self._recover()
+        self._thread = threading.Thread(target=self._flush_loop, name="kahya-usage-flush", daemon=True)
+        self._thread.start()
+
+    # Günlük
+    def _recover(self):
+        """Günlükte olup veritabanına işlenmemiş oturumları kuyruğa geri al"""
+        flushed_seq = self.db.get_usage_journal_seq(self.journal_name)
+        self._seq = flushed_seq
+        try:
+            with open(self.journal_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        seq, app_name, duration, ended_ts = json.loads(line)
+                    except ValueError:
+                        continue  # Çökme anında yarım kalmış satır
+                    self._seq = max(self._seq, seq)
+                    if seq > flushed_seq:
+                        self._events.append((seq, app_name, duration, ended_ts))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Kullanım günlüğü okuma hatası: {e}")
+
+        self.stats['recovered'] = len(self._events)
+        self._rewrite_journal()
+        if self._events:
+            self._wakeup.set()
+
+    def _rewrite_journal(self):
+        """Günlüğü yalnızca bekleyen oturumlarla yeniden yaz ve ekleme için aç (kilit altında)"""
+        if self._journal:
+            self._journal.close()
+        temp_path = self.journal_path + '.tmp'
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for event in self._events:
+                    f.write(json.dumps(event, ensure_ascii=False) + '\n')
+            os.replace(temp_path, self.journal_path)
+        finally:
+            # Yeniden yazma başarısız olsa da eski günlüğe eklemeye devam edilir
+            self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    # Kayıt
+    def add(self, app_name, duration, ended_at=None):
+        """Oturumu günlüğe yaz ve kuyruğa ekle (ended_at: datetime, varsayılan şimdi)"""
+        ended_ts = ended_at.timestamp() if ended_at else time.time()
+        with self._lock:
+            if self._journal is None:
+                # Tampon kapandıktan sonra gelen oturum doğrudan yazılır
+                self.db.log_app_usage(app_name, duration)
+                return
+            self._seq += 1
+            event = (self._seq, app_name, int(duration), ended_ts)
+            try:
+                # Süreç çökse de satır işletim sistemine geçmiş olur
+                self._journal.write(json.dumps(event, ensure_ascii=False) + '\n')
+                self._journal.flush()
+            except Exception as e:
+                print(f"Kullanım günlüğü yazma hatası: {e}")
+            self._events.append(event)
+            self.stats['events'] += 1
+            full = len(self._events) >= self.max_events
+        if full:
+            self._wakeup.set()
+
+    def pending(self):
+        return len(self._events)
+
+    def snapshot(self):
+        """Veritabanına henüz yazılmamış olabilecek oturumlar: [(sıra, app_name, süre, bitiş epoch)]"""
+        with self._lock:
+            return list(self._events)
+
+    # Yazma
+    def _flush_loop(self):
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            if not self._stopped.is_set():
+                self.flush()
+
+    def flush(self, timeout=10.0):
+        """Bekleyen oturumları tek transaction'da yaz; commit'i bekler. Yazılan sayıyı döndür"""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._events)
+            if not batch:
+                return 0
+
+            last_seq = batch[-1][0]
+            try:
+                future = self.db.log_app_usage_batch(
+                    [event[1:] for event in batch], self.journal_name, last_seq
+                )
+                future.result(timeout)
+            except Exception as e:
+                # Oturumlar kuyrukta ve günlükte kalır, sonraki denemede yeniden yazılır
+                print(f"Kullanım toplu yazma hatası: {e}")
+                return 0
+
+            with self._lock:
+                while self._events and self._events[0][0] <= last_seq:
+                    self._events.popleft()
+                try:
+                    self._rewrite_journal()
+                except Exception as e:
+                    print(f"Kullanım günlüğü yazma hatası: {e}")
+            self.stats['flushes'] += 1
+            return len(batch)
+
+    def close(self):
+        """Kalan oturumları yaz ve günlüğü kapat"""
+        if self._stopped.is_set():
+            return
+        self._stopped.set()
+        self._wakeup.set()
+        self._thread.join(timeout=1)
+        self.flush()
+        with self._lock:
+            if self._journal:
+                self._journal.close()
+                self._journal = None
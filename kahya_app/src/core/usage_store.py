@@ -0,0 +1,175 @@
+from datetime import datetime, timedelta
+
+# Kullanım zaman serisi tabloları: en ince çözünürlükten en kabasına
+HOURLY_TABLE = 'usage_hourly'
+DAILY_TABLE = 'usage_daily'
+WEEKLY_TABLE = 'usage_weekly'
+
+# Saatlik kovalar bu kadar gün tutulur, sonrası günlük/haftalık özetlerde yaşar
+HOURLY_RETENTION_DAYS = 30
+# Günlük kovalar bu kadar gün tutulur, sonrası yalnızca haftalık özette kalır
+DAILY_RETENTION_DAYS = 400
+
+
+def hour_start(dt):
+    return dt.replace(minute=0, second=0, microsecond=0)
+
+
+def day_start(dt):
+    return dt.replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def week_start(dt):
+    """Haftanın başı (pazartesi 00:00)"""
+    return day_start(dt) - timedelta(days=dt.weekday())
+
+
+_BUCKETS = (
+    (HOURLY_TABLE, hour_start, lambda dt: dt + timedelta(hours=1)),
+    (DAILY_TABLE, day_start, lambda dt: dt + timedelta(days=1)),
+    (WEEKLY_TABLE, week_start, lambda dt: dt + timedelta(weeks=1)),
+)
+
+
+def create_tables(c):
+    """Zaman serisi tablolarını oluştur"""
+    for table, _, _ in _BUCKETS:
+        c.execute(f'''
+            CREATE TABLE IF NOT EXISTS {table} (
+                bucket_ts INTEGER NOT NULL,
+                app_name TEXT NOT NULL,
+                session_count INTEGER NOT NULL DEFAULT 0,
+                duration INTEGER NOT NULL DEFAULT 0,
+                last_used_ts INTEGER,
+                PRIMARY KEY (bucket_ts, app_name)
+            ) WITHOUT ROWID
+        ''')
+
+
+def create_journal_table(c):
+    """Kullanım günlüklerinin (journal) veritabanına işlenmiş son sıra numaraları"""
+    c.execute('''
+        CREATE TABLE IF NOT EXISTS usage_journal_state (
+            journal TEXT PRIMARY KEY,
+            last_seq INTEGER NOT NULL
+        )
+    ''')
+
+
+def get_journal_seq(c, journal):
+    c.execute('SELECT last_seq FROM usage_journal_state WHERE journal = ?', (journal,))
+    row = c.fetchone()
+    return row[0] if row else 0
+
+
+def set_journal_seq(c, journal, seq):
+    c.execute('''
+        INSERT INTO usage_journal_state (journal, last_seq) VALUES (?, ?)
+        ON CONFLICT (journal) DO UPDATE SET last_seq = MAX(last_seq, excluded.last_seq)
+    ''', (journal, seq))
+
+
+def _split(start, end, floor, step):
+    """[start, end] aralığını kova sınırlarında böl: (kova_başı, saniye) üretir"""
+    bucket = floor(start)
+    while bucket < end:
+        next_bucket = step(bucket)
+        seconds = (min(end, next_bucket) - max(start, bucket)).total_seconds()
+        if seconds > 0:
+            yield bucket, int(round(seconds))
+        bucket = next_bucket
+
+
+def record_usage(c, app_name, duration, ended_at=None, sessions=1):
+    """Bir kullanım oturumunu saatlik, günlük ve haftalık kovalara artımlı olarak ekle
+
+    Süre, oturumun kapsadığı kovalara bölünür; oturum sayısı bitiş kovasına yazılır.
+    """
+    ended_at = ended_at or datetime.now()
+    started_at = ended_at - timedelta(seconds=max(int(duration or 0), 0))
+    last_used_ts = int(ended_at.timestamp())
+
+    for table, floor, step in _BUCKETS:
+        rows = {bucket: seconds for bucket, seconds in _split(started_at, ended_at, floor, step)}
+        end_bucket = floor(ended_at)
+        rows.setdefault(end_bucket, 0)
+        c.executemany(f'''
+            INSERT INTO {table} (bucket_ts, app_name, session_count, duration, last_used_ts)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (bucket_ts, app_name) DO UPDATE SET
+                session_count = session_count + excluded.session_count,
+                duration = duration + excluded.duration,
+                last_used_ts = MAX(COALESCE(last_used_ts, 0), excluded.last_used_ts)
+        ''', [
+            (int(bucket.timestamp()), app_name, sessions if bucket == end_bucket else 0, seconds,
+             min(last_used_ts, int(step(bucket).timestamp()) - 1))
+            for bucket, seconds in rows.items()
+        ])
+
+
+def _ceil(dt, floor, step):
+    """dt'den sonra (ya da dt'de) başlayan ilk kova"""
+    bucket = floor(dt)
+    return bucket if bucket == dt else step(bucket)
+
+
+def _window_segments(since, days):
+    """[since, şimdi] penceresini karşılayan (tablo, başlangıç, bitiş ya da None) parçaları
+
+    Pencerenin içinde kalan tam kovalar en kaba tablodan, baştaki kısmi kova daha
+    ince tablolardan okunur; kullanılan her kova since'ten sonra başlar, yani pencere
+    dışındaki kullanım sayılmaz. İnce kovası budanmış baş kısım (ör. 30 günden eski
+    saatlik kovalar) sayılmaz, pencere en çok o kadar kısalır.
+    """
+    tables = _BUCKETS if days > DAILY_RETENTION_DAYS else _BUCKETS[:2]
+    segments = []
+    end = None
+    for table, floor, step in reversed(tables):
+        start = _ceil(since, floor, step)
+        if end is None or start < end:
+            segments.append((table, start, end))
+        end = start
+    return segments
+
+
+def query_usage_stats(c, days=7, limit=None, now=None):
+    """Son X günün (now - X gün'den bu yana) uygulama bazlı toplamlarını özet tablolardan getir
+
+    Dönen satırlar: (app_name, session_count, duration, last_used ISO metni)
+    """
+    now = now or datetime.now()
+    parts = []
+    params = []
+    for table, start, end in _window_segments(now - timedelta(days=days), days):
+        part = f'SELECT app_name, session_count, duration, last_used_ts FROM {table} WHERE bucket_ts >= ?'
+        params.append(int(start.timestamp()))
+        if end is not None:
+            part += ' AND bucket_ts < ?'
+            params.append(int(end.timestamp()))
+        parts.append(part)
+
+    query = f'''
+        SELECT app_name, SUM(session_count), SUM(duration), MAX(last_used_ts)
+        FROM ({' UNION ALL '.join(parts)})
+        GROUP BY app_name
+        ORDER BY SUM(duration) DESC
+    '''
+    if limit is not None:
+        query += ' LIMIT ?'
+        params.append(int(limit))
+    c.execute(query, params)
+    return [
+        (app_name, sessions, duration, datetime.fromtimestamp(last_ts).isoformat() if last_ts else None)
+        for app_name, sessions, duration, last_ts in c.fetchall()
+    ]
+
+
+def prune_usage(c, now=None):
+    """Saklama süresi dolan ince kovaları sil (kaba özetler korunur)"""
+    now = now or datetime.now()
+    hourly_cutoff = int(day_start(now - timedelta(days=HOURLY_RETENTION_DAYS)).timestamp())
+    daily_cutoff = int(day_start(now - timedelta(days=DAILY_RETENTION_DAYS)).timestamp())
+    c.execute(f'DELETE FROM {HOURLY_TABLE} WHERE bucket_ts < ?', (hourly_cutoff,))
+    removed = c.rowcount
+    c.execute(f'DELETE FROM {DAILY_TABLE} WHERE bucket_ts < ?', (daily_cutoff,))
+    return removed + c.rowcount
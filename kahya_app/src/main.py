@@ -14,7 +14,9 @@ from src.core.llm_client import LLMClient
 from src.modules.usage_tracker import UsageTracker
 
 from src.modules.reminder import ReminderManager
+from src.modules.notes import NoteManager
 from src.core.database import Database
+from src.core.task_pool import TaskPool
 
 def main():
     # Uygulama başlat
@@ -28,11 +30,13 @@ def main():
     db = Database(db_path)
     
     # LLM istemcisini başlat
-    llm_client = LLMClient()
+    llm_client = LLMClient(db_path=db_path)
+    llm_client.warm_up()
     
     # Kullanıcı modeli ve istatistik takip sistemini başlat
     usage_tracker = UsageTracker(db_path)
     reminder_manager = ReminderManager(db_path)
+    note_manager = NoteManager(db_path)
     
     # UI bileşenlerini oluştur (sadece KahyaWallpaper)
     kahya = KahyaWallpaper(db_path, usage_tracker)
@@ -40,11 +44,17 @@ def main():
     # Takvime hatırlatıcı yöneticisini bağla
     kahya.calendar.set_reminder_manager(reminder_manager)
     
+    # Not widget'ına not yöneticisini bağla
+    kahya.notes.set_note_manager(note_manager)
+    
+    # Vakti gelen hatırlatıcıları bildir
+    reminder_manager.scheduler.reminder_due.connect(kahya.show_reminder)
+    
     # Chatbox'a LLM istemcisini bağla
     kahya.retro_chatbox.set_llm_client(llm_client)
     
     # Komut yönlendiriciyi başlat (chatbox wallpaper içinde)
-    router = CommandRouter(db_path, kahya.retro_chatbox)
+    router = CommandRouter(db_path, kahya.retro_chatbox, llm_client)
     
     # Wallpaper içindeki chatbox'a router'ı bağla
     kahya.retro_chatbox.set_router(router)
@@ -70,6 +80,11 @@ def main():
     # Uygulama kapanırken temizlik
     app.aboutToQuit.connect(usage_tracker.cleanup)
     app.aboutToQuit.connect(kahya.cleanup)
+    app.aboutToQuit.connect(db.close)
+    app.aboutToQuit.connect(llm_client.close)
+    app.aboutToQuit.connect(router.file_search.close)
+    app.aboutToQuit.connect(TaskPool.shared().shutdown)
+    app.aboutToQuit.connect(reminder_manager.scheduler.stop)
     
     # Global kısayol tuşları (uygulama seviyesinde)
     def setup_global_shortcuts():
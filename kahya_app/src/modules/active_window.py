@@ -0,0 +1,304 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import sys
+import threading
+import psutil
+
+# Xlib sabitleri (X11/X.h, X11/Xatom.h)
+PROPERTY_NOTIFY = 28
+PROPERTY_CHANGE_MASK = 1 << 22
+XA_CARDINAL = 6
+XA_STRING = 31
+XA_WINDOW = 33
+
+
+class _XPropertyEvent(ctypes.Structure):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('serial', ctypes.c_ulong),
+        ('send_event', ctypes.c_int),
+        ('display', ctypes.c_void_p),
+        ('window', ctypes.c_ulong),
+        ('atom', ctypes.c_ulong),
+        ('time', ctypes.c_ulong),
+        ('state', ctypes.c_int),
+    ]
+
+
+class _XEvent(ctypes.Union):
+    _fields_ = [
+        ('type', ctypes.c_int),
+        ('xproperty', _XPropertyEvent),
+        ('pad', ctypes.c_long * 24),
+    ]
+
+
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+def process_name(pid):
+    """pid'in süreç adı; okunamazsa None"""
+    try:
+        return psutil.Process(pid).name()
+    except (psutil.Error, ValueError):
+        return None
+
+
+class ActiveWindowBackend:
+    """Aktif pencere kaynağı: odak değişince callback(uygulama_adı ya da None) çağrılır
+
+    Alt sınıflar start/stop'u uygular; callback kaynağın kendi thread'inden çağrılır.
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self.callback = None
+        self.current = None
+
+    def start(self, callback):
+        self.callback = callback
+
+    def stop(self):
+        pass
+
+    def _emit(self, app_name):
+        """Yalnızca gerçekten değiştiyse bildir"""
+        if app_name == self.current:
+            return
+        self.current = app_name
+        if self.callback:
+            self.callback(app_name)
+
+
+class NullBackend(ActiveWindowBackend):
+    """Aktif pencerenin okunamadığı ortamlar (Wayland, başsız): hiçbir olay üretmez"""
+
+    name = 'none'
+
+
+class FakeBackend(ActiveWindowBackend):
+    """Testler için: switch() çağrıları odak değişikliği gibi bildirilir"""
+
+    name = 'fake'
+
+    def switch(self, app_name):
+        self._emit(app_name)
+
+
+class PollingBackend(ActiveWindowBackend):
+    """Olay bildirimi olmayan platformlar için: get_app aralıkla sorulur"""
+
+    name = 'polling'
+
+    def __init__(self, get_app, interval=2.0):
+        super().__init__()
+        self.get_app = get_app
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def start(self, callback):
+        super().start(callback)
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._poll_loop, name="kahya-active-window", daemon=True)
+        self._thread.start()
+
+    def _poll_loop(self):
+        while not self._stopped.is_set():
+            try:
+                self._emit(self.get_app())
+            except Exception as e:
+                print(f"Aktif pencere okuma hatası: {e}")
+            self._stopped.wait(self.interval)
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+
+def _win32_active_app():
+    import win32gui
+    import win32process
+
+    hwnd = win32gui.GetForegroundWindow()
+    _, pid = win32process.GetWindowThreadProcessId(hwnd)
+    return process_name(pid) if pid else None
+
+
+class X11Backend(ActiveWindowBackend):
+    """X11: kök penceredeki _NET_ACTIVE_WINDOW özelliğinin değişim olaylarını dinler
+
+    Kendi X bağlantısını açar ve yalnızca bu bağlantının soketi okunabilir olunca
+    uyanır; pencere değişmedikçe CPU kullanmaz. Uygulama adı pencerenin
+    _NET_WM_PID'inden, yoksa WM_CLASS'ından alınır.
+    """
+
+    name = 'x11'
+
+    def __init__(self, display_name=None):
+        super().__init__()
+        path = ctypes.util.find_library('X11')
+        if not path:
+            raise OSError("libX11 bulunamadı")
+        self._x = ctypes.CDLL(path)
+        self._declare()
+
+        self._display = self._x.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise OSError("X sunucusuna bağlanılamadı")
+        # Kapanmış pencereye yapılan isteklerde Xlib'in varsayılan işleyicisi süreci sonlandırır
+        self._error_handler = _X_ERROR_HANDLER(lambda display, event: 0)
+        self._x.XSetErrorHandler(self._error_handler)
+
+        self._root = self._x.XDefaultRootWindow(self._display)
+        self._atoms = {
+            name: self._x.XInternAtom(self._display, name.encode(), False)
+            for name in ('_NET_ACTIVE_WINDOW', '_NET_WM_PID', 'WM_CLASS')
+        }
+        self._stop_r, self._stop_w = os.pipe()
+        self._thread = None
+
+    def _declare(self):
+        x = self._x
+        x.XOpenDisplay.restype = ctypes.c_void_p
+        x.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x.XSetErrorHandler.argtypes = [_X_ERROR_HANDLER]
+        x.XSetErrorHandler.restype = ctypes.c_void_p
+        x.XDefaultRootWindow.restype = ctypes.c_ulong
+        x.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x.XInternAtom.restype = ctypes.c_ulong
+        x.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        x.XSelectInput.argtypes = [ctypes.c_void_p, ctypes.c_ulong, ctypes.c_long]
+        x.XConnectionNumber.argtypes = [ctypes.c_void_p]
+        x.XFlush.argtypes = [ctypes.c_void_p]
+        x.XPending.argtypes = [ctypes.c_void_p]
+        x.XNextEvent.argtypes = [ctypes.c_void_p, ctypes.POINTER(_XEvent)]
+        x.XFree.argtypes = [ctypes.c_void_p]
+        x.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int,
+            ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte)),
+        ]
+
+    def _get_property(self, window, atom, req_type, length=1024):
+        """(format, öğe sayısı, bayt) ya da None"""
+        actual_type = ctypes.c_ulong()
+        actual_format = ctypes.c_int()
+        nitems = ctypes.c_ulong()
+        bytes_after = ctypes.c_ulong()
+        data = ctypes.POINTER(ctypes.c_ubyte)()
+        status = self._x.XGetWindowProperty(
+            self._display, window, atom, 0, length, False, req_type,
+            ctypes.byref(actual_type), ctypes.byref(actual_format), ctypes.byref(nitems),
+            ctypes.byref(bytes_after), ctypes.byref(data)
+        )
+        if status != 0 or not data:
+            return None
+        try:
+            if not nitems.value:
+                return None
+            # 32 bitlik özellikler istemci tarafında C long dizisi olarak gelir
+            item_size = {8: 1, 16: ctypes.sizeof(ctypes.c_short), 32: ctypes.sizeof(ctypes.c_long)}[actual_format.value]
+            return actual_format.value, nitems.value, ctypes.string_at(data, nitems.value * item_size)
+        finally:
+            self._x.XFree(data)
+
+    def _get_long(self, window, atom, req_type):
+        prop = self._get_property(window, atom, req_type, length=1)
+        if prop is None or prop[0] != 32:
+            return None
+        return ctypes.c_ulong.from_buffer_copy(prop[2][:ctypes.sizeof(ctypes.c_ulong)]).value
+
+    def active_app(self):
+        """Odaktaki pencerenin uygulama adı; odak yoksa None"""
+        window = self._get_long(self._root, self._atoms['_NET_ACTIVE_WINDOW'], XA_WINDOW)
+        if not window:
+            return None
+        pid = self._get_long(window, self._atoms['_NET_WM_PID'], XA_CARDINAL)
+        name = process_name(pid) if pid else None
+        if name:
+            return name
+        # WM_CLASS: "örnek adı\0sınıf adı\0"
+        prop = self._get_property(window, self._atoms['WM_CLASS'], XA_STRING)
+        if prop:
+            parts = [p for p in prop[2].split(b'\0') if p]
+            if parts:
+                return parts[-1].decode('utf-8', errors='replace')
+        return None
+
+    def start(self, callback):
+        super().start(callback)
+        self._x.XSelectInput(self._display, self._root, PROPERTY_CHANGE_MASK)
+        self._x.XFlush(self._display)
+        self._thread = threading.Thread(target=self._event_loop, name="kahya-active-window", daemon=True)
+        self._thread.start()
+
+    def _event_loop(self):
+        fd = self._x.XConnectionNumber(self._display)
+        event = _XEvent()
+        active_atom = self._atoms['_NET_ACTIVE_WINDOW']
+        try:
+            self._emit(self.active_app())
+            while True:
+                # Bekleyen olay yoksa soket ya da durdurma borusu okunabilir olana kadar uyu
+                if not self._x.XPending(self._display):
+                    readable, _, _ = select.select([fd, self._stop_r], [], [])
+                    if self._stop_r in readable:
+                        break
+                    if not self._x.XPending(self._display):
+                        continue
+
+                changed = False
+                while self._x.XPending(self._display):
+                    self._x.XNextEvent(self._display, ctypes.byref(event))
+                    if event.type == PROPERTY_NOTIFY and event.xproperty.atom == active_atom:
+                        changed = True
+                # Art arda gelen değişikliklerden yalnızca sonuncusu okunur
+                if changed:
+                    self._emit(self.active_app())
+        except Exception as e:
+            print(f"X11 pencere izleme hatası: {e}")
+        finally:
+            self._x.XCloseDisplay(self._display)
+            self._display = None
+            os.close(self._stop_r)
+
+    def stop(self):
+        if self._thread is None:
+            return
+        try:
+            os.write(self._stop_w, b'x')
+        except OSError:
+            pass
+        self._thread.join(timeout=1)
+        os.close(self._stop_w)
+        self._thread = None
+
+
+def create_backend(name='auto'):
+    """Platforma uygun aktif pencere kaynağı
+
+    auto: Windows'ta win32 (aralıkla sorgu), X11 oturumunda X11 olayları; Wayland'de
+    uygulamalar başka pencerelerin odağını göremediğinden takip kapalıdır (none).
+    """
+    if name == 'fake':
+        return FakeBackend()
+    if name in ('auto', 'win32') and sys.platform == 'win32':
+        try:
+            import win32gui  # noqa: F401 (pywin32 kurulu mu?)
+            return PollingBackend(_win32_active_app)
+        except ImportError:
+            pass
+    wayland = os.environ.get('WAYLAND_DISPLAY') or os.environ.get('XDG_SESSION_TYPE') == 'wayland'
+    if name == 'x11' or (name == 'auto' and os.environ.get('DISPLAY') and not wayland):
+        try:
+            return X11Backend()
+        except Exception as e:
+            print(f"X11 pencere izleme başlatılamadı: {e}")
+    return NullBackend()
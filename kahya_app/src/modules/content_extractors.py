@@ -0,0 +1,122 @@
+import importlib.util
+import os
+import re
+import zipfile
+from collections import namedtuple
+from src.core.turkish_text import fold_text
+
+# Bir dosyadan indekslenecek en fazla metin (karakter)
+MAX_TEXT_CHARS = 500000
+
+# extensions: ('.md', ...), function(yol, max_bytes) -> metin, max_bytes: bu boyuttan büyük dosyalar atlanır
+Extractor = namedtuple('Extractor', ['extensions', 'function', 'max_bytes'])
+
+_extractors = {}  # uzantı -> Extractor
+
+
+def register_extractor(extensions, function, max_bytes=2 * 1024 * 1024):
+    """Uzantılar için metin çıkarıcı kaydet (aynı uzantıdaki eskisinin yerine geçer)
+
+    function modül düzeyinde tanımlı olmalıdır: çıkarma ayrı süreçlerde çalışır ve
+    fonksiyon oraya adıyla (pickle) gönderilir.
+    """
+    extractor = Extractor(tuple(ext.lower() for ext in extensions), function, max_bytes)
+    for ext in extractor.extensions:
+        _extractors[ext] = extractor
+    return extractor
+
+
+def get_extractor(path):
+    """Dosya uzantısına göre çıkarıcı; desteklenmiyorsa None"""
+    return _extractors.get(os.path.splitext(path)[1].lower())
+
+
+def supported_extensions():
+    return frozenset(_extractors)
+
+
+def read_text(path, max_bytes):
+    """Dosyanın ilk max_bytes baytını metin olarak oku (UTF-8, olmazsa Türkçe Windows kodlaması)"""
+    with open(path, 'rb') as f:
+        data = f.read(max_bytes)
+    if b'\x00' in data[:4096]:
+        return None  # İkili dosya
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return data.decode('cp1254', errors='replace')
+
+
+def extract_plain(path, max_bytes):
+    """Düz metin ve kaynak kod"""
+    return read_text(path, max_bytes)
+
+
+_MARKDOWN_LINK = re.compile(r'!?\[([^\]]*)\]\([^)]*\)')
+_MARKDOWN_MARKUP = re.compile(r'^\s{0,3}(#{1,6}|>|[-*+]|\d+\.)\s+|[*_`~]{1,3}', re.MULTILINE)
+
+
+def extract_markdown(path, max_bytes):
+    """Markdown: bağlantı adreslerini ve biçim işaretlerini at"""
+    text = read_text(path, max_bytes)
+    if text is None:
+        return None
+    return _MARKDOWN_MARKUP.sub('', _MARKDOWN_LINK.sub(r'\1', text))
+
+
+_XML_TAG = re.compile(r'<[^>]+>')
+_XML_PARAGRAPH = re.compile(r'</w:p>|</text:p>|</text:h>')
+
+
+def extract_office_xml(path, max_bytes):
+    """Word (.docx) ve OpenDocument (.odt) metni (zip içindeki XML'den)"""
+    member = 'content.xml' if path.lower().endswith('.odt') else 'word/document.xml'
+    with zipfile.ZipFile(path) as archive:
+        # Sıkıştırılmamış XML için de aynı üst sınır (zip bombasına karşı)
+        with archive.open(member) as f:
+            xml = f.read(max_bytes).decode('utf-8', errors='replace')
+    text = _XML_TAG.sub('', _XML_PARAGRAPH.sub('\n', xml))
+    for entity, char in (('&lt;', '<'), ('&gt;', '>'), ('&quot;', '"'), ('&apos;', "'"), ('&amp;', '&')):
+        text = text.replace(entity, char)
+    return text
+
+
+def extract_pdf(path, max_bytes):
+    """PDF metni (pypdf kuruluysa)"""
+    try:
+        from pypdf import PdfReader
+    except ImportError:
+        return None
+    parts = []
+    length = 0
+    for page in PdfReader(path).pages:
+        text = page.extract_text() or ''
+        parts.append(text)
+        length += len(text)
+        if length >= MAX_TEXT_CHARS:
+            break
+    return '\n'.join(parts)
+
+
+def extract_file(path, function, max_bytes):
+    """İşçi süreçte çalışır: (yol, fold_text'ten geçmiş metin, özgün metin) ya da (yol, None, None)"""
+    try:
+        text = function(path, max_bytes)
+    except Exception as e:
+        print(f"İçerik çıkarma hatası ({path}): {e}")
+        return path, None, None
+    if text is None:
+        return path, None, None
+    text = text[:MAX_TEXT_CHARS]
+    return path, fold_text(text), text
+
+
+register_extractor(('.txt', '.text', '.log', '.csv', '.tsv', '.rst', '.tex'), extract_plain)
+register_extractor(('.md', '.markdown'), extract_markdown)
+register_extractor((
+    '.py', '.js', '.ts', '.jsx', '.tsx', '.java', '.kt', '.c', '.h', '.cpp', '.hpp', '.cs', '.go',
+    '.rs', '.rb', '.php', '.sh', '.sql', '.html', '.css', '.json', '.yaml', '.yml', '.toml', '.ini', '.xml',
+), extract_plain, max_bytes=1024 * 1024)
+register_extractor(('.docx', '.odt'), extract_office_xml, max_bytes=20 * 1024 * 1024)
+if importlib.util.find_spec('pypdf') is not None:
+    register_extractor(('.pdf',), extract_pdf, max_bytes=50 * 1024 * 1024)
@@ -0,0 +1,308 @@
+import multiprocessing
+import os
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from src.core.db_pool import ConnectionPool
+from src.core.turkish_text import fold_text
+from src.modules.content_extractors import extract_file, get_extractor
+
+# Şema değişince eski indeks silinip yeniden oluşturulur
+CONTENT_INDEX_VERSION = 2
+
+# Bu kadar belgede bir indekse yazılıp commit edilir
+COMMIT_EVERY_DOCS = 200
+
+# Alıntıdaki kelime sayısı
+SNIPPET_TOKENS = 10
+
+_WORDS = re.compile(r'\w+')
+
+
+def make_snippet(text, words, size=SNIPPET_TOKENS):
+    """Özgün metinden, sorgu kelimelerinin (önek olarak) ilk geçtiği yerin çevresini
+    eşleşen kelimeler [köşeli parantezli] olarak alıntıla"""
+    words = tuple(words)
+    before = deque(maxlen=size // 2)
+    tokens = _WORDS.finditer(text)
+    window = None
+    for match in tokens:
+        if fold_text(match.group()).startswith(words):
+            window = list(before) + [match]
+            for match in tokens:
+                window.append(match)
+                if len(window) >= size:
+                    break
+            break
+        before.append(match)
+    if not window:
+        window = list(before)[:size]
+        if not window:
+            return ''
+
+    parts = ['…'] if window[0].start() > 0 else []
+    pos = window[0].start()
+    for match in window:
+        token = match.group()
+        parts.append(text[pos:match.start()])
+        parts.append(f'[{token}]' if fold_text(token).startswith(words) else token)
+        pos = match.end()
+    if pos < len(text):
+        parts.append('…')
+    return ''.join(parts)
+
+
+class ContentIndex:
+    """Belge içerikleri için SQLite FTS5 tam metin indeksi
+
+    Metin, dosya uzantısına göre seçilen çıkarıcılarla (content_extractors) ayrı
+    süreçlerden oluşan bir havuzda çıkarılır ve fold_text ile sadeleştirilir; arayüz
+    ve komut thread'leri Python kilidi (GIL) yüzünden yavaşlamaz. Sadeleştirilmiş
+    metin indekslendiği için sorgular Türkçe harf ve aksan duyarsızdır; alıntılar
+    indekslenmeyen sütundaki özgün metinden alınır. Her belge yol + mtime + boyut
+    ile kaydedilir, bunlar değişmedikçe yeniden çıkarılmaz
+    (çıkarılamayan dosyalar da kaydedilir; süreç havuzu hatasına uğrayanlar
+    kaydedilmez ve sonraki yenilemede yeniden denenir).
+    """
+
+    def __init__(self, index_path, workers=None):
+        self.index_path = index_path
+        self.pool = ConnectionPool.get(index_path)
+        self.workers = workers or max(1, min(4, (os.cpu_count() or 2) - 1))
+
+        self.last_refresh = 0.0  # monotonic; 0 ise bu oturumda yenilenmedi
+        self.last_stats = {}
+        self._refresh_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+        self._init_db()
+
+    def _init_db(self):
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('PRAGMA user_version')
+            if c.fetchone()[0] != CONTENT_INDEX_VERSION:
+                c.execute('DROP TABLE IF EXISTS content')
+                c.execute('DROP TABLE IF EXISTS docs')
+                c.execute('DROP TABLE IF EXISTS meta')
+
+            # İndekslenen dosyalar; id, content tablosundaki rowid'dir
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS docs (
+                    id INTEGER PRIMARY KEY,
+                    path TEXT NOT NULL UNIQUE,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    indexed INTEGER NOT NULL
+                )
+            ''')
+            c.execute("CREATE VIRTUAL TABLE IF NOT EXISTS content USING fts5(body, original UNINDEXED, tokenize='unicode61')")
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            c.execute(f'PRAGMA user_version = {CONTENT_INDEX_VERSION}')
+
+    def is_ready(self):
+        """En az bir tarama tamamlandı mı?"""
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute("SELECT value FROM meta WHERE key = 'built_at'")
+            return c.fetchone() is not None
+
+    # Yenileme
+    def refresh(self, files, wait=False):
+        """İndeksi verilen dosyalarla eşitle (çağıran thread'de çalışır)
+
+        files: (yol, boyut, mtime) kayıtları ya da bunları üreten fonksiyon.
+        Desteklenmeyen uzantılar ve çıkarıcının boyut sınırını aşan dosyalar atlanır;
+        listede olmayan eski kayıtlar silinir.
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return None  # Zaten bir yenileme sürüyor
+        try:
+            return self._refresh(files() if callable(files) else files)
+        except Exception as e:
+            print(f"İçerik indeksi yenileme hatası: {e}")
+            return None
+        finally:
+            self._refresh_lock.release()
+
+    def refresh_async(self, files):
+        """İndeksi arka plan thread'inde yenile"""
+        if self._stopped.is_set() or (self._thread is not None and self._thread.is_alive()):
+            return False
+        self._thread = threading.Thread(
+            target=self.refresh, args=(files,), name="kahya-content-index", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def is_refreshing(self):
+        return self._refresh_lock.locked()
+
+    def _refresh(self, files):
+        started = time.monotonic()
+        stats = {'files': 0, 'unchanged': 0, 'extracted': 0, 'failed': 0, 'errors': 0, 'removed': 0, 'skipped_large': 0}
+
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT path, size, mtime FROM docs')
+            known = {path: (size, mtime) for path, size, mtime in c.fetchall()}
+
+        todo = []
+        seen = set()
+        for path, size, mtime in files:
+            extractor = get_extractor(path)
+            if extractor is None:
+                continue
+            if size > extractor.max_bytes:
+                stats['skipped_large'] += 1
+                continue
+            seen.add(path)
+            stats['files'] += 1
+            if known.get(path) == (size, mtime):
+                stats['unchanged'] += 1
+            else:
+                todo.append((path, size, mtime, extractor))
+
+        removed = [path for path in known if path not in seen]
+        if removed:
+            with self.pool.connection() as conn:
+                c = conn.cursor()
+                for path in removed:
+                    self._delete(c, path)
+            stats['removed'] = len(removed)
+
+        if todo:
+            self._extract_all(todo, stats)
+
+        if not self._stopped.is_set():
+            with self.pool.connection() as conn:
+                conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('built_at', ?)", (str(int(time.time())),))
+
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        self.last_refresh = time.monotonic()
+        self.last_stats = stats
+        return stats
+
+    def _extract_all(self, todo, stats):
+        """Metinleri süreç havuzunda çıkar, tamamlandıkça toplu olarak indekse yaz"""
+        # spawn: çalışan thread'leri olan süreci fork etmek kilitlenmeye yol açabilir
+        executor = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context('spawn'))
+        items = iter(todo)
+        pending = {}
+        batch = []
+        broken = False
+        try:
+            while not broken:
+                # Bellekte bekleyen iş sayısı sınırlı tutulur
+                while len(pending) < self.workers * 4 and not self._stopped.is_set():
+                    item = next(items, None)
+                    if item is None:
+                        break
+                    path, size, mtime, extractor = item
+                    try:
+                        future = executor.submit(extract_file, path, extractor.function, extractor.max_bytes)
+                    except BrokenProcessPool as e:
+                        print(f"İçerik çıkarma hatası: {e}")
+                        stats['errors'] += 1
+                        broken = True
+                        break
+                    pending[future] = (path, size, mtime)
+                if not pending or broken:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path, size, mtime = pending.pop(future)
+                    try:
+                        _, body, original = future.result()
+                    except Exception as e:
+                        # Havuz hatası (çöken işçi, bellek, süreç başlatma): çıkarıcının
+                        # sonucu yok, dosya kaydedilmez ve sonraki yenilemede yeniden denenir
+                        print(f"İçerik çıkarma hatası ({path}): {e}")
+                        stats['errors'] += 1
+                        broken = broken or isinstance(e, BrokenProcessPool)
+                        continue
+                    stats['extracted' if body else 'failed'] += 1
+                    batch.append((path, size, mtime, body, original))
+
+                if len(batch) >= COMMIT_EVERY_DOCS:
+                    self._store(batch)
+                    batch = []
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True)
+            if batch:
+                self._store(batch)
+
+    def _store(self, batch):
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            for path, size, mtime, body, original in batch:
+                self._delete(c, path)
+                c.execute(
+                    'INSERT INTO docs (path, size, mtime, indexed) VALUES (?, ?, ?, ?)',
+                    (path, size, mtime, int(bool(body)))
+                )
+                if body:
+                    c.execute('INSERT INTO content (rowid, body, original) VALUES (?, ?, ?)',
+                              (c.lastrowid, body, original))
+
+    def _delete(self, c, path):
+        c.execute('SELECT id FROM docs WHERE path = ?', (path,))
+        row = c.fetchone()
+        if row:
+            c.execute('DELETE FROM content WHERE rowid = ?', row)
+            c.execute('DELETE FROM docs WHERE id = ?', row)
+
+    # Sorgular
+    def search(self, query, max_results=10):
+        """İçeriğinde sorgudaki tüm kelimeler (önek olarak) geçen belgeler: [(yol, alıntı)]
+
+        Sonuçlar FTS5 bm25 sıralamasıyla, en alakalıdan başlayarak döner; alıntı
+        özgün (Türkçe harfli) metinden alınır.
+        """
+        words = _WORDS.findall(fold_text(query))
+        if not words:
+            return []
+        match = ' '.join(f'"{word}"*' for word in words)
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('''
+                SELECT docs.path, content.original
+                FROM content JOIN docs ON docs.id = content.rowid
+                WHERE content MATCH ?
+                ORDER BY rank
+                LIMIT ?
+            ''', (match, max_results))
+            rows = c.fetchall()
+        return [(path, make_snippet(original, words)) for path, original in rows]
+
+    def get_stats(self):
+        """Belge sayıları ve son yenileme bilgisi"""
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT COUNT(*), COALESCE(SUM(indexed), 0) FROM docs')
+            total, indexed = c.fetchone()
+        return {
+            'docs': total,
+            'indexed': indexed,
+            'refreshing': self.is_refreshing(),
+            'last_refresh': dict(self.last_stats),
+        }
+
+    def close(self):
+        """Süren yenilemeyi durdur, bağlantıları kapat"""
+        self._stopped.set()
+        if self._thread is not None and self._thread.is_alive():
+            self._thread.join(timeout=5)
+        self.pool.close()
@@ -0,0 +1,139 @@
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+# İçine girilmeyen klasörler (klasörün kendisi yine listelenir)
+IGNORED_DIRS = frozenset({
+    '.git', '.hg', '.svn', 'node_modules', '__pycache__', '.cache', '.venv', 'venv',
+    '.tox', '.nox', '.mypy_cache', '.pytest_cache', '.ruff_cache', '.gradle', '.cargo',
+    '.npm', '.Trash', '.local', 'site-packages',
+})
+
+# Klasör tarama sonucu: status 'listed' (entries dolu), 'unchanged' (mtime aynı) ya da 'error'
+DirListing = namedtuple('DirListing', ['path', 'mtime_ns', 'entries', 'status'])
+
+_DONE = object()
+
+
+def dedupe_roots(paths):
+    """Arama yollarını normalize et; başka bir kökün altında kalanları çıkar"""
+    roots = []
+    for path in sorted({os.path.abspath(os.path.expanduser(p)) for p in paths}):
+        if not any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots):
+            roots.append(path)
+    return roots
+
+
+def is_ignored(name, ignored=IGNORED_DIRS):
+    """Bu adlı klasörün içine girilmemeli mi?"""
+    return name in ignored
+
+
+class Crawler:
+    """os.scandir tabanlı, klasörleri thread havuzuna dağıtan paralel tarayıcı
+
+    Her dosya için DirEntry.stat() sonucu kullanılır (ek stat çağrısı yapılmaz).
+    Çakışan kökler birleştirilir, IGNORED_DIRS'teki klasörlere inilmez. `known`
+    verilirse mtime'ı değişmeyen klasörler listelenmez; bilinen alt klasörlerine
+    doğrudan inilir. Sonuçlar tamamlandıkça üretilir, sıra garanti değildir.
+    """
+
+    def __init__(self, workers=None, ignored=IGNORED_DIRS):
+        self.workers = workers or min(16, (os.cpu_count() or 2) * 2)
+        self.ignored = ignored
+        self.stats = {}
+
+    def crawl(self, paths, known=None, full=True):
+        """DirListing üret; known: {klasör: (mtime_ns, [alt klasörler])}"""
+        roots = [root for root in dedupe_roots(paths) if os.path.isdir(root)]
+        stats = {'dirs': 0, 'listed': 0, 'files': 0, 'errors': 0, 'workers': self.workers}
+        self.stats = stats
+        if not roots:
+            return
+
+        work = queue.Queue()
+        results = queue.Queue()
+        pending = [len(roots)]
+        lock = threading.Lock()
+        stopped = threading.Event()
+        use_known = known if (known and not full) else {}
+
+        def worker():
+            while True:
+                path = work.get()
+                if path is None:
+                    break
+                subdirs = []
+                if not stopped.is_set():
+                    listing, subdirs = self._visit(path, use_known)
+                    results.put(listing)
+                with lock:
+                    pending[0] += len(subdirs)
+                for subdir in subdirs:
+                    work.put(subdir)
+                with lock:
+                    pending[0] -= 1
+                    if pending[0] == 0:
+                        results.put(_DONE)
+
+        for root in roots:
+            work.put(root)
+        threads = [
+            threading.Thread(target=worker, name=f"kahya-crawl-{i}", daemon=True)
+            for i in range(self.workers)
+        ]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                listing = results.get()
+                if listing is _DONE:
+                    break
+                stats['dirs'] += 1
+                if listing.status == 'listed':
+                    stats['listed'] += 1
+                    stats['files'] += len(listing.entries)
+                elif listing.status == 'error':
+                    stats['errors'] += 1
+                yield listing
+        finally:
+            stopped.set()
+            for _ in threads:
+                work.put(None)
+            seconds = time.monotonic() - started
+            stats['seconds'] = round(seconds, 3)
+            stats['dirs_per_sec'] = round(stats['dirs'] / seconds) if seconds else None
+            stats['files_per_sec'] = round(stats['files'] / seconds) if seconds else None
+
+    def _visit(self, path, known):
+        """Tek klasörü işle: (DirListing, inilecek alt klasörler)"""
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return DirListing(path, None, None, 'error'), []
+
+        previous = known.get(path)
+        if previous is not None and previous[0] == mtime_ns:
+            subdirs = [d for d in previous[1] if os.path.basename(d) not in self.ignored]
+            return DirListing(path, mtime_ns, None, 'unchanged'), subdirs
+
+        entries = []
+        subdirs = []
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    entries.append((entry.name, is_dir, 0 if is_dir else st.st_size, st.st_mtime))
+                    if is_dir and entry.name not in self.ignored:
+                        subdirs.append(entry.path)
+        except OSError:
+            return DirListing(path, mtime_ns, None, 'error'), []
+        return DirListing(path, mtime_ns, entries, 'listed'), subdirs
@@ -0,0 +1,317 @@
+import json
+import os
+import threading
+import time
+from src.core.db_pool import ConnectionPool
+from src.core.turkish_text import fold_text
+from src.modules.file_crawler import Crawler, dedupe_roots
+
+# Şema değişince eski indeks silinip yeniden oluşturulur
+INDEX_VERSION = 2
+
+# İndeks yazılırken bu kadar klasörde bir commit edilir (okuyucular ilerlemeyi görür)
+COMMIT_EVERY_DIRS = 500
+
+
+def _subtree_range(path):
+    """path altındaki tüm yolları kapsayan [alt, üst) aralığı (PRIMARY KEY indeksini kullanır)"""
+    prefix = path.rstrip(os.sep) + os.sep
+    return prefix, prefix[:-1] + chr(ord(os.sep) + 1)
+
+
+class FileIndex:
+    """Dosya adları için diskte kalıcı SQLite indeksi
+
+    Yol, ad, uzantı, boyut ve değiştirilme zamanı bir kez taranıp saklanır. Sonraki
+    yenilemeler artımlıdır: içeriği değişmeyen klasörler (klasör mtime'ı aynı) yeniden
+    listelenmez, yalnızca bilinen alt klasörlerine inilir. `full=True` tüm klasörleri
+    yeniden listeler ve dosya boyut/zaman değişikliklerini de yakalar. Disk
+    taraması paralel Crawler ile yapılır; indekse yalnızca çağıran thread yazar.
+    """
+
+    def __init__(self, index_path, crawler=None):
+        self.index_path = index_path
+        self.pool = ConnectionPool.get(index_path)
+        self.crawler = crawler or Crawler()
+        self.roots = []
+
+        self.last_refresh = 0.0  # monotonic; 0 ise bu oturumda yenilenmedi
+        self.last_stats = {}
+        self._refresh_lock = threading.Lock()
+        self._thread = None
+
+        self._init_db()
+
+    def _init_db(self):
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('PRAGMA user_version')
+            if c.fetchone()[0] != INDEX_VERSION:
+                c.execute('DROP TABLE IF EXISTS files')
+                c.execute('DROP TABLE IF EXISTS dirs')
+                c.execute('DROP TABLE IF EXISTS meta')
+
+            # Tüm dosya ve klasörler (arama kökleri hariç)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    name_folded TEXT NOT NULL,
+                    ext TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    is_dir INTEGER NOT NULL
+                )
+            ''')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_files_parent ON files(parent)')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_files_ext ON files(ext)')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_files_mtime ON files(is_dir, mtime)')
+            c.execute('CREATE INDEX IF NOT EXISTS idx_files_size ON files(is_dir, size)')
+
+            # Listelenen klasörler ve listelendikleri andaki mtime (artımlı yenileme için)
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS dirs (
+                    path TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL
+                )
+            ''')
+            c.execute('''
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            c.execute(f'PRAGMA user_version = {INDEX_VERSION}')
+
+    def _get_meta(self, c, key):
+        c.execute('SELECT value FROM meta WHERE key = ?', (key,))
+        row = c.fetchone()
+        return row[0] if row else None
+
+    def is_ready(self, paths):
+        """Bu arama yolları için tamamlanmış bir tarama var mı?"""
+        roots = dedupe_roots(paths)
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            built_at = self._get_meta(c, 'built_at')
+            indexed_roots = self._get_meta(c, 'roots')
+        return built_at is not None and indexed_roots == json.dumps(roots)
+
+    # Yenileme
+    def refresh(self, paths, full=False, wait=False):
+        """İndeksi diskle eşitle (çağıran thread'de çalışır)
+
+        Başka bir yenileme sürüyorsa wait=False iken hemen None döner, wait=True
+        iken onun bitmesini bekleyip yeniden eşitler.
+        """
+        if not self._refresh_lock.acquire(blocking=wait):
+            return None  # Zaten bir yenileme sürüyor
+        try:
+            return self._refresh(dedupe_roots(paths), full)
+        except Exception as e:
+            print(f"Dosya indeksi yenileme hatası: {e}")
+            return None
+        finally:
+            self._refresh_lock.release()
+
+    def refresh_async(self, paths, full=False):
+        """İndeksi arka plan thread'inde yenile"""
+        if self._thread is not None and self._thread.is_alive():
+            return False
+        self._thread = threading.Thread(
+            target=self.refresh, args=(list(paths), full), name="kahya-file-index", daemon=True
+        )
+        self._thread.start()
+        return True
+
+    def is_refreshing(self):
+        return self._refresh_lock.locked()
+
+    def _refresh(self, roots, full):
+        started = time.monotonic()
+        stats = {'dirs': 0, 'listed': 0, 'added': 0, 'updated': 0, 'removed': 0}
+
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT path, mtime_ns FROM dirs')
+            known_dirs = dict(c.fetchall())
+            # İçeriği değişmeyen klasörlerde tarayıcı bilinen alt klasörlere doğrudan iner
+            subdirs = {}
+            c.execute('SELECT parent, path FROM files WHERE is_dir = 1')
+            for parent, path in c.fetchall():
+                subdirs.setdefault(parent, []).append(path)
+            known = {path: (mtime_ns, subdirs.get(path, ())) for path, mtime_ns in known_dirs.items()}
+            seen_dirs = set()
+
+            for listing in self.crawler.crawl(roots, known, full):
+                seen_dirs.add(listing.path)
+                stats['dirs'] += 1
+                if listing.status == 'listed':
+                    self._sync_dir(c, listing.path, listing.mtime_ns, listing.entries, stats)
+                    stats['listed'] += 1
+
+                if stats['dirs'] % COMMIT_EVERY_DIRS == 0:
+                    conn.commit()
+
+            # Artık taranmayan klasörlerin (silinmiş ya da arama yolundan çıkarılmış) kayıtları
+            for path in set(known_dirs) - seen_dirs:
+                c.execute('DELETE FROM files WHERE parent = ?', (path,))
+                stats['removed'] += c.rowcount
+                c.execute('DELETE FROM dirs WHERE path = ?', (path,))
+
+            c.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+                ('built_at', str(int(time.time()))),
+                ('roots', json.dumps(roots)),
+            ])
+
+        stats['seconds'] = round(time.monotonic() - started, 3)
+        stats['crawl'] = dict(self.crawler.stats)
+        self.roots = roots
+        self.last_refresh = time.monotonic()
+        self.last_stats = stats
+        return stats
+
+    def _sync_dir(self, c, path, mtime_ns, listing, stats):
+        """Klasörün tarayıcıdan gelen (ad, is_dir, boyut, mtime) listesini indeksle eşitle"""
+        entries = {}
+        for name, is_dir, size, mtime in listing:
+            ext = '' if is_dir else os.path.splitext(name)[1].lower()
+            entries[os.path.join(path, name)] = (path, name, fold_text(name), ext, size, mtime, int(is_dir))
+
+        c.execute('SELECT path, size, mtime, is_dir FROM files WHERE parent = ?', (path,))
+        existing = {row[0]: row[1:] for row in c.fetchall()}
+
+        changed = []
+        for entry_path, row in entries.items():
+            old = existing.get(entry_path)
+            if old is None:
+                stats['added'] += 1
+            elif old != (row[4], row[5], row[6]):
+                stats['updated'] += 1
+            else:
+                continue
+            changed.append((entry_path,) + row)
+        c.executemany('INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?)', changed)
+
+        for entry_path, (_, _, was_dir) in existing.items():
+            if entry_path in entries:
+                continue
+            c.execute('DELETE FROM files WHERE path = ?', (entry_path,))
+            stats['removed'] += 1
+            if was_dir:
+                low, high = _subtree_range(entry_path)
+                c.execute('DELETE FROM files WHERE path >= ? AND path < ?', (low, high))
+                stats['removed'] += c.rowcount
+                c.execute('DELETE FROM dirs WHERE path = ? OR (path >= ? AND path < ?)', (entry_path, low, high))
+
+        c.execute('INSERT OR REPLACE INTO dirs (path, mtime_ns) VALUES (?, ?)', (path, mtime_ns))
+
+    # Sorgular
+    def _query(self, sql, params):
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute(sql, params)
+            return [row[0] for row in c.fetchall()]
+
+    def search_name(self, query, max_results=20):
+        """Adında query geçen dosya ve klasörler (Türkçe harf ve aksan duyarsız)"""
+        return self._query(
+            'SELECT path FROM files WHERE instr(name_folded, ?) > 0 ORDER BY is_dir, path LIMIT ?',
+            (fold_text(query), max_results)
+        )
+
+    def _candidates(self, sql, params=()):
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute(sql, params)
+            rows = c.fetchall()
+        return [(path, folded, bool(is_dir), mtime) for path, folded, is_dir, mtime in rows]
+
+    def name_candidates(self, query):
+        """Adında query geçen kayıtlar (FileRanker için)"""
+        return self._candidates(
+            'SELECT path, name_folded, is_dir, mtime FROM files WHERE instr(name_folded, ?) > 0', (fold_text(query),)
+        )
+
+    def all_candidates(self):
+        """Tüm kayıtlar (FileRanker bulanık aşaması için)"""
+        return self._candidates('SELECT path, name_folded, is_dir, mtime FROM files')
+
+    def files_with_extensions(self, extensions):
+        """Uzantısı verilen kümede olan dosyalar: (yol, boyut, mtime) (içerik indeksi için)"""
+        extensions = sorted(extensions)
+        if not extensions:
+            return []
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute(
+                f'SELECT path, size, mtime FROM files WHERE is_dir = 0 AND ext IN ({", ".join("?" * len(extensions))})',
+                extensions
+            )
+            return c.fetchall()
+
+    def search_extension(self, extension, max_results=20):
+        """Uzantısı eşleşen dosyalar (uzantı '.pdf' biçiminde)"""
+        return self._query(
+            'SELECT path FROM files WHERE ext = ? AND is_dir = 0 ORDER BY path LIMIT ?',
+            (extension.lower(), max_results)
+        )
+
+    def search_pattern(self, pattern, max_results=20):
+        """fnmatch tarzı pattern ile dosya adı eşleştir (SQLite GLOB; harf ve aksan duyarsız)"""
+        # fnmatch'teki [!...] olumsuzlaması GLOB'da [^...] olarak yazılır
+        glob_pattern = fold_text(pattern).replace('[!', '[^')
+        return self._query(
+            'SELECT path FROM files WHERE is_dir = 0 AND name_folded GLOB ? ORDER BY path LIMIT ?',
+            (glob_pattern, max_results)
+        )
+
+    def search_recent(self, since, max_results=20):
+        """since (epoch) sonrası değişmiş dosyalar, en yeniden eskiye"""
+        return self._query(
+            'SELECT path FROM files WHERE is_dir = 0 AND mtime > ? ORDER BY mtime DESC LIMIT ?',
+            (since, max_results)
+        )
+
+    def search_large(self, min_size, max_results=20):
+        """min_size bayttan büyük dosyalar, büyükten küçüğe"""
+        return self._query(
+            'SELECT path FROM files WHERE is_dir = 0 AND size > ? ORDER BY size DESC LIMIT ?',
+            (min_size, max_results)
+        )
+
+    def export_tree(self, roots):
+        """Bellekteki ağacı kurmak için (satırlar, klasör mtime'ları) döndür
+
+        Satırlar (parent, name, is_dir, size, mtime) biçimindedir; yalnızca verilen
+        köklerin altındaki klasörler döner.
+        """
+        def under_roots(path):
+            return any(path == root or path.startswith(root.rstrip(os.sep) + os.sep) for root in roots)
+
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT path, mtime_ns FROM dirs')
+            dir_mtimes = {path: mtime for path, mtime in c.fetchall() if under_roots(path)}
+            c.execute('SELECT parent, name, is_dir, size, mtime FROM files')
+            rows = [row for row in c.fetchall() if row[0] in dir_mtimes]
+        return rows, dir_mtimes
+
+    def get_stats(self):
+        """Kayıt sayıları ve son yenileme bilgisi"""
+        with self.pool.connection() as conn:
+            c = conn.cursor()
+            c.execute('SELECT COUNT(*), COALESCE(SUM(is_dir), 0) FROM files')
+            total, dirs = c.fetchone()
+            built_at = self._get_meta(c, 'built_at')
+        return {
+            'files': total - dirs,
+            'dirs': dirs,
+            'built_at': int(built_at) if built_at else None,
+            'refreshing': self.is_refreshing(),
+            'last_refresh': dict(self.last_stats),
+        }
+
+    def close(self):
+        self.pool.close()
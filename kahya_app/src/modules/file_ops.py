@@ -2,10 +2,13 @@ import os
 import subprocess
 import platform
 from pathlib import Path
+from src.core.database import Database
 
 class FileOperations:
-    def __init__(self):
+    def __init__(self, db_path=None):
         self.system = platform.system().lower()
+        # Açılan dosyalar dosya aramasında öne çıkarılır
+        self.db = Database(db_path) if db_path else None
         
     def open_file(self, file_path):
         """Dosyayı varsayılan uygulamayla aç"""
@@ -20,6 +23,8 @@ class FileOperations:
             else:  # Linux
                 subprocess.run(["xdg-open", file_path])
                 
+            if self.db:
+                self.db.record_file_open(os.path.abspath(file_path))
             return True
         except Exception as e:
             print(f"Dosya açma hatası: {e}")
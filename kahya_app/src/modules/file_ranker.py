@@ -0,0 +1,149 @@
+import heapq
+import math
+import os
+import time
+from src.core.turkish_text import fold_text
+
+# Ad içinde kelime başı sayılan ayraçlar
+_SEPARATORS = ' _-.()[]'
+
+# Puan aralıkları: alt dizi eşleşmesi (en az 95) her zaman bulanık eşleşmenin
+# (en çok 85) üstünde kalır; böylece iki aşama sırayla üretilebilir.
+SUBSTRING_BASE = 140
+FUZZY_MAX = 60
+
+# Güncel dosyalar için ek puan: (en fazla yaş saniye, puan)
+RECENCY_BOOSTS = ((24 * 3600, 10), (7 * 24 * 3600, 6), (30 * 24 * 3600, 3))
+MAX_DEPTH_PENALTY = 10
+HIDDEN_PENALTY = 15
+MAX_FREQUENCY_BOOST = 15
+
+
+def substring_score(query, name):
+    """query'yi alt dizi olarak içeren ad için eşleşme puanı (ikisi de fold_text'ten geçmiş)"""
+    index = name.find(query)
+    if index < 0:
+        return None
+    score = SUBSTRING_BASE
+    if index == 0:
+        score += 30
+    elif name[index - 1] in _SEPARATORS:
+        score += 15
+    if name == query or os.path.splitext(name)[0] == query:
+        score += 40
+    # Sorgu adın küçük bir parçasıysa puan düşer
+    return score - min(20, (len(name) - len(query)) * 0.5)
+
+
+def fuzzy_score(query, name):
+    """query harfleri adda sırayla geçiyorsa 0..FUZZY_MAX arası puan, geçmiyorsa None"""
+    if not query:
+        return None
+    positions = []
+    start = 0
+    for ch in query:
+        index = name.find(ch, start)
+        if index < 0:
+            return None
+        positions.append(index)
+        start = index + 1
+
+    points = 0
+    for n, index in enumerate(positions):
+        points += 1
+        if index == 0 or name[index - 1] in _SEPARATORS:
+            points += 2  # Kelime başı
+        if n and positions[n - 1] == index - 1:
+            points += 2  # Ardışık harf
+    spread = (positions[-1] - positions[0] + 1 - len(query)) / max(len(name), 1)
+    return FUZZY_MAX * min(1.0, points / (len(query) * 5)) * (1 - 0.5 * spread)
+
+
+class FileRanker:
+    """Dosya arama sonuçlarını puanlayıp en iyiden başlayarak üretir
+
+    Eşleşme puanına klasör derinliği (derin ve gizli yollar geride), güncellik
+    (mtime) ve Kahya ile açılma sıklığı eklenir. Önce adında sorgu geçen adaylar,
+    ardından yalnızca harfleri sırayla geçen (bulanık) adaylar üretilir; her
+    aşamada adaylar bir yığına (heap) konur ve sırayla çekilir, bu yüzden ilk
+    k sonucu alan çağıran tüm eşleşmelerin sıralanmasını beklemez.
+    """
+
+    def __init__(self, roots=(), db=None, history_ttl=30.0):
+        self.base_depth = min((root.rstrip(os.sep).count(os.sep) for root in roots), default=0)
+        self.db = db
+        self.history_ttl = history_ttl
+        self._history = {}
+        self._history_at = 0.0
+
+    def _open_counts(self):
+        """{yol: (sayı, son açılma)} (kısa süreli önbellekli)"""
+        if self.db is None:
+            return {}
+        if time.monotonic() - self._history_at > self.history_ttl:
+            try:
+                self._history = self.db.get_file_open_counts()
+            except Exception as e:
+                print(f"Dosya geçmişi okuma hatası: {e}")
+            self._history_at = time.monotonic()
+        return self._history
+
+    def invalidate_history(self):
+        self._history_at = 0.0
+
+    def boost(self, path, mtime, now, history):
+        """Derinlik, gizlilik, güncellik ve açılma sıklığı puanı (-25..+25)"""
+        relative = path[1:] if path.startswith(os.sep) else path
+        parts = relative.split(os.sep)[self.base_depth:]
+        score = -min(MAX_DEPTH_PENALTY, 2 * max(0, len(parts) - 1))
+        if any(part.startswith('.') for part in parts):
+            score -= HIDDEN_PENALTY
+
+        age = now - (mtime or 0)
+        for max_age, points in RECENCY_BOOSTS:
+            if age <= max_age:
+                score += points
+                break
+
+        opened = history.get(path)
+        if opened:
+            score += min(MAX_FREQUENCY_BOOST, 5 * math.log2(1 + opened[0]))
+        return score
+
+    def rank(self, query, substring_candidates, all_candidates):
+        """(puan, yol) üret, en yüksek puandan başlayarak
+
+        substring_candidates: adında sorgu geçen (yol, sade ad, is_dir, mtime) kayıtları
+        all_candidates: tüm kayıtları üreten fonksiyon (bulanık aşama; gerekirse çağrılır)
+        """
+        query = fold_text(query).strip()
+        if not query:
+            return
+        now = time.time()
+        history = self._open_counts()
+
+        seen = set()
+        heap = []
+        for path, folded, is_dir, mtime in substring_candidates:
+            score = substring_score(query, folded)
+            if score is None or path in seen:
+                continue
+            seen.add(path)
+            heap.append((-(score + self.boost(path, mtime, now, history)), path))
+        heapq.heapify(heap)
+        while heap:
+            score, path = heapq.heappop(heap)
+            yield -score, path
+
+        # Bulanık aşama: yalnızca çağıran daha fazla sonuç isterse çalışır
+        heap = []
+        for path, folded, is_dir, mtime in all_candidates():
+            if path in seen:
+                continue
+            score = fuzzy_score(query, folded)
+            if score is not None:
+                heap.append((-(score + self.boost(path, mtime, now, history)), path))
+        heapq.heapify(heap)
+        while heap:
+            score, path = heapq.heappop(heap)
+            yield -score, path
@@ -1,10 +1,28 @@
 import os
-import glob
 import fnmatch
+import heapq
+import threading
+import time
+from itertools import islice
 from pathlib import Path
+from src.core.database import Database
+from src.core.turkish_text import fold_text
+from src.modules.content_extractors import supported_extensions
+from src.modules.content_index import ContentIndex
+from src.modules.file_crawler import Crawler, dedupe_roots
+from src.modules.file_index import FileIndex
+from src.modules.file_ranker import FileRanker
+from src.modules.file_watcher import FileWatcher
 
 class FileSearch:
-    def __init__(self):
+    # İndeks bundan eskiyse sorgu anında cevaplanır, yenileme arka planda yapılır
+    REFRESH_INTERVAL = 300
+    # İçerik indeksi bundan eskiyse arka planda yeniden eşitlenir
+    CONTENT_REFRESH_INTERVAL = 900
+    # İçerik taraması, izleyicinin ağacı kurmasını en fazla bu kadar bekler
+    CONTENT_WAIT_FOR_TREE = 120
+    
+    def __init__(self, index_path=None, watch=True, db_path=None, content_index_path=None):
         self.search_paths = [
             os.path.expanduser("~"),  # Kullanıcı klasörü
             os.path.join(os.path.expanduser("~"), "Desktop"),
@@ -12,142 +30,256 @@ class FileSearch:
             os.path.join(os.path.expanduser("~"), "Downloads")
         ]
         
+        # Kalıcı dosya adı indeksi; hazır olana kadar eski tarama yöntemi kullanılır
+        self.index = None
+        if index_path:
+            try:
+                self.index = FileIndex(index_path)
+            except Exception as e:
+                print(f"Dosya indeksi açma hatası: {e}")
+                self.index = None
+                
+        # İndeks hazır değilken kullanılan paralel disk tarayıcı
+        self.crawler = Crawler()
+        
+        # Sonuç sıralama (açılma sıklığı Kahya veritabanından okunur)
+        self.db = Database(db_path) if db_path else None
+        self.ranker = FileRanker(dedupe_roots(self.search_paths), self.db)
+        
+        # Bellekteki ağaç: kurulunca tüm aramalar ondan cevaplanır
+        self.watch = watch
+        self.watcher = None
+        self._start_watcher()
+        
+        # İsteğe bağlı belge içeriği indeksi (dosya listesi yukarıdaki kaynaklardan alınır);
+        # süreç havuzu ev dizinindeki tüm belgeleri işlediği için ilk içerik aramasında açılır
+        self.content_index_path = content_index_path
+        self.content_index = None
+        self._content_index_lock = threading.Lock()
+        
+    def _start_watcher(self):
+        """İzleyiciyi (yeniden) başlat; izleme kapalıysa indeksi arka planda yenile"""
+        if self.watcher:
+            self.watcher.stop()
+            self.watcher = None
+        if not self.watch:
+            if self.index:
+                self.index.refresh_async(self.search_paths)
+            return
+        try:
+            self.watcher = FileWatcher(self.search_paths, index=self.index)
+            self.watcher.start()
+        except Exception as e:
+            print(f"Dosya izleyici hatası: {e}")
+            self.watcher = None
+        
+    def _backend(self):
+        """Aramayı cevaplayacak kaynak: bellekteki ağaç, kalıcı indeks ya da None (disk taraması)"""
+        if self.watcher and self.watcher.is_live():
+            return self.watcher.tree
+        if self.index is None:
+            return None
+        try:
+            if not self.index.is_ready(self.search_paths):
+                if not self.watcher:
+                    self.index.refresh_async(self.search_paths)
+                return None
+            # İzleyici yoksa indeks eskidikçe arka planda yenilenir
+            if not self.watcher and (
+                not self.index.last_refresh or time.monotonic() - self.index.last_refresh > self.REFRESH_INTERVAL
+            ):
+                self.index.refresh_async(self.search_paths)
+            return self.index
+        except Exception as e:
+            print(f"Dosya indeksi hatası: {e}")
+            return None
+        
+    def _walk(self):
+        """Arama yollarını diskten tara: (yol, ad, is_dir, boyut, mtime) üretir"""
+        for listing in self.crawler.crawl(self.search_paths):
+            if listing.status != 'listed':
+                continue
+            for name, is_dir, size, mtime in listing.entries:
+                yield os.path.join(listing.path, name), name, is_dir, size, mtime
+        
+    def refresh_index(self, full=False):
+        """İndeksi arka planda yenile (full=True tüm klasörleri yeniden listeler)"""
+        if self.index:
+            self.index.refresh_async(self.search_paths, full=full)
+            
+    def _content_files(self):
+        """İçerik indeksine girecek dosyalar: (yol, boyut, mtime) (yenileme thread'inde çalışır)"""
+        # Ağaç kurulmak üzereyse ikinci bir disk taraması yapmak yerine onu bekle
+        deadline = time.monotonic() + self.CONTENT_WAIT_FOR_TREE
+        while self.watcher and not self.watcher.is_live() and time.monotonic() < deadline:
+            time.sleep(0.5)
+            
+        extensions = supported_extensions()
+        backend = self._backend()
+        if backend:
+            return backend.files_with_extensions(extensions)
+        return (
+            (path, size, mtime) for path, name, is_dir, size, mtime in self._walk()
+            if not is_dir and os.path.splitext(name)[1].lower() in extensions
+        )
+        
+    def refresh_content_index(self):
+        """İçerik indeksini arka planda dosya listesiyle eşitle"""
+        if self.content_index:
+            self.content_index.refresh_async(self._content_files)
+            
+    def _open_content_index(self):
+        """İçerik indeksini (ilk kullanımda) aç; kullanılamıyorsa None"""
+        with self._content_index_lock:
+            if self.content_index is None and self.content_index_path:
+                try:
+                    self.content_index = ContentIndex(self.content_index_path)
+                except Exception as e:
+                    print(f"İçerik indeksi açma hatası: {e}")
+                    self.content_index_path = None
+            return self.content_index
+            
+    def search_content(self, query, max_results=10):
+        """İçeriğinde query geçen belgeler: [(yol, alıntı)]; içerik indeksi yoksa None
+
+        İlk çağrıda indeks açılır ve arka planda yenilenmeye başlar; önceki
+        oturumdan kalan indeks varsa sonuçlar hemen ondan döner.
+        """
+        if not self._open_content_index():
+            return None
+        try:
+            last = self.content_index.last_refresh
+            if not last or time.monotonic() - last > self.CONTENT_REFRESH_INTERVAL:
+                self.refresh_content_index()
+            return self.content_index.search(query, max_results)
+        except Exception as e:
+            print(f"İçerik arama hatası: {e}")
+            return []
+            
+    def record_open(self, file_path):
+        """Açılan dosyayı sıralamada hemen hesaba kat"""
+        self.ranker.invalidate_history()
+        
+    def get_index_stats(self):
+        """Dosya indeksi ve izleyici istatistikleri"""
+        stats = self.index.get_stats() if self.index else {}
+        if self.watcher:
+            stats['watcher'] = self.watcher.get_stats()
+            stats['tree'] = self.watcher.tree.get_stats()
+        if self.content_index:
+            stats['content'] = self.content_index.get_stats()
+        return stats or None
+        
+    def close(self):
+        """İzleyiciyi durdur, indeks bağlantılarını kapat"""
+        if self.content_index:
+            self.content_index.close()
+        if self.watcher:
+            self.watcher.stop()
+        if self.index:
+            self.index.close()
+        
     def search_files(self, query, max_results=20):
         """Dosya ara"""
-        results = []
+        backend = self._backend()
+        if backend:
+            return backend.search_name(query, max_results)
+            
         query_lower = query.lower()
+        matches = (path for path, name, _, _, _ in self._walk() if query_lower in name.lower())
+        return list(islice(matches, max_results))
         
-        for search_path in self.search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
-            try:
-                # Recursive arama
-                for root, dirs, files in os.walk(search_path):
-                    # Dosya adlarında ara
-                    for file in files:
-                        if query_lower in file.lower():
-                            file_path = os.path.join(root, file)
-                            results.append(file_path)
-                            if len(results) >= max_results:
-                                return results
-                                
-                    # Klasör adlarında ara
-                    for dir_name in dirs:
-                        if query_lower in dir_name.lower():
-                            dir_path = os.path.join(root, dir_name)
-                            results.append(dir_path)
-                            if len(results) >= max_results:
-                                return results
-                                
-            except (PermissionError, OSError):
-                # Erişim izni yoksa atla
-                continue
-                
-        return results
+    def search_ranked(self, query):
+        """En iyi eşleşmeden başlayarak dosya/klasör yollarını üret
+
+        Önce adında sorgu geçenler, sonra harfleri sırayla geçenler (bulanık) gelir;
+        ilk birkaç sonucu alıp bırakmak tüm eşleşmelerin sıralanmasını gerektirmez.
+        """
+        backend = self._backend()
+        if backend:
+            substring_candidates = backend.name_candidates(query)
+            all_candidates = backend.all_candidates
+        else:
+            entries = [(path, fold_text(name), is_dir, mtime) for path, name, is_dir, _, mtime in self._walk()]
+            folded_query = fold_text(query)
+            substring_candidates = [entry for entry in entries if folded_query in entry[1]]
+            all_candidates = lambda: entries
+            
+        for _, path in self.ranker.rank(query, substring_candidates, all_candidates):
+            yield path
+            
+    def search_best(self, query, max_results=5):
+        """Sıralı aramanın ilk max_results sonucu"""
+        return list(islice(self.search_ranked(query), max_results))
+
+    def search_exact(self, query, max_results=2):
+        """Adı (uzantılı ya da uzantısız) sorguyla birebir aynı olan dosya/klasörler"""
+        folded_query = fold_text(query).strip()
+        if not folded_query:
+            return []
+        backend = self._backend()
+        if backend:
+            candidates = ((path, folded) for path, folded, _, _ in backend.name_candidates(query))
+        else:
+            candidates = ((path, fold_text(name)) for path, name, _, _, _ in self._walk())
+        matches = (
+            path for path, folded in candidates
+            if folded == folded_query or os.path.splitext(folded)[0] == folded_query
+        )
+        return list(islice(matches, max_results))
         
     def search_by_extension(self, extension, max_results=20):
         """Uzantıya göre dosya ara"""
-        results = []
         extension = extension.lower()
         if not extension.startswith('.'):
             extension = '.' + extension
             
-        for search_path in self.search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
-            try:
-                pattern = os.path.join(search_path, f"**/*{extension}")
-                files = glob.glob(pattern, recursive=True)
-                
-                for file_path in files:
-                    if os.path.isfile(file_path):
-                        results.append(file_path)
-                        if len(results) >= max_results:
-                            return results
-                            
-            except (PermissionError, OSError):
-                continue
-                
-        return results
+        backend = self._backend()
+        if backend:
+            return backend.search_extension(extension, max_results)
+            
+        matches = (
+            path for path, name, is_dir, _, _ in self._walk()
+            if not is_dir and name.lower().endswith(extension)
+        )
+        return list(islice(matches, max_results))
         
     def search_by_pattern(self, pattern, max_results=20):
         """Pattern'e göre dosya ara"""
-        results = []
-        
-        for search_path in self.search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
-            try:
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        if fnmatch.fnmatch(file.lower(), pattern.lower()):
-                            file_path = os.path.join(root, file)
-                            results.append(file_path)
-                            if len(results) >= max_results:
-                                return results
-                                
-            except (PermissionError, OSError):
-                continue
-                
-        return results
+        backend = self._backend()
+        if backend:
+            return backend.search_pattern(pattern, max_results)
+            
+        pattern = pattern.lower()
+        matches = (
+            path for path, name, is_dir, _, _ in self._walk()
+            if not is_dir and fnmatch.fnmatch(name.lower(), pattern)
+        )
+        return list(islice(matches, max_results))
         
     def search_recent_files(self, days=7, max_results=20):
         """Son kullanılan dosyaları ara"""
-        import time
-        results = []
         cutoff_time = time.time() - (days * 24 * 3600)
         
-        for search_path in self.search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
-            try:
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            mtime = os.path.getmtime(file_path)
-                            if mtime > cutoff_time:
-                                results.append((file_path, mtime))
-                        except (OSError, PermissionError):
-                            continue
-                            
-            except (PermissionError, OSError):
-                continue
-                
-        # Zaman sırasına göre sırala
-        results.sort(key=lambda x: x[1], reverse=True)
-        return [path for path, _ in results[:max_results]]
+        backend = self._backend()
+        if backend:
+            return backend.search_recent(cutoff_time, max_results)
+        
+        # Zaman sırasına göre en yeniler
+        recent = ((mtime, path) for path, _, is_dir, _, mtime in self._walk() if not is_dir and mtime > cutoff_time)
+        return [path for _, path in heapq.nlargest(max_results, recent)]
         
     def search_large_files(self, min_size_mb=10, max_results=20):
         """Büyük dosyaları ara"""
-        results = []
         min_size_bytes = min_size_mb * 1024 * 1024
         
-        for search_path in self.search_paths:
-            if not os.path.exists(search_path):
-                continue
-                
-            try:
-                for root, dirs, files in os.walk(search_path):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        try:
-                            size = os.path.getsize(file_path)
-                            if size > min_size_bytes:
-                                results.append((file_path, size))
-                        except (OSError, PermissionError):
-                            continue
-                            
-            except (PermissionError, OSError):
-                continue
-                
-        # Boyut sırasına göre sırala
-        results.sort(key=lambda x: x[1], reverse=True)
-        return [path for path, _ in results[:max_results]]
+        backend = self._backend()
+        if backend:
+            return backend.search_large(min_size_bytes, max_results)
+        
+        # Boyut sırasına göre en büyükler
+        large = ((size, path) for path, _, is_dir, size, _ in self._walk() if not is_dir and size > min_size_bytes)
+        return [path for _, path in heapq.nlargest(max_results, large)]
         
     def get_file_info(self, file_path):
         """Dosya hakkında detaylı bilgi getir"""
@@ -192,11 +324,13 @@ class FileSearch:
         """Arama yoluna yeni klasör ekle"""
         if os.path.exists(path) and path not in self.search_paths:
             self.search_paths.append(path)
+            self._start_watcher()
             
     def remove_search_path(self, path):
         """Arama yolundan klasör çıkar"""
         if path in self.search_paths:
             self.search_paths.remove(path)
+            self._start_watcher()
             
     def get_search_paths(self):
         """Mevcut arama yollarını getir"""
@@ -0,0 +1,244 @@
+import heapq
+import os
+import stat
+import threading
+from src.modules.file_crawler import is_ignored
+from src.modules.name_index import TrigramIndex
+
+
+class FileTree:
+    """Arama yollarındaki dosya ağacının bellekteki kopyası
+
+    Her klasör için {ad: (is_dir, boyut, mtime)} sözlüğü tutulur. Bu sözlükler
+    yerinde değiştirilmez (kopyala-değiştir-yerleştir), böylece aramalar kilit
+    almadan tutarlı bir görüntü üzerinde çalışır; değişiklikleri yalnızca
+    FileWatcher'ın uygulayıcı thread'i yazar. Ad aramaları ağaçla birlikte
+    güncellenen trigram indeksinden (self.names) cevaplanır.
+    """
+
+    def __init__(self, roots=()):
+        self.roots = list(roots)
+        self.dirs = {}  # klasör -> {ad: (is_dir, size, mtime)}
+        self.dir_mtimes = {}  # klasör -> listelendiği andaki mtime_ns
+        self.names = TrigramIndex()
+        self._lock = threading.RLock()
+
+    # Yükleme
+    def load(self, rows, dir_mtimes):
+        """İndeksten gelen (parent, name, is_dir, size, mtime) satırlarıyla doldur"""
+        dirs = {path: {} for path in dir_mtimes}
+        for parent, name, is_dir, size, mtime in rows:
+            dirs.setdefault(parent, {})[name] = (bool(is_dir), size, mtime)
+        with self._lock:
+            self.dirs = dirs
+            self.dir_mtimes = dict(dir_mtimes)
+            self.names.build(
+                (parent, name, meta[0]) for parent, children in dirs.items() for name, meta in children.items()
+            )
+
+    # Disk ile eşitleme (yalnızca uygulayıcı thread'i çağırır)
+    def _list(self, path):
+        children = {}
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir(follow_symlinks=False)
+                        st = entry.stat(follow_symlinks=False)
+                    except OSError:
+                        continue
+                    children[entry.name] = (is_dir, 0 if is_dir else st.st_size, st.st_mtime)
+        except (PermissionError, OSError):
+            return None
+        return children
+
+    def relist(self, path, force=True):
+        """Klasörü yeniden listele: (yeni alt klasörler, silinen klasörler) döndür
+
+        force=False ise klasörün mtime'ı değişmediyse hiçbir şey yapılmaz.
+        """
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], self.remove(path)
+        if not force and self.dir_mtimes.get(path) == mtime_ns:
+            return [], []
+
+        children = self._list(path)
+        if children is None:
+            # Erişilemiyor: eski içerik kalır, aynı değişiklik için tekrar denenmez
+            if path in self.dir_mtimes:
+                self.dir_mtimes[path] = mtime_ns
+            return [], []
+
+        with self._lock:
+            old = self.dirs.get(path, {})
+            self.dirs[path] = children
+            self.dir_mtimes[path] = mtime_ns
+
+            removed = []
+            for name, meta in old.items():
+                new = children.get(name)
+                if new is None or new[0] != meta[0]:
+                    self.names.remove(os.path.join(path, name))
+                if meta[0] and not (new or (False,))[0]:
+                    removed.extend(self._drop(os.path.join(path, name)))
+            for name, meta in children.items():
+                previous = old.get(name)
+                if previous is None or previous[0] != meta[0]:
+                    self.names.add(path, name, meta[0])
+        new_dirs = [
+            os.path.join(path, name) for name, meta in children.items()
+            if meta[0] and not old.get(name, (False,))[0]
+        ]
+        return new_dirs, removed
+
+    def scan(self, path, force=True, deep=False):
+        """Klasörü ve yeni alt klasörlerini tara (deep=True ise tüm alt ağacı)
+
+        Yok sayılan klasörlere (IGNORED_DIRS) inilmez. (listelenen yeni klasörler,
+        silinen klasörler) döndürür.
+        """
+        added, removed = [], []
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            if current not in self.dirs:
+                added.append(current)
+            new_dirs, gone = self.relist(current, force)
+            removed.extend(gone)
+            if deep:
+                children = self.dirs.get(current, {})
+                new_dirs = [os.path.join(current, name) for name, meta in children.items() if meta[0]]
+            stack.extend(d for d in new_dirs if not is_ignored(os.path.basename(d)))
+        return added, removed
+
+    def sync_path(self, path):
+        """Tek bir yolu diskteki durumuna getir (olay uygulaması)"""
+        if path in self.roots:
+            if os.path.isdir(path):
+                return self.scan(path, force=False)
+            return [], self.remove(path)
+
+        parent, name = os.path.split(path)
+        if parent not in self.dirs:
+            return [], []  # İzlenmeyen klasör
+
+        try:
+            st = os.lstat(path)
+        except OSError:
+            st = None
+
+        added, removed = [], []
+        with self._lock:
+            children = dict(self.dirs[parent])
+            old = children.pop(name, None)
+            if st is not None:
+                is_dir = stat.S_ISDIR(st.st_mode)
+                children[name] = (is_dir, 0 if is_dir else st.st_size, st.st_mtime)
+                if old is None or old[0] != is_dir:
+                    self.names.add(parent, name, is_dir)
+            elif old is not None:
+                self.names.remove(path)
+            self.dirs[parent] = children
+            if old and old[0] and (st is None or not stat.S_ISDIR(st.st_mode)):
+                removed = self._drop(path)
+
+        if st is not None and stat.S_ISDIR(st.st_mode) and path not in self.dirs and not is_ignored(name):
+            added, gone = self.scan(path)
+            removed.extend(gone)
+        return added, removed
+
+    def remove(self, path):
+        """Yolu ve alt ağacını ağaçtan çıkar; silinen klasörleri döndür"""
+        with self._lock:
+            parent, name = os.path.split(path)
+            if parent in self.dirs and name in self.dirs[parent]:
+                children = dict(self.dirs[parent])
+                del children[name]
+                self.dirs[parent] = children
+                self.names.remove(path)
+            return self._drop(path)
+
+    def _drop(self, path):
+        """Kilit altında çağrılmalı"""
+        removed = []
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            children = self.dirs.pop(current, None)
+            self.dir_mtimes.pop(current, None)
+            if children is None:
+                continue
+            removed.append(current)
+            for name, meta in children.items():
+                child = os.path.join(current, name)
+                self.names.remove(child)
+                if meta[0]:
+                    stack.append(child)
+        return removed
+
+    # Sorgular
+    def entries(self):
+        """(klasör, ad, is_dir, boyut, mtime) üret (kilitsiz anlık görüntü)"""
+        for parent, children in list(self.dirs.items()):
+            for name, (is_dir, size, mtime) in children.items():
+                yield parent, name, is_dir, size, mtime
+
+    def _files(self):
+        return ((parent, name, size, mtime) for parent, name, is_dir, size, mtime in self.entries() if not is_dir)
+
+    def search_name(self, query, max_results=20):
+        """Adında query geçen dosya ve klasörler (Türkçe harf ve aksan duyarsız)"""
+        return self.names.search_substring(query, max_results)
+
+    def search_prefix(self, prefix, max_results=20):
+        """Adı prefix ile başlayan dosya ve klasörler"""
+        return self.names.search_prefix(prefix, max_results)
+
+    def _with_mtime(self, entries):
+        """Ad indeksi kayıtlarını sıralama adayına çevir: (yol, sade ad, is_dir, mtime)"""
+        for parent, name, folded, is_dir in entries:
+            meta = self.dirs.get(parent, {}).get(name)
+            yield os.path.join(parent, name), folded, is_dir, meta[2] if meta else None
+
+    def name_candidates(self, query):
+        """Adında query geçen kayıtlar (FileRanker için)"""
+        return self._with_mtime(self.names.substring_entries(query))
+
+    def all_candidates(self):
+        """Tüm kayıtlar (FileRanker bulanık aşaması için)"""
+        return self._with_mtime(self.names.iter_entries())
+
+    def files_with_extensions(self, extensions):
+        """Uzantısı verilen kümede olan dosyalar: (yol, boyut, mtime) (içerik indeksi için)"""
+        for parent, name, size, mtime in self._files():
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(parent, name), size, mtime
+
+    def search_extension(self, extension, max_results=20):
+        """Uzantısı eşleşen dosyalar (uzantı '.pdf' biçiminde)"""
+        return self.names.search_pattern('*' + extension, max_results)
+
+    def search_pattern(self, pattern, max_results=20):
+        """fnmatch tarzı pattern ile dosya adı eşleştir"""
+        return self.names.search_pattern(pattern, max_results)
+
+    def search_recent(self, since, max_results=20):
+        """since (epoch) sonrası değişmiş dosyalar, en yeniden eskiye"""
+        recent = ((mtime, parent, name) for parent, name, _, mtime in self._files() if mtime > since)
+        return [os.path.join(parent, name) for _, parent, name in heapq.nlargest(max_results, recent)]
+
+    def search_large(self, min_size, max_results=20):
+        """min_size bayttan büyük dosyalar, büyükten küçüğe"""
+        large = ((size, parent, name) for parent, name, size, _ in self._files() if size > min_size)
+        return [os.path.join(parent, name) for _, parent, name in heapq.nlargest(max_results, large)]
+
+    def get_stats(self):
+        files = dirs = 0
+        for _, _, is_dir, _, _ in self.entries():
+            if is_dir:
+                dirs += 1
+            else:
+                files += 1
+        return {'files': files, 'dirs': dirs, 'listed_dirs': len(self.dirs), 'names': self.names.get_stats()}
@@ -0,0 +1,414 @@
+import ctypes
+import ctypes.util
+import errno
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+from src.modules.file_crawler import Crawler, dedupe_roots
+from src.modules.file_tree import FileTree
+
+# Olay türleri
+EVENT_PATH = 'path'  # Tek yolu diskle eşitle (oluşturma/silme/taşıma/değişiklik)
+EVENT_RELIST = 'relist'  # Klasörü yeniden listele
+EVENT_RESCAN = 'rescan'  # Klasörün tüm alt ağacını yeniden tara
+
+# Taşma kümesi bundan büyürse tüm kökler yeniden taranır
+MAX_OVERFLOW_DIRS = 1000
+
+# inotify sabitleri (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_DONT_FOLLOW = 0x02000000
+IN_EXCL_UNLINK = 0x04000000
+
+WATCH_MASK = (
+    IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR | IN_DONT_FOLLOW | IN_EXCL_UNLINK
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class WatchLimitReached(Exception):
+    """inotify izleme sınırı (max_user_watches) doldu"""
+
+
+class InotifyBackend:
+    """Linux inotify ile klasör başına izleme; olaylar FileWatcher kuyruğuna gider"""
+
+    name = 'inotify'
+
+    def __init__(self, watcher):
+        self.watcher = watcher
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify başlatılamadı")
+        self._paths = {}  # wd -> klasör
+        self._wds = {}  # klasör -> wd
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    @staticmethod
+    def is_supported():
+        if not sys.platform.startswith('linux'):
+            return False
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6')
+            return hasattr(libc, 'inotify_init1')
+        except OSError:
+            return False
+
+    def add_dirs(self, paths):
+        for path in paths:
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), WATCH_MASK)
+            if wd < 0:
+                err = ctypes.get_errno()
+                if err == errno.ENOSPC:
+                    raise WatchLimitReached(path)
+                continue  # Silinmiş ya da erişilemeyen klasör
+            with self._lock:
+                old = self._paths.get(wd)
+                if old is not None:
+                    self._wds.pop(old, None)
+                self._paths[wd] = path
+                self._wds[path] = wd
+
+    def remove_dirs(self, paths):
+        for path in paths:
+            with self._lock:
+                wd = self._wds.pop(path, None)
+                if wd is None:
+                    continue
+                self._paths.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def watch_count(self):
+        return len(self._wds)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._read_loop, name="kahya-inotify", daemon=True)
+        self._thread.start()
+
+    def _read_loop(self):
+        while not self._stopped.is_set():
+            try:
+                readable, _, _ = select.select([self._fd], [], [], 1.0)
+                if not readable:
+                    continue
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                if not self._stopped.is_set():
+                    print(f"inotify okuma hatası: {e}")
+                break
+            self._parse(data)
+
+    def _parse(self, data):
+        offset = 0
+        while offset + _EVENT_HEADER.size <= len(data):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(data, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                # Çekirdek kuyruğu taştı: olaylar kayıp, kökler yeniden taranmalı
+                self.watcher.overflow_all()
+                continue
+            with self._lock:
+                directory = self._paths.get(wd)
+                if mask & IN_IGNORED and directory is not None:
+                    self._paths.pop(wd, None)
+                    if self._wds.get(directory) == wd:
+                        del self._wds[directory]
+            if directory is None or mask & IN_IGNORED:
+                continue
+            if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                self.watcher.emit(EVENT_PATH, directory)
+            elif name:
+                self.watcher.emit(EVENT_PATH, os.path.join(directory, name))
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+class PollingBackend:
+    """inotify yoksa: klasör mtime'larını düzenli yokla, yalnızca değişen klasörleri listele
+
+    Klasör mtime'ı yalnızca doğrudan içeriği değişince değişir; içeriği aynı
+    kalan klasörler hiç listelenmez, yalnızca stat edilir.
+    """
+
+    name = 'polling'
+
+    def __init__(self, watcher, interval=3.0):
+        self.watcher = watcher
+        self.interval = interval
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def add_dirs(self, paths):
+        pass  # Ağaçtaki tüm klasörler zaten yoklanıyor
+
+    def remove_dirs(self, paths):
+        pass
+
+    def watch_count(self):
+        return 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._poll_loop, name="kahya-file-poll", daemon=True)
+        self._thread.start()
+
+    def poll_once(self):
+        """mtime'ı değişmiş klasörler için yeniden listeleme olayı üret"""
+        tree = self.watcher.tree
+        for path, mtime_ns in list(tree.dir_mtimes.items()):
+            try:
+                changed = os.stat(path).st_mtime_ns != mtime_ns
+            except OSError:
+                changed = True
+            if changed:
+                self.watcher.emit(EVENT_RELIST, path)
+        for root in tree.roots:
+            if root not in tree.dirs and os.path.isdir(root):
+                self.watcher.emit(EVENT_RESCAN, root)
+
+    def _poll_loop(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.poll_once()
+            except Exception as e:
+                print(f"Dosya yoklama hatası: {e}")
+
+    def stop(self):
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+
+class FileWatcher:
+    """Arama yollarının bellekteki ağacını arka planda güncel tutar
+
+    Açılışta ağaç kalıcı indeksten yüklenir (yoksa diskten taranır), ardından
+    inotify (Linux) ya da klasör mtime yoklaması ile gelen olaylar sınırlı bir
+    kuyrukta toplanıp `batch_delay` aralıklarla toplu olarak uygulanır. Kuyruk
+    taşarsa olay kaybolan klasörler yeniden listelenir (kısmi yeniden tarama).
+    """
+
+    def __init__(self, paths, index=None, backend='auto', max_events=10000, batch_delay=0.2, poll_interval=3.0):
+        self.roots = dedupe_roots(paths)
+        self.index = index
+        self.backend_name = backend
+        self.batch_delay = batch_delay
+        self.poll_interval = poll_interval
+
+        self.tree = FileTree(self.roots)
+        self.backend = None
+        self.events = queue.Queue(maxsize=max_events)
+        self.live = False  # Ağaç kuruldu ve izleniyor
+
+        self._overflow = set()  # Olayı kaybolan klasörler
+        self._overflow_all = False
+        self._overflow_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._backend_lock = threading.Lock()  # backend ataması ile stop() arasında
+        self._thread = None
+
+        self.metrics = {'events': 0, 'dropped': 0, 'batches': 0, 'overflow_rescans': 0, 'build_seconds': None}
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="kahya-file-watch", daemon=True)
+        self._thread.start()
+
+    def is_live(self):
+        return self.live and not self._stopped.is_set()
+
+    # Olay girişi (backend thread'lerinden)
+    def emit(self, kind, path):
+        try:
+            self.events.put_nowait((kind, path))
+            self.metrics['events'] += 1
+        except queue.Full:
+            # Kuyruk dolu: olayı bırak, ilgili klasörü sonra yeniden listele
+            directory = os.path.dirname(path) if kind == EVENT_PATH else path
+            with self._overflow_lock:
+                self.metrics['dropped'] += 1
+                self._overflow.add(directory)
+                if len(self._overflow) > MAX_OVERFLOW_DIRS:
+                    self._overflow_all = True
+                    self._overflow.clear()
+
+    def overflow_all(self):
+        with self._overflow_lock:
+            self._overflow_all = True
+            self._overflow.clear()
+
+    # Kurulum
+    def _build(self):
+        started = time.monotonic()
+        if self.index is not None:
+            # Kalıcı indeksi artımlı güncelle ve ağacı ondan kur (diskte gezinmekten hızlı)
+            self.index.refresh(self.roots, wait=True)
+            rows, dir_mtimes = self.index.export_tree(self.roots)
+        else:
+            # İndeks yok: ağacı paralel tarayıcıyla kur
+            rows, dir_mtimes = [], {}
+            for listing in Crawler().crawl(self.roots):
+                if self._stopped.is_set():
+                    return
+                if listing.status == 'listed':
+                    dir_mtimes[listing.path] = listing.mtime_ns
+                    rows.extend((listing.path,) + entry for entry in listing.entries)
+        self.tree.load(rows, dir_mtimes)
+        for root in self.roots:
+            if root not in self.tree.dirs and os.path.isdir(root):
+                self.tree.scan(root, deep=True)
+        self.metrics['build_seconds'] = round(time.monotonic() - started, 3)
+
+    def _start_backend(self):
+        if self.backend_name in ('auto', 'inotify') and InotifyBackend.is_supported():
+            try:
+                backend = InotifyBackend(self)
+                backend.add_dirs(list(self.tree.dirs))
+                backend.start()
+                return backend
+            except WatchLimitReached:
+                print("inotify izleme sınırı doldu, yoklama yöntemine geçiliyor")
+                backend.stop()
+            except OSError as e:
+                print(f"inotify başlatma hatası: {e}")
+        backend = PollingBackend(self, self.poll_interval)
+        backend.start()
+        return backend
+
+    def _fallback_to_polling(self):
+        print("inotify izleme sınırı doldu, yoklama yöntemine geçiliyor")
+        with self._backend_lock:
+            if self._stopped.is_set():
+                return
+            self.backend.stop()
+            self.backend = PollingBackend(self, self.poll_interval)
+            self.backend.start()
+
+    def _run(self):
+        try:
+            self._build()
+            if self._stopped.is_set():
+                return
+            backend = self._start_backend()
+            # Kurulum sırasında stop() çağrıldıysa backend'i burada kapat
+            with self._backend_lock:
+                stopped = self._stopped.is_set()
+                if not stopped:
+                    self.backend = backend
+            if stopped:
+                backend.stop()
+                return
+            # Kurulum sırasında kaçan değişiklikleri yakala
+            for path in list(self.tree.dirs):
+                self._apply_changes(*self.tree.scan(path, force=False))
+            self.live = True
+        except Exception as e:
+            print(f"Dosya izleyici başlatma hatası: {e}")
+            return
+        self._apply_loop()
+
+    # Olay uygulama
+    def _apply_loop(self):
+        while not self._stopped.is_set():
+            try:
+                first = self.events.get(timeout=0.5)
+            except queue.Empty:
+                first = None
+            if first is None and not self._overflow and not self._overflow_all:
+                continue
+
+            # Kısa bir süre bekleyip gelen olayları tek seferde uygula
+            if first is not None:
+                time.sleep(self.batch_delay)
+            batch = [first] if first is not None else []
+            while True:
+                try:
+                    batch.append(self.events.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._apply_batch(batch)
+            except Exception as e:
+                print(f"Dosya olayı uygulama hatası: {e}")
+
+    def _apply_batch(self, batch):
+        with self._overflow_lock:
+            overflow, self._overflow = self._overflow, set()
+            overflow_all, self._overflow_all = self._overflow_all, False
+
+        if overflow_all:
+            self.metrics['overflow_rescans'] += 1
+            for root in self.roots:
+                self._apply_changes(*self.tree.scan(root, force=True, deep=True))
+            return  # Kuyruktaki olaylar taramaya dahil
+
+        # Aynı yol için gelen olaylar birleştirilir: her biri diskteki son durumu okur
+        rescans = {path for kind, path in batch if kind == EVENT_RESCAN}
+        relists = {path for kind, path in batch if kind == EVENT_RELIST} | overflow
+        paths = {path for kind, path in batch if kind == EVENT_PATH}
+        if overflow:
+            self.metrics['overflow_rescans'] += 1
+
+        for path in rescans:
+            self._apply_changes(*self.tree.scan(path, force=True, deep=True))
+        for path in relists - rescans:
+            self._apply_changes(*self.tree.scan(path, force=True))
+        for path in paths - relists:
+            self._apply_changes(*self.tree.sync_path(path))
+        self.metrics['batches'] += 1
+
+    def _apply_changes(self, added, removed):
+        """Ağaca eklenen/çıkarılan klasörleri backend'e bildir"""
+        if removed:
+            self.backend.remove_dirs(removed)
+        if added:
+            try:
+                self.backend.add_dirs(added)
+            except WatchLimitReached:
+                self._fallback_to_polling()
+
+    def get_stats(self):
+        stats = dict(self.metrics)
+        stats['live'] = self.is_live()
+        stats['backend'] = self.backend.name if self.backend else None
+        stats['watches'] = self.backend.watch_count() if self.backend else 0
+        stats['queued'] = self.events.qsize()
+        return stats
+
+    def stop(self, timeout=2.0):
+        with self._backend_lock:
+            self._stopped.set()
+            backend = self.backend
+        self.live = False
+        if backend is not None:
+            backend.stop()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout)
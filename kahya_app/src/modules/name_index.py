@@ -0,0 +1,175 @@
+import fnmatch
+import os
+import re
+import threading
+from array import array
+from src.core.turkish_text import fold_text
+
+# Ad başı/sonu işaretleri: önek ve sonek sorguları da trigram ile bulunur
+_START = '\x02'
+_END = '\x03'
+
+# fnmatch joker karakterleri (literal parçaları ayırmak için)
+_WILDCARDS = re.compile(r'\*|\?|\[[^\]]*\]')
+
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """Dosya adları için bellekte trigram (3'lü harf) indeksi
+
+    Adlar fold_text ile sadeleştirilip (Türkçe küçük harf, aksansız) başına/sonuna
+    işaret eklenerek trigramlara bölünür. Her trigram için adı içeren kayıt
+    id'leri artan sırada tutulur. Sorgunun trigramlarından biri hiç yoksa sonuç
+    boştur; varsa kesişim en kısa posting listesiyle sınırlıdır ve bu listedeki
+    adaylar gerçek adla doğrulanır. (Diğer listelerde ikili arama yapmak, C'de
+    çalışan alt dizi kontrolünden daha yavaş olduğu için yapılmaz.)
+
+    Silinen kayıtlar yalnızca işaretlenir; ölü kayıt oranı yükselince indeks
+    sıkıştırılır (yeniden kurulur).
+    """
+
+    COMPACT_MIN_DEAD = 10000
+    COMPACT_RATIO = 0.25
+
+    def __init__(self):
+        self._entries = []  # id -> (klasör, ad, sade ad, is_dir) ya da None (silinmiş)
+        self._postings = {}  # trigram -> array('I') (artan id)
+        self._ids = {}  # yol -> id
+        self._dead = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._ids)
+
+    # Güncelleme (FileTree'nin yazıcı thread'inden)
+    def build(self, items):
+        """(klasör, ad, is_dir) kayıtlarından indeksi sıfırdan kur"""
+        entries, postings, ids = [], {}, {}
+        for parent, name, is_dir in items:
+            self._append(entries, postings, ids, parent, name, is_dir)
+        with self._lock:
+            self._entries, self._postings, self._ids = entries, postings, ids
+            self._dead = 0
+
+    @staticmethod
+    def _append(entries, postings, ids, parent, name, is_dir):
+        item_id = len(entries)
+        folded = fold_text(name)
+        entries.append((parent, name, name if folded == name else folded, bool(is_dir)))
+        ids[os.path.join(parent, name)] = item_id
+        for gram in _trigrams(_START + folded + _END):
+            posting = postings.get(gram)
+            if posting is None:
+                postings[gram] = array('I', (item_id,))
+            else:
+                posting.append(item_id)
+
+    def add(self, parent, name, is_dir):
+        path = os.path.join(parent, name)
+        with self._lock:
+            if path in self._ids:
+                self._remove_locked(path)
+            self._append(self._entries, self._postings, self._ids, parent, name, is_dir)
+
+    def remove(self, path):
+        with self._lock:
+            self._remove_locked(path)
+            if self._dead >= self.COMPACT_MIN_DEAD and self._dead > len(self._entries) * self.COMPACT_RATIO:
+                self._compact_locked()
+
+    def _remove_locked(self, path):
+        item_id = self._ids.pop(path, None)
+        if item_id is not None:
+            self._entries[item_id] = None
+            self._dead += 1
+
+    def _compact_locked(self):
+        entries, postings, ids = [], {}, {}
+        for entry in self._entries:
+            if entry is not None:
+                self._append(entries, postings, ids, entry[0], entry[1], entry[3])
+        # Okuyucular eski listeleri tutuyorsa onlarla tutarlı biçimde bitirir
+        self._entries, self._postings, self._ids = entries, postings, ids
+        self._dead = 0
+
+    # Sorgular
+    def _snapshot(self):
+        with self._lock:
+            return self._entries, self._postings
+
+    def _candidates(self, grams, entries, postings):
+        """Aday id'ler (artan sırada): en seyrek trigramın listesi; trigram yoksa tüm kayıtlar"""
+        if not grams:
+            return range(len(entries))
+        shortest = None
+        for gram in grams:
+            posting = postings.get(gram)
+            if posting is None:
+                return ()  # Bu trigramı içeren hiçbir ad yok
+            if shortest is None or len(posting) < len(shortest):
+                shortest = posting
+        return shortest
+
+    def _matching(self, grams, matches, files_only=False):
+        """Doğrulanmış (klasör, ad, sade ad, is_dir) kayıtları üret"""
+        entries, postings = self._snapshot()
+        for item_id in self._candidates(grams, entries, postings):
+            entry = entries[item_id]
+            if entry is None or (files_only and entry[3]) or not matches(entry[2]):
+                continue
+            yield entry
+
+    def _collect(self, grams, matches, max_results, files_only):
+        results = []
+        for entry in self._matching(grams, matches, files_only):
+            results.append(os.path.join(entry[0], entry[1]))
+            if len(results) >= max_results:
+                break
+        return results
+
+    def substring_entries(self, query):
+        """Adında query geçen tüm (klasör, ad, sade ad, is_dir) kayıtları (sıralama için)"""
+        query = fold_text(query)
+        return self._matching(_trigrams(query), lambda name: query in name)
+
+    def iter_entries(self):
+        """Tüm canlı (klasör, ad, sade ad, is_dir) kayıtları"""
+        entries, _ = self._snapshot()
+        return (entry for entry in entries if entry is not None)
+
+    def search_substring(self, query, max_results=20, files_only=False):
+        """Adında query geçen kayıtlar"""
+        query = fold_text(query)
+        return self._collect(_trigrams(query), lambda name: query in name, max_results, files_only)
+
+    def search_prefix(self, prefix, max_results=20, files_only=False):
+        """Adı prefix ile başlayan kayıtlar"""
+        prefix = fold_text(prefix)
+        return self._collect(_trigrams(_START + prefix), lambda name: name.startswith(prefix), max_results, files_only)
+
+    def search_pattern(self, pattern, max_results=20, files_only=True):
+        """fnmatch tarzı pattern ile eşleşen kayıtlar (büyük/küçük harf ve aksan duyarsız)"""
+        pattern = fold_text(pattern)
+        regex = re.compile(fnmatch.translate(pattern))
+
+        # Joker olmayan parçalardan trigram çıkar; baştaki/sondaki parça ada bağlıdır
+        parts = _WILDCARDS.split(pattern)
+        parts[0] = _START + parts[0]
+        parts[-1] = parts[-1] + _END
+        grams = set()
+        for part in parts:
+            grams |= _trigrams(part)
+        return self._collect(grams, regex.match, max_results, files_only)
+
+    def get_stats(self):
+        entries, postings = self._snapshot()
+        return {
+            'entries': len(entries) - self._dead,
+            'dead': self._dead,
+            'trigrams': len(postings),
+            'postings': sum(len(p) for p in postings.values()),
+        }
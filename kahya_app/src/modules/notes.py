@@ -0,0 +1,101 @@
+import os
+import re
+from datetime import datetime
+from src.core.database import Database
+
+# Eski not dosyası (eskiden çalışma dizinine göre açılırdı)
+LEGACY_NOTES_FILE = "kahya_notes.txt"
+
+# "2024-05-01 14:30: içerik" ya da "2024-05-01 14:30 - Pazartesi: içerik"
+_LEGACY_LINE = re.compile(r'^(\d{4}-\d{2}-\d{2} \d{2}:\d{2})(?: - ([^:]+))?: (.*)$')
+
+
+def parse_legacy_line(line):
+    """Eski dosya satırını (content, label, created_ts) kaydına çevir; boşsa None"""
+    line = line.strip()
+    if not line:
+        return None
+    match = _LEGACY_LINE.match(line)
+    if not match:
+        # Biçimi bozuk satır olduğu gibi, zamansız aktarılır
+        return (line, None, 0)
+    stamp, label, content = match.groups()
+    return (content, label, int(datetime.strptime(stamp, "%Y-%m-%d %H:%M").timestamp()))
+
+
+class NoteManager:
+    def __init__(self, db_path):
+        self.db = Database(db_path)
+        # Eski metin dosyası çalışma dizininde ya da proje kökünde olabilir
+        project_root = os.path.dirname(os.path.dirname(os.path.abspath(db_path)))
+        self.legacy_paths = [os.path.join(os.getcwd(), LEGACY_NOTES_FILE), os.path.join(project_root, LEGACY_NOTES_FILE)]
+        self.import_legacy_notes()
+
+    def import_legacy_notes(self):
+        """kahya_notes.txt içeriğini bir kez not tablosuna aktar; aktarılan not sayısını döndür
+
+        Aktarma ve işaretleme tek transaction'dadır; dosya sonra .imported
+        uzantısıyla yeniden adlandırılır (yeniden adlandırma başarısız olsa da
+        dosya ikinci kez aktarılmaz).
+        """
+        imported = 0
+        for path in dict.fromkeys(os.path.abspath(p) for p in self.legacy_paths):
+            if not os.path.isfile(path):
+                continue
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    notes = [note for note in map(parse_legacy_line, f) if note]
+                count = self.db.import_notes(path, notes).result()
+                if count is not None:
+                    imported += count
+                    print(f"{count} not {path} dosyasından aktarıldı")
+                os.replace(path, path + ".imported")
+            except Exception as e:
+                print(f"Not aktarma hatası: {e}")
+        return imported
+
+    def add_note(self, content, label=None):
+        """Not ekle"""
+        try:
+            self.db.add_note(content, label)
+            return True
+        except Exception as e:
+            print(f"Not ekleme hatası: {e}")
+            return False
+
+    def get_recent_notes(self, limit=20):
+        """En yeni notlar: (id, content, label, created_ts), yeniden eskiye"""
+        try:
+            return self.db.get_recent_notes(limit)
+        except Exception as e:
+            print(f"Not getirme hatası: {e}")
+            return []
+
+    def delete_note(self, note_id):
+        """Not sil"""
+        try:
+            self.db.delete_note(note_id)
+            return True
+        except Exception as e:
+            print(f"Not silme hatası: {e}")
+            return False
+
+    def get_version(self):
+        """(değişiklik sayacı, not sayısı); sayaç değişmediyse liste de değişmemiştir"""
+        try:
+            return self.db.get_change_counter('notes')
+        except Exception as e:
+            print(f"Not sayacı hatası: {e}")
+            return (0, 0)
+
+    def get_note_count(self):
+        return self.get_version()[1]
+
+    @staticmethod
+    def format_note(note):
+        """Notu eski dosyadaki satır biçiminde göster"""
+        _, content, label, created_ts = note
+        if not created_ts:
+            return content
+        stamp = datetime.fromtimestamp(created_ts).strftime("%Y-%m-%d %H:%M")
+        return f"{stamp} - {label}: {content}" if label else f"{stamp}: {content}"
@@ -0,0 +1,203 @@
+import calendar
+import threading
+from collections import OrderedDict, namedtuple
+from datetime import datetime, timedelta
+
+# Desteklenen RRULE alt kümesi: FREQ, INTERVAL, BYDAY (yalnızca haftalık), BYMONTHDAY, COUNT, UNTIL
+FREQUENCIES = ('DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY')
+WEEKDAYS = ('MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU')
+WEEKDAY_NAMES = ('pazartesi', 'salı', 'çarşamba', 'perşembe', 'cuma', 'cumartesi', 'pazar')
+
+# Hiç oluşmayan kurallarda (ör. her yıl 30 Şubat) bu kadar dönemden sonra aramayı bırak
+MAX_PERIODS = 5000
+
+Rule = namedtuple('Rule', ['freq', 'interval', 'byday', 'bymonthday', 'count', 'until'])
+
+
+def parse_rule(text):
+    """'FREQ=WEEKLY;BYDAY=MO,WE' biçimindeki kuralı Rule'a çevir (hatalıysa ValueError)"""
+    parts = {}
+    for part in text.upper().replace('RRULE:', '').split(';'):
+        if part.strip():
+            key, _, value = part.partition('=')
+            parts[key.strip()] = value.strip()
+
+    freq = parts.get('FREQ')
+    if freq not in FREQUENCIES:
+        raise ValueError(f"Desteklenmeyen tekrar sıklığı: {freq}")
+    interval = int(parts.get('INTERVAL', 1))
+    if interval < 1:
+        raise ValueError("INTERVAL en az 1 olmalı")
+
+    byday = ()
+    if parts.get('BYDAY'):
+        if freq != 'WEEKLY':
+            raise ValueError("BYDAY yalnızca haftalık kurallarda destekleniyor")
+        byday = tuple(sorted({WEEKDAYS.index(day) for day in parts['BYDAY'].split(',')}))
+    bymonthday = ()
+    if parts.get('BYMONTHDAY'):
+        if freq != 'MONTHLY':
+            raise ValueError("BYMONTHDAY yalnızca aylık kurallarda destekleniyor")
+        bymonthday = tuple(sorted({int(day) for day in parts['BYMONTHDAY'].split(',')}))
+        if any(not 1 <= day <= 31 for day in bymonthday):
+            raise ValueError("BYMONTHDAY 1-31 arasında olmalı")
+
+    count = int(parts['COUNT']) if parts.get('COUNT') else None
+    until = datetime.strptime(parts['UNTIL'][:15], '%Y%m%dT%H%M%S') if parts.get('UNTIL') else None
+    return Rule(freq, interval, byday, bymonthday, count, until)
+
+
+def format_rule(rule):
+    """Rule'u saklanacak RRULE metnine çevir"""
+    parts = [f"FREQ={rule.freq}"]
+    if rule.interval != 1:
+        parts.append(f"INTERVAL={rule.interval}")
+    if rule.byday:
+        parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in rule.byday))
+    if rule.bymonthday:
+        parts.append("BYMONTHDAY=" + ",".join(str(day) for day in rule.bymonthday))
+    if rule.count:
+        parts.append(f"COUNT={rule.count}")
+    if rule.until:
+        parts.append("UNTIL=" + rule.until.strftime('%Y%m%dT%H%M%S'))
+    return ";".join(parts)
+
+
+def describe_rule(rule):
+    """Kullanıcıya gösterilecek kısa açıklama ('her pazartesi', 'her ayın 15'i' ...)"""
+    every = "her" if rule.interval == 1 else f"her {rule.interval}"
+    if rule.freq == 'DAILY':
+        return "her gün" if rule.interval == 1 else f"{rule.interval} günde bir"
+    if rule.freq == 'WEEKLY':
+        days = ", ".join(WEEKDAY_NAMES[day] for day in rule.byday) if rule.byday else "hafta"
+        if rule.byday == (0, 1, 2, 3, 4):
+            days = "hafta içi"
+        return f"{every} {days}" if rule.interval == 1 else f"{rule.interval} haftada bir {days}"
+    if rule.freq == 'MONTHLY':
+        days = ", ".join(str(day) for day in rule.bymonthday) if rule.bymonthday else ""
+        base = "her ay" if rule.interval == 1 else f"{rule.interval} ayda bir"
+        return f"{base} {days}. gün" if days else base
+    return "her yıl" if rule.interval == 1 else f"{rule.interval} yılda bir"
+
+
+def _add_months(year, month, months):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def _period_occurrences(start, rule, period):
+    """period'uncu dönemin (sıralı) tekrar zamanları; start'tan öncekiler dahil"""
+    at = start.time()
+    if rule.freq == 'DAILY':
+        return [start + timedelta(days=period * rule.interval)]
+    if rule.freq == 'WEEKLY':
+        monday = start.date() - timedelta(days=start.weekday()) + timedelta(weeks=period * rule.interval)
+        days = rule.byday or (start.weekday(),)
+        return [datetime.combine(monday + timedelta(days=day), at) for day in days]
+    if rule.freq == 'MONTHLY':
+        year, month = _add_months(start.year, start.month, period * rule.interval)
+        last_day = calendar.monthrange(year, month)[1]
+        days = rule.bymonthday or (start.day,)
+        # Ayda olmayan günler (ör. 31 Nisan) atlanır
+        return [datetime.combine(datetime(year, month, day).date(), at) for day in days if day <= last_day]
+    year = start.year + period * rule.interval
+    if start.month == 2 and start.day == 29 and not calendar.isleap(year):
+        return []
+    return [start.replace(year=year)]
+
+
+def _first_period(start, rule, moment):
+    """moment'tan önce bitmiş dönemleri atla: moment'ı içerebilecek ilk dönem numarası"""
+    if moment <= start:
+        return 0
+    if rule.freq == 'DAILY':
+        return (moment - start).days // rule.interval
+    if rule.freq == 'WEEKLY':
+        start_monday = start.date() - timedelta(days=start.weekday())
+        return ((moment.date() - start_monday).days // 7) // rule.interval
+    if rule.freq == 'MONTHLY':
+        months = (moment.year - start.year) * 12 + (moment.month - start.month)
+        return months // rule.interval
+    return (moment.year - start.year) // rule.interval
+
+
+def occurrences(start, rule, window_start, window_end):
+    """[window_start, window_end) aralığındaki tekrar zamanlarını sırayla üret
+
+    Pencereden önceki dönemler hesapla atlanır; yalnızca pencereye düşen dönemler
+    açılır. COUNT'lu kurallarda sayım başlangıçtan yapılmak zorunda olduğundan
+    kayıt sırasında COUNT, series_end ile UNTIL'e çevrilmelidir.
+    """
+    if rule.count:
+        period = 0
+        produced = 0
+    else:
+        period = _first_period(start, rule, window_start)
+        produced = None
+
+    empty_periods = 0
+    while empty_periods < MAX_PERIODS:
+        times = _period_occurrences(start, rule, period)
+        period += 1
+        empty_periods = 0 if times else empty_periods + 1
+        for moment in times:
+            if moment < start:
+                continue
+            if produced is not None:
+                produced += 1
+                if produced > rule.count:
+                    return
+            if (rule.until and moment > rule.until) or moment >= window_end:
+                return
+            if moment >= window_start:
+                yield moment
+
+
+def next_occurrence(start, rule, after):
+    """after'dan sonraki ilk tekrar zamanı; seri bittiyse None"""
+    return next(occurrences(start, rule, after + timedelta(seconds=1), datetime.max), None)
+
+
+def series_end(start, rule):
+    """Serinin son tekrar zamanı (COUNT ya da UNTIL ile sınırlıysa), sonsuzsa None"""
+    if rule.count:
+        last = None
+        for last in occurrences(start, rule, start, datetime.max):
+            pass
+        return last
+    return rule.until
+
+
+class OccurrenceCache:
+    """Seri ve pencere başına açılmış tekrar zamanları için küçük LRU önbellek
+
+    Anahtar seri id'si ile birlikte kuralı ve başlangıcı da içerir; seri
+    düzenlenince eski girdiler kendiliğinden kullanılmaz hale gelir.
+    """
+
+    def __init__(self, max_size=512):
+        self.max_size = max_size
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, series_id, rule_text, start, window_start, window_end):
+        key = (series_id, rule_text, start, window_start, window_end)
+        with self._lock:
+            cached = self._items.get(key)
+            if cached is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return cached
+        result = tuple(occurrences(start, parse_rule(rule_text), window_start, window_end))
+        with self._lock:
+            self.misses += 1
+            self._items[key] = result
+            if len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
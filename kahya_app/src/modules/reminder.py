@@ -1,9 +1,18 @@
+import calendar
 from datetime import datetime, timedelta
 from src.core.database import Database
+from src.core.migrations import to_timestamp
+from src.modules.recurrence import OccurrenceCache, format_rule, next_occurrence, occurrences, parse_rule, series_end
+from src.modules.reminder_scheduler import ReminderScheduler
+
+# Açılmış tekrarlar kural + başlangıç + pencereye bağlıdır; tüm yöneticiler paylaşır
+_occurrence_cache = OccurrenceCache()
 
 class ReminderManager:
     def __init__(self, db_path):
         self.db = Database(db_path)
+        # Vakti gelen hatırlatıcıları tetikleyen paylaşılan zamanlayıcı
+        self.scheduler = ReminderScheduler.shared(db_path)
         
     def add_reminder(self, title, message, hour, minute, date=None):
         """Hatırlatıcı ekle"""
@@ -17,12 +26,53 @@ class ReminderManager:
             if reminder_time < datetime.now():
                 reminder_time += timedelta(days=1)
                 
-            self.db.add_reminder(title, message, reminder_time)
+            reminder_ts = to_timestamp(reminder_time)
+            # Satır commit edilince (id belli olunca) zamanlayıcıya eklenir
+            self.db.add_reminder(
+                title, message, reminder_time,
+                callback=lambda future: self._schedule_added(future, reminder_ts, title, message)
+            )
             return True
         except Exception as e:
             print(f"Hatırlatıcı ekleme hatası: {e}")
             return False
             
+    def add_recurring_reminder(self, title, message, rule, hour, minute, start_date=None):
+        """Tekrarlayan hatırlatıcı ekle; ilk tekrarın zamanını (ya da None) döndür
+
+        rule: Rule ya da RRULE metni ('FREQ=WEEKLY;BYDAY=MO'). Seri tek satır olarak
+        saklanır, tekrarlar yalnızca sorgulanan aralık için açılır.
+        """
+        try:
+            if isinstance(rule, str):
+                rule = parse_rule(rule)
+            if start_date is None:
+                start_date = datetime.now().date()
+            anchor = datetime.combine(start_date, datetime.min.time().replace(hour=hour, minute=minute))
+
+            # Seri şimdiden sonraki ilk tekrarından başlar
+            first = next(occurrences(anchor, rule, max(anchor, datetime.now()), datetime.max), None)
+            if first is None:
+                return None
+            if rule.count:
+                # COUNT bitiş zamanına çevrilir; aralık sorguları seriyi baştan saymaz
+                rule = rule._replace(count=None, until=series_end(first, rule))
+
+            recurrence = format_rule(rule)
+            reminder_ts = to_timestamp(first)
+            self.db.add_reminder(
+                title, message, first, recurrence=recurrence, until=rule.until,
+                callback=lambda future: self._schedule_added(future, reminder_ts, title, message, recurrence)
+            )
+            return first
+        except Exception as e:
+            print(f"Tekrarlayan hatırlatıcı ekleme hatası: {e}")
+            return None
+
+    def _schedule_added(self, future, reminder_ts, title, message, recurrence=None):
+        if future.exception() is None:
+            self.scheduler.schedule(future.result(), reminder_ts, title, message, recurrence)
+            
     def get_reminders(self, triggered=None):
         """Hatırlatıcıları getir"""
         try:
@@ -35,7 +85,7 @@ class ReminderManager:
         """Tüm hatırlatıcıları getir (takvim için)"""
         try:
             reminders = self.db.execute_query(
-                "SELECT * FROM reminders ORDER BY reminder_time"
+                "SELECT * FROM reminders ORDER BY reminder_ts"
             )
             # Takvim için uygun format
             formatted_reminders = []
@@ -53,6 +103,54 @@ class ReminderManager:
             print(f"Tüm hatırlatıcı getirme hatası: {e}")
             return []
             
+    def get_occurrences(self, start, end):
+        """[start, end) aralığındaki hatırlatıcılar; seriler yalnızca bu aralık için açılır
+
+        Her kayıt takvimdeki biçimdedir (id, title, message, date, time, triggered,
+        recurring); zamana göre sıralı döner.
+        """
+        try:
+            rows = self.db.get_reminders_in_window(to_timestamp(start), to_timestamp(end))
+        except Exception as e:
+            print(f"Hatırlatıcı aralık getirme hatası: {e}")
+            return []
+
+        result = []
+        for reminder_id, title, message, reminder_ts, triggered, recurrence, until_ts, last_fired_ts in rows:
+            if not recurrence:
+                moment = datetime.fromtimestamp(reminder_ts)
+                result.append(self._occurrence(reminder_id, title, message, moment, bool(triggered), False))
+                continue
+            try:
+                moments = _occurrence_cache.get(
+                    reminder_id, recurrence, datetime.fromtimestamp(reminder_ts), start, end
+                )
+            except ValueError as e:
+                print(f"Hatırlatıcı tekrar kuralı hatası ({reminder_id}): {e}")
+                continue
+            for moment in moments:
+                fired = last_fired_ts is not None and to_timestamp(moment) <= last_fired_ts
+                result.append(self._occurrence(reminder_id, title, message, moment, fired, True))
+        result.sort(key=lambda item: (item['date'], item['time']))
+        return result
+
+    def _occurrence(self, reminder_id, title, message, moment, triggered, recurring):
+        return {
+            'id': reminder_id,
+            'title': title,
+            'message': message,
+            'date': moment.date(),
+            'time': moment.time(),
+            'triggered': triggered,
+            'recurring': recurring,
+        }
+
+    def get_month_reminders(self, year, month):
+        """Bir ayın hatırlatıcıları (takvim için; seriler bu ay için açılır)"""
+        start = datetime(year, month, 1)
+        end = start + timedelta(days=calendar.monthrange(year, month)[1])
+        return self.get_occurrences(start, end)
+
     def get_active_reminders(self):
         """Aktif hatırlatıcıları getir"""
         return self.get_reminders(triggered=False)
@@ -62,21 +160,18 @@ class ReminderManager:
         return self.get_reminders(triggered=True)
         
     def get_upcoming_reminders(self, hours=24):
-        """Yaklaşan hatırlatıcıları getir"""
-        try:
-            future_time = datetime.now() + timedelta(hours=hours)
-            return self.db.execute_query(
-                "SELECT * FROM reminders WHERE reminder_time <= ? AND triggered = 0 ORDER BY reminder_time",
-                (future_time,)
-            )
-        except Exception as e:
-            print(f"Yaklaşan hatırlatıcı getirme hatası: {e}")
-            return []
+        """Önümüzdeki saatlerde tetiklenecek hatırlatıcılar (serilerin tekrarları dahil)"""
+        # Pencere dakikaya yuvarlanır; aynı dakikadaki sorgular önbellekten karşılanır
+        now = datetime.now().replace(second=0, microsecond=0)
+        return [
+            item for item in self.get_occurrences(now, now + timedelta(hours=hours))
+            if not item['triggered']
+        ]
             
     def trigger_reminder(self, reminder_id):
         """Hatırlatıcıyı tetikle"""
         try:
-            self.db.update_reminder(reminder_id, triggered=True)
+            self.update_reminder(reminder_id, triggered=True)
             return True
         except Exception as e:
             print(f"Hatırlatıcı tetikleme hatası: {e}")
@@ -85,7 +180,7 @@ class ReminderManager:
     def untrigger_reminder(self, reminder_id):
         """Hatırlatıcıyı tetiklenmemiş yap"""
         try:
-            self.db.update_reminder(reminder_id, triggered=False)
+            self.update_reminder(reminder_id, triggered=False)
             return True
         except Exception as e:
             print(f"Hatırlatıcı geri alma hatası: {e}")
@@ -94,7 +189,7 @@ class ReminderManager:
     def update_reminder(self, reminder_id, **kwargs):
         """Hatırlatıcı güncelle"""
         try:
-            self.db.update_reminder(reminder_id, **kwargs)
+            self.db.update_reminder(reminder_id, callback=lambda _: self.scheduler.refresh(reminder_id), **kwargs)
             return True
         except Exception as e:
             print(f"Hatırlatıcı güncelleme hatası: {e}")
@@ -103,6 +198,7 @@ class ReminderManager:
     def delete_reminder(self, reminder_id):
         """Hatırlatıcı sil"""
         try:
+            self.scheduler.unschedule(reminder_id)
             self.db.delete_reminder(reminder_id)
             return True
         except Exception as e:
@@ -123,14 +219,26 @@ class ReminderManager:
         try:
             now = datetime.now()
             due_reminders = self.db.execute_query(
-                "SELECT * FROM reminders WHERE reminder_time <= ? AND triggered = 0",
-                (now,)
+                "SELECT * FROM reminders WHERE triggered = 0 AND reminder_ts <= ?",
+                (to_timestamp(now),)
             )
-            return due_reminders
+            # Serilerde yalnızca son tetiklenenden sonraki tekrarın vakti gelmişse
+            return [reminder for reminder in due_reminders if self._series_due(reminder, now)]
         except Exception as e:
             print(f"Vadesi gelen hatırlatıcı kontrol hatası: {e}")
             return []
             
+    def _series_due(self, reminder, now):
+        recurrence, last_fired_ts = reminder[7], reminder[9]
+        if not recurrence or last_fired_ts is None:
+            return True
+        try:
+            start = datetime.fromtimestamp(reminder[6])
+            nxt = next_occurrence(start, parse_rule(recurrence), datetime.fromtimestamp(last_fired_ts))
+        except ValueError:
+            return False
+        return nxt is not None and nxt <= now
+
     def get_reminder_stats(self):
         """Hatırlatıcı istatistiklerini getir"""
         try:
@@ -152,7 +260,7 @@ class ReminderManager:
         """Hatırlatıcı ara"""
         try:
             return self.db.execute_query(
-                "SELECT * FROM reminders WHERE title LIKE ? OR message LIKE ? ORDER BY reminder_time",
+                "SELECT * FROM reminders WHERE title LIKE ? OR message LIKE ? ORDER BY reminder_ts",
                 (f"%{query}%", f"%{query}%")
             )
         except Exception as e:
@@ -0,0 +1,241 @@
+import heapq
+import os
+import threading
+import time
+from datetime import datetime
+from PyQt5.QtCore import QObject, pyqtSignal
+from src.core.database import Database
+from src.modules.recurrence import next_occurrence, parse_rule
+
+class ReminderScheduler(QObject):
+    """Bekleyen hatırlatıcıları min-heap'te tutup vaktinde tetikleyen zamanlayıcı
+
+    Heap (reminder_ts, id) çiftlerinden oluşur; tek bir arka plan thread'i yalnızca
+    en yakın hatırlatıcının vaktine kadar uyur. Ekleme, silme ve güncelleme heap'i
+    değiştirip thread'i uyandırır, böylece bekleme süresi yeniden hesaplanır;
+    tabloyu periyodik olarak taramaya gerek kalmaz. Silinen ya da zamanı değişen
+    kayıtlar heap'ten hemen çıkarılmaz, sırası geldiğinde atlanır.
+
+    Tekrarlayan serilerin heap'te yalnızca sıradaki tekrarı bulunur; tetiklenince
+    kuraldan bir sonraki tekrar hesaplanıp yeniden eklenir. Uygulama kapalıyken
+    kaçırılan tekrarlar için tek bir hatırlatma yapılır. Açılışta vakti
+    MISSED_GRACE'ten daha önce geçmiş tek seferlik hatırlatıcılar bildirim
+    gösterilmeden tetiklenmiş sayılır (eski sürüm hiçbirini tetiklenmiş olarak
+    işaretlemiyordu; hepsi birden açılmasın).
+
+    Aynı veritabanını kullanan tüm ReminderManager'lar tek zamanlayıcıyı paylaşır
+    (ReminderScheduler.shared).
+    """
+    reminder_due = pyqtSignal(int, str, str)  # id, başlık, mesaj
+    reminders_changed = pyqtSignal()
+
+    # Bilgisayar uykudan uyanınca ya da saat değişince en geç bu kadar saniyede fark edilir
+    MAX_SLEEP = 300
+    # Açılışta bu kadar saniyeden eski kaçırılmış tek seferlik hatırlatıcılar gösterilmez
+    MISSED_GRACE = 15 * 60
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, db_path):
+        """Bu veritabanı için paylaşılan (ve başlatılmış) zamanlayıcı"""
+        key = os.path.abspath(db_path)
+        with cls._instances_lock:
+            scheduler = cls._instances.get(key)
+            if scheduler is None:
+                scheduler = cls(db_path)
+                scheduler.start()
+                cls._instances[key] = scheduler
+            return scheduler
+
+    def __init__(self, db_path):
+        super().__init__()
+        self.db = Database(db_path)
+        self._heap = []  # (reminder_ts, id)
+        self._pending = {}  # id -> (reminder_ts, başlık, mesaj, seri)
+        self._cond = threading.Condition()
+        self._running = False
+        self._thread = None
+        self.fired = 0
+        self.missed = 0
+
+    def start(self):
+        """Bekleyen hatırlatıcıları yükle ve zamanlayıcı thread'ini başlat"""
+        if self._running:
+            return
+        try:
+            rows = self.db.get_pending_reminders()
+        except Exception as e:
+            print(f"Hatırlatıcı zamanlayıcı yükleme hatası: {e}")
+            rows = []
+        pending = {}
+        missed = []
+        cutoff = time.time() - self.MISSED_GRACE
+        for row in rows:
+            item = self._pending_item(*row)
+            if item is None:
+                continue
+            if item[3] is None and item[0] < cutoff:
+                missed.append(row[0])
+            else:
+                pending[row[0]] = item
+        if missed:
+            try:
+                self.db.mark_reminders_triggered(missed)
+                self.missed = len(missed)
+            except Exception as e:
+                print(f"Kaçırılmış hatırlatıcı işaretleme hatası: {e}")
+        with self._cond:
+            self._pending = pending
+            self._heap = [(item[0], rid) for rid, item in self._pending.items()]
+            heapq.heapify(self._heap)
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name="kahya-reminders", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=1)
+
+    def _pending_item(self, reminder_id, title, message, reminder_ts, recurrence=None, until_ts=None, last_fired_ts=None):
+        """Veritabanı satırından heap kaydı: (sıradaki zaman, başlık, mesaj, seri) ya da None
+
+        seri, tekrarlayan hatırlatıcılarda (başlangıç, kural), tek seferliklerde None'dır.
+        """
+        if reminder_ts is None:
+            return None
+        if not recurrence:
+            return (reminder_ts, title or "", message or "", None)
+        try:
+            series = (datetime.fromtimestamp(reminder_ts), parse_rule(recurrence))
+        except ValueError as e:
+            print(f"Hatırlatıcı tekrar kuralı hatası ({reminder_id}): {e}")
+            return None
+        if last_fired_ts is None:
+            # Hiç tetiklenmemiş seri ilk tekrarından başlar
+            due = reminder_ts
+        else:
+            nxt = next_occurrence(series[0], series[1], datetime.fromtimestamp(last_fired_ts))
+            if nxt is None:
+                return None
+            due = int(nxt.timestamp())
+        return (due, title or "", message or "", series)
+
+    # Heap güncellemeleri
+    def schedule(self, reminder_id, reminder_ts, title, message, recurrence=None, until_ts=None, last_fired_ts=None):
+        """Hatırlatıcıyı ekle ya da zamanını güncelle (recurrence: RRULE metni)"""
+        item = self._pending_item(reminder_id, title, message, reminder_ts, recurrence, until_ts, last_fired_ts)
+        if item is None:
+            self.unschedule(reminder_id)
+            return
+        reminder_ts = item[0]
+        with self._cond:
+            self._pending[reminder_id] = item
+            heapq.heappush(self._heap, (reminder_ts, reminder_id))
+            self._compact_locked()
+            # Yalnızca en yakın hatırlatıcı değiştiyse bekleme süresi kısalır
+            if self._heap[0] == (reminder_ts, reminder_id):
+                self._cond.notify()
+        self.reminders_changed.emit()
+
+    def unschedule(self, reminder_id):
+        """Hatırlatıcıyı zamanlayıcıdan çıkar (heap'teki kaydı sırası gelince atlanır)"""
+        with self._cond:
+            removed = self._pending.pop(reminder_id, None) is not None
+            if removed:
+                self._cond.notify()
+        if removed:
+            self.reminders_changed.emit()
+        return removed
+
+    def refresh(self, reminder_id):
+        """Hatırlatıcıyı veritabanındaki haline göre yeniden planla"""
+        try:
+            rows = self.db.get_pending_reminders(reminder_id)
+        except Exception as e:
+            print(f"Hatırlatıcı zamanlayıcı hatası: {e}")
+            return
+        if rows:
+            self.schedule(*rows[0])
+        else:
+            self.unschedule(reminder_id)
+
+    def _compact_locked(self):
+        """Atlanacak kayıtlar çoğalınca heap'i yeniden kur"""
+        if len(self._heap) > 2 * len(self._pending) + 64:
+            self._heap = [(item[0], rid) for rid, item in self._pending.items()]
+            heapq.heapify(self._heap)
+
+    def _is_current(self, entry):
+        item = self._pending.get(entry[1])
+        return item is not None and item[0] == entry[0]
+
+    def next_due(self):
+        """(reminder_ts, id) ya da None"""
+        with self._cond:
+            self._drop_stale_locked()
+            return self._heap[0] if self._heap else None
+
+    def _drop_stale_locked(self):
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    def pending_count(self):
+        return len(self._pending)
+
+    # Zamanlayıcı thread'i
+    def _run(self):
+        while True:
+            due = []
+            with self._cond:
+                while self._running and not due:
+                    self._drop_stale_locked()
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - time.time()
+                    if delay > 0:
+                        self._cond.wait(min(delay, self.MAX_SLEEP))
+                        continue
+                    # Vakti gelen (aynı saniyedeki) tüm hatırlatıcılar birlikte tetiklenir
+                    now = time.time()
+                    while self._heap and self._heap[0][0] <= now:
+                        entry = heapq.heappop(self._heap)
+                        if self._is_current(entry):
+                            due.append(self._pop_due_locked(entry, now))
+                if not self._running:
+                    return
+            for item in due:
+                self._fire(*item)
+            self.reminders_changed.emit()
+
+    def _pop_due_locked(self, entry, now):
+        """Vakti gelen kaydı çıkar; seriyse sıradaki tekrarını planla"""
+        reminder_ts, reminder_id = entry
+        _, title, message, series = self._pending.pop(reminder_id)
+        if series is None:
+            return reminder_id, title, message, None, True
+
+        # Kaçırılmış tekrarlar atlanır: sıradaki tekrar şimdiden sonraki ilk tekrardır
+        nxt = next_occurrence(series[0], series[1], datetime.fromtimestamp(max(reminder_ts, now)))
+        if nxt is not None:
+            nxt_ts = int(nxt.timestamp())
+            self._pending[reminder_id] = (nxt_ts, title, message, series)
+            heapq.heappush(self._heap, (nxt_ts, reminder_id))
+        return reminder_id, title, message, reminder_ts, nxt is None
+
+    def _fire(self, reminder_id, title, message, fired_ts, finished):
+        """fired_ts: serilerde tetiklenen tekrarın zamanı; finished: seri bitti mi"""
+        try:
+            if fired_ts is not None:
+                self.db.update_reminder(reminder_id, last_fired_ts=fired_ts, triggered=finished)
+            else:
+                self.db.update_reminder(reminder_id, triggered=True)
+        except Exception as e:
+            print(f"Hatırlatıcı tetikleme hatası: {e}")
+        self.fired += 1
+        self.reminder_due.emit(reminder_id, title, message)
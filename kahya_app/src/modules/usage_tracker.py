@@ -1,24 +1,33 @@
-import psutil
-import time
+import os
 import threading
+import time
 from datetime import datetime, timedelta
 from PyQt5.QtCore import QObject, pyqtSignal
 from src.core.database import Database
+from src.core.usage_buffer import UsageBuffer
+from src.modules.active_window import create_backend
 
 class UsageTracker(QObject):
     app_changed = pyqtSignal(str, str)  # eski_app, yeni_app
     insight_ready = pyqtSignal(str)  # insight mesajı
 
-    def __init__(self, db_path):
+    def __init__(self, db_path, backend='auto', journal_path=None):
         super().__init__()
         self.db = Database(db_path)
+        # Oturumlar günlüğe yazılıp dakikada bir toplu olarak veritabanına işlenir
+        self.usage_buffer = UsageBuffer(
+            self.db, journal_path or os.path.join(os.path.dirname(db_path), 'usage_journal.log')
+        )
         self.current_app = None
         self.app_start_time = None
         self.is_running = False
-        self.tracking_thread = None
+        
+        # Odak değişikliklerini bildiren kaynak (ad ya da ActiveWindowBackend örneği)
+        self.backend_name = backend
+        self.backend = None
+        self._lock = threading.Lock()
         
         # İstatistik ayarları
-        self.check_interval = 2  # saniye
         self.insight_threshold = 30  # dakika
         
     def start_tracking(self):
@@ -27,71 +36,56 @@ class UsageTracker(QObject):
             return
             
         self.is_running = True
-        self.tracking_thread = threading.Thread(target=self._track_usage, daemon=True)
-        self.tracking_thread.start()
-        print("Kullanım takibi başlatıldı")
+        # Eski kullanım kovalarını temizle (arka planda yazılır)
+        self.db.prune_usage()
+        try:
+            if self.backend is None:
+                self.backend = (
+                    create_backend(self.backend_name) if isinstance(self.backend_name, str) else self.backend_name
+                )
+            self.backend.start(self._on_app_changed)
+            print(f"Kullanım takibi başlatıldı ({self.backend.name})")
+        except Exception as e:
+            print(f"Kullanım takibi hatası: {e}")
         
     def stop_tracking(self):
         """Kullanım takibini durdur"""
+        if not self.is_running:
+            return
         self.is_running = False
-        if self.tracking_thread:
-            self.tracking_thread.join(timeout=1)
+        if self.backend:
+            self.backend.stop()
+            # Ada göre kurulan kaynak bir sonraki başlatmada yeniden oluşturulur
+            if isinstance(self.backend_name, str):
+                self.backend = None
         print("Kullanım takibi durduruldu")
         
-    def _track_usage(self):
-        """Arka planda kullanım takibi yap"""
-        while self.is_running:
-            try:
-                current_app = self._get_active_application()
-
-                if current_app != self.current_app:
-                    # Uygulama değişti
-                    if self.current_app and self.app_start_time:
-                        duration = int((datetime.now() - self.app_start_time).total_seconds())
-                        self._log_app_usage(self.current_app, duration)
-
-                    # Yeni uygulamayı başlat
-                    self.current_app = current_app
-                    self.app_start_time = datetime.now()
+    def _on_app_changed(self, new_app):
+        """Kaynak odak değişikliği bildirdi (kaynağın thread'inden çağrılır)"""
+        if not self.is_running:
+            return
+        try:
+            with self._lock:
+                previous_app = self.current_app
+                if new_app == previous_app:
+                    return
+                # Önceki uygulamanın oturumunu kapat
+                if previous_app and self.app_start_time:
+                    duration = int((datetime.now() - self.app_start_time).total_seconds())
+                    self._log_app_usage(previous_app, duration)
 
-                    # Sinyal gönder
-                    if self.current_app:
-                        self.app_changed.emit(self.current_app, current_app)
+                self.current_app = new_app
+                self.app_start_time = datetime.now() if new_app else None
 
-                time.sleep(self.check_interval)
-            except Exception as e:
-                print(f"Kullanım takibi hatası: {e}")
-                time.sleep(self.check_interval)
-                
-    def _get_active_application(self):
-        """Aktif uygulamayı al"""
-        try:
-            # Windows için
-            import win32gui
-            import win32process
-            
-            hwnd = win32gui.GetForegroundWindow()
-            _, pid = win32process.GetWindowThreadProcessId(hwnd)
-            
-            if pid:
-                process = psutil.Process(pid)
-                return process.name()
-                
-        except ImportError:
-            # win32gui yoksa basit yöntem
-            try:
-                for proc in psutil.process_iter(['pid', 'name']):
-                    if proc.info['name']:
-                        return proc.info['name']
-            except:
-                pass
+            if new_app:
+                self.app_changed.emit(previous_app or "", new_app)
+        except Exception as e:
+            print(f"Kullanım takibi hatası: {e}")
                 
-        return "unknown"
-        
     def _log_app_usage(self, app_name, duration):
         """Uygulama kullanımını logla"""
         try:
-            self.db.log_app_usage(app_name, duration=duration)
+            self.usage_buffer.add(app_name, duration)
             
             # Uzun süreli kullanım için insight
             if duration > self.insight_threshold * 60:  # dakikayı saniyeye çevir
@@ -101,24 +95,53 @@ class UsageTracker(QObject):
         except Exception as e:
             print(f"Kullanım loglama hatası: {e}")
 
+    def _stats_with_pending(self, days=7, limit=None):
+        """Veritabanı toplamlarına tamponda bekleyen oturumları (commit beklemeden) ekle"""
+        # Tampon, veritabanından önce okunur: arada yazılıp tampondan çıkan oturum
+        # veritabanı okumasında görünür, sıra numarası sayesinde iki kez sayılmaz
+        pending = self.usage_buffer.snapshot()
+        rows, flushed_seq = self.db.get_app_usage_stats_with_seq(self.usage_buffer.journal_name, days)
+        totals = {app_name: [sessions, duration, last_used] for app_name, sessions, duration, last_used in rows}
+
+        since = time.time() - days * 86400
+        for seq, app_name, duration, ended_ts in pending:
+            if seq <= flushed_seq or ended_ts < since:
+                continue
+            entry = totals.setdefault(app_name, [0, 0, None])
+            entry[0] += 1
+            entry[1] += duration
+            last_used = datetime.fromtimestamp(int(ended_ts)).isoformat()
+            if entry[2] is None or last_used > entry[2]:
+                entry[2] = last_used
+
+        stats = sorted(((app_name, *entry) for app_name, entry in totals.items()), key=lambda row: row[2], reverse=True)
+        return stats if limit is None else stats[:limit]
+
     def get_usage_stats(self, days=7):
-        """Kullanım istatistiklerini getir"""
+        """Kullanım istatistiklerini getir (tamponda bekleyen oturumlar dahil)"""
         try:
-            return self.db.get_app_usage_stats(days)
+            return self._stats_with_pending(days)
         except Exception as e:
             print(f"İstatistik alma hatası: {e}")
             return []
             
     def get_top_apps(self, limit=5):
         """En çok kullanılan uygulamaları getir"""
-        stats = self.get_usage_stats()
-        return stats[:limit]
+        try:
+            return self._stats_with_pending(limit=limit)
+        except Exception as e:
+            print(f"İstatistik alma hatası: {e}")
+            return []
 
     def cleanup(self):
         """Temizlik işlemleri"""
         self.stop_tracking()
         
         # Mevcut uygulamayı logla
-        if self.current_app and self.app_start_time:
-            duration = int((datetime.now() - self.app_start_time).total_seconds())
-            self._log_app_usage(self.current_app, duration) 
\ No newline at end of file
+        with self._lock:
+            if self.current_app and self.app_start_time:
+                duration = int((datetime.now() - self.app_start_time).total_seconds())
+                self._log_app_usage(self.current_app, duration)
+            self.current_app = None
+            self.app_start_time = None
+        self.usage_buffer.close() 
\ No newline at end of file
@@ -0,0 +1,79 @@
+import threading
+from PyQt5.QtCore import QCoreApplication, QObject, Qt, pyqtSignal
+from src.core import changes
+from src.core.changes import NOTES, TODOS, REMINDERS, USAGE, WIDGET_CONFIG
+
+
+class ChangeBus(QObject):
+    """Veri değişikliklerini abonelere UI thread'inde bildiren süreç içi yayın kanalı
+
+    publish herhangi bir thread'den (ör. yazıcı thread'inde commit sonrası)
+    çağrılabilir. Konular bir kümede biriktirilir ve tek bir kuyruklu sinyal ile
+    nesnenin yaşadığı (ana) thread'e aktarılır; teslimattan önce aynı konu kaç
+    kez yayınlanmış olursa olsun aboneler bir kez çağrılır. Böylece widget'lar
+    depolamayı aralıkla sorgulamak yerine yalnızca gerçek değişiklikte yenilenir.
+    """
+    _posted = pyqtSignal()
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Süreç genelindeki tek kanal"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                # Veritabanı commit bildirimlerini UI thread'ine aktar
+                changes.add_listener(cls._instance.publish)
+            return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._subscribers = {}  # konu -> [callback]
+        self.stats = {'published': 0, 'deliveries': 0}
+
+        # Aboneler her zaman uygulamanın ana thread'inde çağrılır
+        app = QCoreApplication.instance()
+        if app is not None and self.thread() is not app.thread():
+            self.moveToThread(app.thread())
+        self._posted.connect(self._deliver, Qt.QueuedConnection)
+
+    def subscribe(self, topic, callback):
+        """callback() konu her değiştiğinde ana thread'de çağrılır"""
+        with self._lock:
+            callbacks = self._subscribers.setdefault(topic, [])
+            if callback not in callbacks:
+                callbacks.append(callback)
+
+    def unsubscribe(self, topic, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(topic, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+
+    def publish(self, topic):
+        """Konunun değiştiğini bildir (thread güvenli)"""
+        with self._lock:
+            self.stats['published'] += 1
+            if topic in self._pending or topic not in self._subscribers:
+                return
+            first = not self._pending
+            self._pending.add(topic)
+        # Teslimat bekleyen konu varsa sinyal zaten kuyrukta
+        if first:
+            self._posted.emit()
+
+    def _deliver(self):
+        with self._lock:
+            topics, self._pending = self._pending, set()
+            calls = [(topic, list(self._subscribers.get(topic, ()))) for topic in topics]
+        for topic, callbacks in calls:
+            for callback in callbacks:
+                self.stats['deliveries'] += 1
+                try:
+                    callback()
+                except Exception as e:
+                    print(f"Değişiklik bildirimi hatası ({topic}): {e}")
@@ -1,8 +1,10 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                              QPushButton, QFrame, QScrollArea, QGridLayout,
                              QSlider, QCheckBox, QComboBox, QGroupBox)
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPainter, QPen, QColor, QFont, QLinearGradient
+from src.ui.change_bus import ChangeBus, WIDGET_CONFIG
+from src.ui.retro_components.retro_frame import GlowOutline
 
 class ControlMenu(QWidget):
     """Gelişmiş kontrol menü widget'ı"""
@@ -44,13 +46,14 @@ class ControlMenu(QWidget):
             }
         """)
         
+        # Yuvarlak köşeli parıltı çerçevesi (daraltınca boyut değişir, yeniden çizilir)
+        self.glow_frame = GlowOutline(QColor(0, 255, 0))
+        
         # UI kurulumu
         self.setup_ui()
         
-        # Güncelleme zamanlayıcısı
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_widget_states)
-        self.update_timer.start(1000)  # Her saniye güncelle
+        # Widget görünürlüğü ya da yapılandırması değişince onay kutularını eşitle
+        ChangeBus.shared().subscribe(WIDGET_CONFIG, self.update_widget_states)
         
     def mousePressEvent(self, event):
         """Fare basma olayı"""
@@ -674,13 +677,5 @@ class ControlMenu(QWidget):
     def paintEvent(self, event):
         """Özel çizim"""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        
-        # Gölge efekti
-        painter.setPen(QPen(QColor(0, 255, 0, 80), 4))
-        painter.setBrush(QColor(0, 0, 0, 0))
-        painter.drawRoundedRect(self.rect().adjusted(4, 4, 4, 4), 18, 18)
-        
-        # İç gölge
-        painter.setPen(QPen(QColor(0, 255, 0, 30), 2))
-        painter.drawRoundedRect(self.rect().adjusted(2, 2, -2, -2), 16, 16) 
\ No newline at end of file
+        # Gölge ve iç gölge (boyut başına önbellekteki pixmap)
+        self.glow_frame.draw(painter, self) 
\ No newline at end of file
@@ -1,6 +1,7 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QMenu
 from PyQt5.QtCore import Qt, pyqtSignal, QPoint, QRect
 from PyQt5.QtGui import QMouseEvent, QPainter, QPen, QColor, QFont
+from src.ui.change_bus import ChangeBus, WIDGET_CONFIG
 
 class DraggableWidget(QWidget):
     """Sürüklenebilir widget sınıfı"""
@@ -162,9 +163,11 @@ class DraggableWidget(QWidget):
         
         # Widget yöneticiye bildir
         self.widget_toggled.emit(self.widget_name, self.is_visible)
+        ChangeBus.shared().publish(WIDGET_CONFIG)
         
     def set_visibility(self, visible):
         """Widget görünürlüğünü ayarla"""
+        changed = self.is_visible != visible
         self.is_visible = visible
         if self.is_visible:
             self.toggle_btn.setText("−")
@@ -172,6 +175,8 @@ class DraggableWidget(QWidget):
         else:
             self.toggle_btn.setText("+")
             self.hide()
+        if changed:
+            ChangeBus.shared().publish(WIDGET_CONFIG)
         
     def mousePressEvent(self, event: QMouseEvent):
         """Fare basma olayı"""
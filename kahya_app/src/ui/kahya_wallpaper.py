@@ -363,6 +363,10 @@ class KahyaWallpaper(QWidget):
         """Bildirim göster"""
         self.tray_icon.showMessage(title, message, QSystemTrayIcon.Information, 3000)
         
+    def show_reminder(self, reminder_id, title, message):
+        """Vakti gelen hatırlatıcıyı göster (zamanlayıcı sinyali, UI thread'inde çalışır)"""
+        self.show_notification(f"⏰ {title}", message if message != title else "Hatırlatıcı zamanı geldi")
+        
     def paintEvent(self, event):
         """Özel çizim - widget tarzında"""
         painter = QPainter(self)
@@ -478,6 +482,8 @@ class KahyaWallpaper(QWidget):
         # Bileşenleri temizle
         if hasattr(self, 'calendar'):
             self.calendar.cleanup()
+        if hasattr(self, 'notes'):
+            self.notes.cleanup()
         if hasattr(self, 'clock'):
             self.clock.cleanup()
         if hasattr(self, 'retro_chatbox'):
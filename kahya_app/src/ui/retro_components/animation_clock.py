@@ -0,0 +1,105 @@
+import time
+from PyQt5.QtCore import QObject, QTimer, Qt
+
+# Varsayılan kare aralığı (~60 Hz)
+FRAME_INTERVAL = 1 / 60
+# Uygulama uzun süre beklediyse (uyku, ekran kilidi) animasyonlar sıçramasın
+MAX_STEP = 0.25
+
+
+class _Animation:
+    __slots__ = ('widget', 'step', 'interval', 'last')
+
+    def __init__(self, widget, step, interval, now):
+        self.widget = widget
+        self.step = step
+        self.interval = interval
+        self.last = now
+
+
+class AnimationClock(QObject):
+    """Retro widget animasyonlarını tek zamanlayıcıdan süren ortak kare saati
+
+    Her animasyon step(dt) fonksiyonu ve istediği en kısa aralıkla kaydedilir;
+    saat, etkin animasyonların en kısasına göre tek bir zamanlayıcıyla atar ve
+    her vuruşta süresi gelen adımları geçen süreyle (saniye) çağırır. Adım
+    False döndürmedikçe widget'ı yeniden çizilecek olarak işaretler; bir vuruşta
+    aynı widget'ın kaç adımı çalışırsa çalışsın update() bir kez çağrılır.
+    Kayıtlı animasyon kalmayınca (ör. tüm widget'lar gizli) zamanlayıcı durur.
+    """
+
+    _instance = None
+
+    @classmethod
+    def shared(cls):
+        """Uygulama genelindeki tek saat (UI thread'inde kullanılır)"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self._animations = []
+        self._dirty = []
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.PreciseTimer)
+        self.timer.timeout.connect(self._tick)
+        self.stats = {'ticks': 0, 'steps': 0, 'repaints': 0}
+
+    def start(self, widget, step, interval=FRAME_INTERVAL):
+        """step(dt) fonksiyonunu en az interval saniyede bir çalıştır (zaten kayıtlıysa dokunma)"""
+        for animation in self._animations:
+            if animation.step == step:
+                return
+        self._animations.append(_Animation(widget, step, interval, time.monotonic()))
+        self._reschedule()
+
+    def stop(self, widget, step=None):
+        """Widget'ın (ya da yalnızca verilen adımın) animasyonunu durdur"""
+        self._animations = [a for a in self._animations
+                            if not (a.widget is widget and (step is None or a.step == step))]
+        self._reschedule()
+
+    def is_running(self, step):
+        return any(a.step == step for a in self._animations)
+
+    def request_update(self, widget):
+        """Widget'ı bir sonraki vuruşta (tek seferlik) yeniden çizdir"""
+        if widget not in self._dirty:
+            self._dirty.append(widget)
+        if not self.timer.isActive():
+            self.timer.start(int(FRAME_INTERVAL * 1000))
+
+    def _reschedule(self):
+        if not self._animations:
+            if not self._dirty:
+                self.timer.stop()
+            return
+        interval_ms = max(1, int(min(a.interval for a in self._animations) * 1000))
+        if not self.timer.isActive() or self.timer.interval() != interval_ms:
+            self.timer.start(interval_ms)
+
+    def _tick(self):
+        self.stats['ticks'] += 1
+        now = time.monotonic()
+        # Zamanlayıcı sapmasını tolere et: yarım vuruş erken gelen adım da çalışsın
+        slack = self.timer.interval() / 2000
+        dirty, self._dirty = self._dirty, []
+        for animation in list(self._animations):
+            elapsed = now - animation.last
+            if elapsed + slack < animation.interval:
+                continue
+            animation.last = now
+            self.stats['steps'] += 1
+            try:
+                changed = animation.step(min(elapsed, MAX_STEP))
+            except Exception as e:
+                print(f"Animasyon hatası: {e}")
+                continue
+            if changed is not False and animation.widget not in dirty:
+                dirty.append(animation.widget)
+
+        for widget in dirty:
+            self.stats['repaints'] += 1
+            widget.update()
+        self._reschedule()
@@ -1,8 +1,18 @@
 import random
 import math
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush
+from .retro_frame import RetroFrame
+from .animation_clock import AnimationClock
+
+# Animasyon adımı 50 ms; eski zamanlayıcıların kare başına değerleri saniyeye çevrildi
+FACE_INTERVAL = 0.05
+PARTICLE_FRAME = 0.05     # Partikül hızı ve ömrü bu süre başına
+MOUTH_SPEED = 0.08 / 0.06  # rad/sn
+BLINK_PERIOD = 4.0
+BLINK_DURATION = 0.12
+EYE_FOLLOW = 0.25         # Hedefe yaklaşma oranı (PARTICLE_FRAME başına)
 
 class KahyaFace(QWidget):
     def __init__(self, parent=None):
@@ -16,32 +26,25 @@ class KahyaFace(QWidget):
         self.eye_color = QColor(80, 255, 120)
         self.brow_color = QColor(80, 255, 120)
         self.face_color = QColor(40, 120, 60)
-        # Animasyon
+        # Pixel-art çerçeve
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.outline_color, margin=16,
+                                tick_offset=48, tick_length=10, line_inset=32)
+        # Animasyon (tüm adımlar ortak kare saatinde tek fonksiyonda)
         self.blink_state = 0
-        self.blink_timer = QTimer(self)
-        self.blink_timer.timeout.connect(self.blink)
-        self.blink_timer.start(4000)
+        self.blink_elapsed = 0.0
         self.eye_x = 0.0
         self.eye_y = 0.0
         self.eye_target_x = 0.0
         self.eye_target_y = 0.0
-        self.eye_move_timer = QTimer(self)
-        self.eye_move_timer.timeout.connect(self.move_eyes)
-        self.eye_move_timer.start(3000)
         self.expression = "neutral"
         # Partikül efekti (tamamen baştan)
         self.particles = []
         self.particle_count = 24
         for _ in range(self.particle_count):
             self.particles.append(self.spawn_particle())
-        self.particle_timer = QTimer(self)
-        self.particle_timer.timeout.connect(self.update_particles)
-        self.particle_timer.start(50)
         # Ağız animasyonu için
         self.mouth_anim = 0.0
-        self.mouth_timer = QTimer(self)
-        self.mouth_timer.timeout.connect(self.update_mouth)
-        self.mouth_timer.start(60)
+        self.animation_clock = AnimationClock.shared()
         # Mouse takibi
         self.setMouseTracking(True)
         
@@ -56,12 +59,27 @@ class KahyaFace(QWidget):
             'vy': random.uniform(-1.2, 1.2),
             'life': random.randint(60, 180)
         }
-    def update_particles(self):
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.animation_clock.start(self, self.animate, FACE_INTERVAL)
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.animation_clock.stop(self)
+    def animate(self, dt):
+        """Kare adımı: partiküller, göz kırpma, ağız ve göz takibi"""
+        frames = dt / PARTICLE_FRAME
+        self.update_particles(frames)
+        self.update_blink(dt)
+        self.mouth_anim = (self.mouth_anim + MOUTH_SPEED * dt) % (2 * math.pi)
+        follow = 1 - (1 - EYE_FOLLOW) ** frames
+        self.eye_x += (self.eye_target_x - self.eye_x) * follow
+        self.eye_y += (self.eye_target_y - self.eye_y) * follow
+    def update_particles(self, frames=1):
         w, h = self.width(), self.height()
         for p in self.particles:
-            p['x'] += p['vx']
-            p['y'] += p['vy']
-            p['life'] -= 1
+            p['x'] += p['vx'] * frames
+            p['y'] += p['vy'] * frames
+            p['life'] -= frames
             # Kenara çarpınca yön değiştir
             if p['x'] <= 2 or p['x'] >= w-6:
                 p['vx'] *= -1
@@ -73,19 +91,18 @@ class KahyaFace(QWidget):
             if p['life'] <= 0:
                 np = self.spawn_particle()
                 p['x'], p['y'], p['vx'], p['vy'], p['life'] = np['x'], np['y'], np['vx'], np['vy'], np['life']
-        self.update()
     def set_expression(self, expression):
         self.expression = expression
         self.update()
-    def blink(self):
-        self.blink_state = 1
-        QTimer.singleShot(120, lambda: setattr(self, 'blink_state', 0))
-        self.update()
-    def move_eyes(self):
-        pass
-    def update_mouth(self):
-        self.mouth_anim = (self.mouth_anim + 0.08) % (2 * math.pi)
-        self.update()
+    def update_blink(self, dt):
+        """BLINK_PERIOD'da bir BLINK_DURATION boyunca gözleri kapat"""
+        self.blink_elapsed += dt
+        if self.blink_state and self.blink_elapsed >= BLINK_DURATION:
+            self.blink_state = 0
+            self.blink_elapsed = 0.0
+        elif not self.blink_state and self.blink_elapsed >= BLINK_PERIOD:
+            self.blink_state = 1
+            self.blink_elapsed = 0.0
     def mouseMoveEvent(self, event):
         w, h = self.width(), self.height()
         
@@ -114,39 +131,12 @@ class KahyaFace(QWidget):
         # Ortalama hedef (her iki göz için)
         self.eye_target_x = max(-1, min(1, (left_mx + right_mx) / 2))
         self.eye_target_y = max(-0.7, min(0.7, (left_my + right_my) / 2))
-        
-        self.update()
     def paintEvent(self, event):
         painter = QPainter(self)
         painter.setRenderHint(QPainter.Antialiasing, False)
         w, h = self.width(), self.height()
-        # Arka plan (tamamen gridli)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.outline_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 16
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        # Köşe detayları
-        painter.setPen(QPen(self.outline_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.outline_color, 4))
-        painter.drawLine(margin-10, h//2-48, margin, h//2-48)
-        painter.drawLine(margin-10, h//2+48, margin, h//2+48)
-        painter.drawLine(w-margin+10, h//2-48, w-margin, h//2-48)
-        painter.drawLine(w-margin+10, h//2+48, w-margin, h//2+48)
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+32, margin-10, w-margin-32, margin-10)
-        painter.drawLine(margin+32, h-margin+10, w-margin-32, h-margin+10)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
         
         # Partiküller (tüm monitör componentinde)
         for p in self.particles:
@@ -216,10 +206,7 @@ class KahyaFace(QWidget):
             painter.drawLine(right_brow_x+15, brow_y-1, right_brow_x+30, brow_y-1)
             painter.drawLine(right_brow_x+30, brow_y-1, right_brow_x+brow_w, brow_y)
         
-        # Gözler (oval ve göz bebeği yok)
-        self.eye_x += (self.eye_target_x - self.eye_x) * 0.25
-        self.eye_y += (self.eye_target_y - self.eye_y) * 0.25
-        
+        # Gözler (oval ve göz bebeği yok; takip animate() içinde)
         # Sol göz - oval
         self.draw_oval_eye(painter, left_eye_x, eye_y, eye_w, eye_h, self.eye_x, self.eye_y)
         
@@ -255,10 +242,7 @@ class KahyaFace(QWidget):
                 y = mouth_y + 2 + anim - y_offset
                 painter.drawRect(x, y, 3, 3)
     def cleanup(self):
-        self.blink_timer.stop()
-        self.eye_move_timer.stop()
-        self.particle_timer.stop()
-        self.mouth_timer.stop() 
+        self.animation_clock.stop(self)
     def draw_oval_eye(self, painter, x, y, w, h, eye_x, eye_y):
         """Göz çiz (göz kapağı efekti ile)"""
         painter.setBrush(Qt.NoBrush)  # İçi boş
@@ -1,8 +1,48 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QGridLayout, QToolTip
 from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
 import calendar
+from src.ui.change_bus import ChangeBus, REMINDERS
+from .retro_frame import RetroFrame
+
+# Gün hücrelerinin ortak stili; hücre durumu dayState özelliğiyle seçilir
+DAY_CELL_STYLE = """
+    QLabel {
+        color: #50ff78;
+        font-family: 'Courier';
+        font-size: 10px;
+        background-color: #081410;
+        border: 1px solid #102010;
+        padding: 3px;
+    }
+    QLabel:hover {
+        background-color: #102010;
+        border: 1px solid #50ff78;
+    }
+    QLabel[dayState="reminder"] {
+        color: #000000;
+        font-weight: bold;
+        background-color: #ff6600;
+        border: 1px solid #ff6600;
+    }
+    QLabel[dayState="reminder"]:hover {
+        background-color: #ff8800;
+        border: 1px solid #ff8800;
+    }
+    QLabel[dayState="today"] {
+        color: #000000;
+        font-weight: bold;
+        background-color: #50ff78;
+        border: 1px solid #50ff78;
+    }
+    QLabel[dayState="today_reminder"] {
+        color: #000000;
+        font-weight: bold;
+        background-color: #ff8800;
+        border: 1px solid #ff8800;
+    }
+"""
 
 class RetroCalendar(QWidget):
     def __init__(self, parent=None):
@@ -15,6 +55,7 @@ class RetroCalendar(QWidget):
         
         # Hatırlatıcılar
         self.reminders = []
+        self.reminders_by_date = {}  # date -> [başlık]; gösterilen ay için
         self.reminder_manager = None
         
         # Renkler - pixel art teması
@@ -26,13 +67,18 @@ class RetroCalendar(QWidget):
         self.today_color = QColor(80, 255, 120)  # Bugün rengi
         self.reminder_color = QColor(255, 136, 0)  # Hatırlatıcı rengi
         
-        # Güncelleme zamanlayıcısı
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.update_calendar)
-        self.update_timer.start(60000)  # Her dakika güncelle
+        # Pixel-art çerçeve
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.border_color, tick_offset=30,
+                                corner_color=self.detail_color)
+        
+        # Gün değişimi zamanlayıcısı: "bugün" vurgusu gece yarısı bir kez güncellenir
+        self.day_timer = QTimer()
+        self.day_timer.setSingleShot(True)
+        self.day_timer.timeout.connect(self.on_day_changed)
         
         self.setup_ui()
         self.update_calendar()
+        self.schedule_day_change()
         
     def setup_ui(self):
         """UI'yi kur"""
@@ -78,10 +124,22 @@ class RetroCalendar(QWidget):
             
         layout.addLayout(days_layout)
         
-        # Takvim ızgarası
-        self.calendar_grid = QGridLayout()
+        # Takvim ızgarası: 6x7 sabit hücre, ay değişince yalnızca içerikleri güncellenir
+        self.grid_widget = QWidget()
+        self.grid_widget.setStyleSheet(DAY_CELL_STYLE)
+        self.calendar_grid = QGridLayout(self.grid_widget)
+        self.calendar_grid.setContentsMargins(0, 0, 0, 0)
         self.calendar_grid.setSpacing(3)
-        layout.addLayout(self.calendar_grid)
+        self.day_cells = []
+        for week_num in range(6):
+            for day_num in range(7):
+                cell = QLabel()
+                cell.setAlignment(Qt.AlignCenter)
+                cell.setMinimumSize(32, 22)
+                cell.hide()
+                self.calendar_grid.addWidget(cell, week_num, day_num)
+                self.day_cells.append(cell)
+        layout.addWidget(self.grid_widget)
         
         # Alt bilgi
         self.info_label = QLabel()
@@ -104,223 +162,115 @@ class RetroCalendar(QWidget):
         month_name = self.current_date.strftime("%B %Y")
         self.title_label.setText(month_name.upper())
         
-        # Takvim ızgarasını temizle
-        for i in reversed(range(self.calendar_grid.count())):
-            item = self.calendar_grid.itemAt(i)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-            self.calendar_grid.removeItem(item)
-                
-        # Takvim verilerini al
-        cal = calendar.monthcalendar(self.current_date.year, self.current_date.month)
+        year, month = self.current_date.year, self.current_date.month
+        today = date.today()
         
-        # Günleri yerleştir
-        for week_num, week in enumerate(cal):
-            for day_num, day in enumerate(week):
-                if day != 0:
-                    day_widget = self.create_day_widget(day)
-                    self.calendar_grid.addWidget(day_widget, week_num, day_num)
+        # Ayın günlerini sabit hücrelere yerleştir; ayda olmayan hücreler gizlenir
+        cells = iter(self.day_cells)
+        for week in calendar.monthcalendar(year, month):
+            for day in week:
+                cell = next(cells)
+                if day == 0:
+                    cell.hide()
+                    continue
+                self.update_day_cell(cell, date(year, month, day), today)
+        for cell in cells:
+            cell.hide()
                     
         # Alt bilgiyi güncelle
-        today = date.today()
         day_of_year = today.timetuple().tm_yday
         week_of_year = today.isocalendar()[1]
         
         info_text = f"Bugün: {today.strftime('%d.%m.%Y')} | Yılın {day_of_year}. günü | {week_of_year}. hafta"
         self.info_label.setText(info_text)
         
-    def create_day_widget(self, day):
-        """Gün widget'ı oluştur"""
-        day_label = QLabel(str(day))
-        day_label.setAlignment(Qt.AlignCenter)
-        day_label.setMinimumSize(32, 22)
-        
-        # Bugün mü kontrol et
-        today = date.today()
-        current_month = self.current_date.month
-        current_year = self.current_date.year
-        
-        # Bu günde hatırlatıcı var mı kontrol et
-        has_reminder = self.has_reminder_on_date(day, current_month, current_year)
-        
-        if (day == today.day and current_month == today.month and current_year == today.year):
-            # Bugün
-            if has_reminder:
-                day_label.setStyleSheet("""
-                    QLabel {
-                        color: #000000;
-                        font-family: 'Courier';
-                        font-size: 10px;
-                        font-weight: bold;
-                        background-color: #ff8800;
-                        border: 1px solid #ff8800;
-                        padding: 3px;
-                    }
-                """)
-            else:
-                day_label.setStyleSheet("""
-                    QLabel {
-                        color: #000000;
-                        font-family: 'Courier';
-                        font-size: 10px;
-                        font-weight: bold;
-                        background-color: #50ff78;
-                        border: 1px solid #50ff78;
-                        padding: 3px;
-                    }
-                """)
+    def update_day_cell(self, cell, day_date, today):
+        """Hücreyi verilen günün metni, durumu ve tooltip'iyle güncelle"""
+        titles = self.reminders_by_date.get(day_date)
+        if day_date == today:
+            state = 'today_reminder' if titles else 'today'
         else:
-            # Normal gün
-            if has_reminder:
-                day_label.setStyleSheet("""
-                    QLabel {
-                        color: #000000;
-                        font-family: 'Courier';
-                        font-size: 10px;
-                        font-weight: bold;
-                        background-color: #ff6600;
-                        border: 1px solid #ff6600;
-                        padding: 3px;
-                    }
-                    QLabel:hover {
-                        background-color: #ff8800;
-                        border: 1px solid #ff8800;
-                    }
-                """)
-            else:
-                day_label.setStyleSheet("""
-                    QLabel {
-                        color: #50ff78;
-                        font-family: 'Courier';
-                        font-size: 10px;
-                        background-color: #081410;
-                        border: 1px solid #102010;
-                        padding: 3px;
-                    }
-                    QLabel:hover {
-                        background-color: #102010;
-                        border: 1px solid #50ff78;
-                    }
-                """)
-        
-        # Tooltip ekle
-        if has_reminder:
-            reminder_text = self.get_reminders_for_date(day, current_month, current_year)
-            day_label.setToolTip(reminder_text)
+            state = 'reminder' if titles else 'normal'
         
-        return day_label
+        cell.setText(str(day_date.day))
+        if cell.property('dayState') != state:
+            cell.setProperty('dayState', state)
+            # Stil özellik seçicilerine göre yeniden uygulanır
+            cell.style().unpolish(cell)
+            cell.style().polish(cell)
+        cell.setToolTip("Hatırlatıcılar:\n" + "\n".join(titles) if titles else "")
+        cell.show()
         
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, False)  # Pixel art için
-        
-        # Widget boyutları
-        w, h = self.width(), self.height()
-        
-        # Arka plan (gridli pixel art)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        
-        # Grid çizgileri
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.border_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 12
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        
-        # Köşe detayları
-        painter.setPen(QPen(self.border_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.border_color, 4))
-        painter.drawLine(margin-8, h//2-30, margin, h//2-30)
-        painter.drawLine(margin-8, h//2+30, margin, h//2+30)
-        painter.drawLine(w-margin+8, h//2-30, w-margin, h//2-30)
-        painter.drawLine(w-margin+8, h//2+30, w-margin, h//2+30)
-        
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+24, margin-8, w-margin-24, margin-8)
-        painter.drawLine(margin+24, h-margin+8, w-margin-24, h-margin+8)
-        
-        # Köşe dekorasyonları
-        self.draw_corners(painter)
-        
-    def draw_corners(self, painter):
-        """Köşe dekorasyonlarını çiz"""
-        w, h = self.width(), self.height()
-        corner_size = 12
-        corner_color = self.detail_color
-        
-        painter.setPen(QPen(corner_color, 3))
-        
-        # Sol üst köşe
-        painter.drawLine(4, 4, corner_size, 4)
-        painter.drawLine(4, 4, 4, corner_size)
-        
-        # Sağ üst köşe
-        painter.drawLine(w - corner_size, 4, w - 4, 4)
-        painter.drawLine(w - 4, 4, w - 4, corner_size)
-        
-        # Sol alt köşe
-        painter.drawLine(4, h - corner_size, 4, h - 4)
-        painter.drawLine(4, h - 4, corner_size, h - 4)
-        
-        # Sağ alt köşe
-        painter.drawLine(w - corner_size, h - 4, w - 4, h - 4)
-        painter.drawLine(w - 4, h - corner_size, w - 4, h - 4)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
         
     def resizeEvent(self, event):
         """Widget yeniden boyutlandırıldığında"""
         super().resizeEvent(event)
+        self.frame.invalidate()
         self.update()
         
     def set_reminder_manager(self, reminder_manager):
         """Hatırlatıcı yöneticisini ayarla"""
         self.reminder_manager = reminder_manager
+        # Hatırlatıcı eklenince, silinince ya da tetiklenince yeniden yükle
+        ChangeBus.shared().subscribe(REMINDERS, self.update_reminders)
         self.update_reminders()
         
+    def schedule_day_change(self):
+        """Zamanlayıcıyı bir sonraki gece yarısına kur"""
+        now = datetime.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), datetime.min.time())
+        # Saat ayarı kaymalarına karşı gece yarısından biraz sonra
+        self.day_timer.start(int((midnight - now).total_seconds() * 1000) + 1000)
+        
+    def on_day_changed(self):
+        """Gün değişti: bugün vurgusunu taşı, ay da değiştiyse yeni ayı göster"""
+        today = date.today()
+        yesterday = today - timedelta(days=1)
+        if (self.current_date.year, self.current_date.month) == (yesterday.year, yesterday.month) != (today.year, today.month):
+            self.show_month(today.year, today.month)
+        else:
+            self.update_calendar()
+        self.schedule_day_change()
+        
     def update_reminders(self):
         """Hatırlatıcıları güncelle"""
         if self.reminder_manager:
-            self.reminders = self.reminder_manager.get_all_reminders()
+            # Yalnızca gösterilen ay; tekrarlayan seriler bu ay için açılır
+            self.reminders = self.reminder_manager.get_month_reminders(
+                self.current_date.year, self.current_date.month
+            )
+            # Hücreler başlıkları tarihe göre tek aramada bulur
+            self.reminders_by_date = {}
+            for reminder in self.reminders:
+                self.reminders_by_date.setdefault(reminder['date'], []).append(reminder['title'])
+            self.update_calendar()
+            
+    def show_month(self, year, month):
+        """Başka bir ayı göster (yalnızca o ayın hatırlatıcıları yüklenir)"""
+        self.current_date = datetime(year, month, 1)
+        self.reminders = []
+        self.reminders_by_date = {}
+        if self.reminder_manager:
+            self.update_reminders()
+        else:
             self.update_calendar()
             
     def has_reminder_on_date(self, day, month, year):
         """Belirli bir tarihte hatırlatıcı var mı kontrol et"""
-        if not self.reminder_manager:
-            return False
-            
-        target_date = date(year, month, day)
-        for reminder in self.reminders:
-            if reminder['date'] == target_date:
-                return True
-        return False
+        return date(year, month, day) in self.reminders_by_date
         
     def get_reminders_for_date(self, day, month, year):
         """Belirli bir tarihteki hatırlatıcıları al"""
-        if not self.reminder_manager:
-            return ""
-            
-        target_date = date(year, month, day)
-        reminders = []
-        for reminder in self.reminders:
-            if reminder['date'] == target_date:
-                reminders.append(reminder['title'])
-        
-        if reminders:
-            return f"Hatırlatıcılar:\n" + "\n".join(reminders)
+        titles = self.reminders_by_date.get(date(year, month, day))
+        if titles:
+            return f"Hatırlatıcılar:\n" + "\n".join(titles)
         return ""
         
     def cleanup(self):
         """Temizlik"""
-        self.update_timer.stop() 
\ No newline at end of file
+        self.day_timer.stop()
+        ChangeBus.shared().unsubscribe(REMINDERS, self.update_reminders) 
\ No newline at end of file
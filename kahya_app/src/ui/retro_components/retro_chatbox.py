@@ -1,13 +1,29 @@
+import re
 import threading
 import time
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
                              QLineEdit, QPushButton, QScrollArea, QLabel)
-from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QThread, pyqtSlot
-from PyQt5.QtGui import QFont, QColor, QPalette, QTextCursor, QPainter, QPen, QBrush
+from PyQt5.QtCore import QTimer, Qt, pyqtSignal, QObject, pyqtSlot
+from PyQt5.QtGui import QFont, QColor, QPalette, QTextCursor, QTextCharFormat, QPainter, QPen, QBrush
+from src.core.command_patterns import NATURAL_PATTERNS
+from src.core.task_pool import TaskPool
+from .retro_frame import RetroFrame
 
-class LLMWorker(QThread):
-    """LLM yanıtlarını arka planda işleyen thread"""
+# Router'ın olduğu gibi anladığı komutlar; anahtar kelimeyle yeniden yazılırsa
+# eşleşmezler ("içerik ara rapor" -> "search: ...", "her pazartesi 9:00 ..." -> LLM)
+_PASSTHROUGH = re.compile('|'.join(
+    f'(?:{pattern})' for pattern, handler in NATURAL_PATTERNS
+    if handler in ('handle_recurring_reminder', 'handle_content_search')
+))
+
+class LLMWorker(QObject):
+    """LLM yanıtlarını paylaşılan iş havuzunun LLM şeridinde işleyen iş
+
+    Yeni mesaj gönderilince eski iş iptal edilir; iptal edilen iş akışı keser
+    ve artık sinyal yaymaz.
+    """
     response_ready = pyqtSignal(str)
+    partial_response = pyqtSignal(str)  # Akış sırasında gelen metin parçası
     command_detected = pyqtSignal(str)  # Komut algılandı sinyali
     error_occurred = pyqtSignal(str)
     
@@ -16,11 +32,33 @@ class LLMWorker(QThread):
         self.llm_client = llm_client
         self.message = message
         self.router = router
+        self.cancelled = False
+        
+    def cancel(self):
+        """İşi iptal et (akış bir sonraki parçada kesilir)"""
+        self.cancelled = True
         
     def run(self):
         try:
-            # LLM'den yanıt al
-            response = self.llm_client.get_response(self.message)
+            # LLM'den yanıt al (destekleniyorsa parça parça)
+            if hasattr(self.llm_client, 'stream_response'):
+                chunks = []
+                stream = self.llm_client.stream_response(self.message)
+                try:
+                    for chunk in stream:
+                        if self.cancelled:
+                            break
+                        chunks.append(chunk)
+                        self.partial_response.emit(chunk)
+                finally:
+                    # HTTP akışını hemen kapat
+                    stream.close()
+                response = "".join(chunks).strip()
+            else:
+                response = self.llm_client.get_response(self.message)
+                
+            if self.cancelled:
+                return
             
             # LLM yanıtında komut işaretleri var mı kontrol et
             if any(keyword in response.lower() for keyword in [
@@ -38,7 +76,8 @@ class LLMWorker(QThread):
                 self.response_ready.emit(response)
                 
         except Exception as e:
-            self.error_occurred.emit(str(e))
+            if not self.cancelled:
+                self.error_occurred.emit(str(e))
 
 class RetroChatbox(QWidget):
     command_sent = pyqtSignal(str)
@@ -55,6 +94,14 @@ class RetroChatbox(QWidget):
         self.is_typing = False
         self.typing_message_id = None
         self.response_received = False  # Çift mesajı engellemek için
+        self.worker = None  # Güncel LLM işi
+        self.task_pool = TaskPool.shared()
+        self.is_streaming = False  # Yanıt parça parça yazılıyor mu
+        
+        # Akış sırasında parça gelmeyince ağız animasyonunu durdur
+        self.talk_idle_timer = QTimer()
+        self.talk_idle_timer.setSingleShot(True)
+        self.talk_idle_timer.timeout.connect(lambda: self.kahya_talking.emit(False))
         
         # Renkler - pixel art teması
         self.bg_color = QColor(8, 20, 10)  # Koyu yeşil arka plan
@@ -63,6 +110,9 @@ class RetroChatbox(QWidget):
         self.border_color = QColor(80, 255, 120)  # Yeşil kenarlık
         self.detail_color = QColor(80, 255, 120)  # Detay rengi
         
+        # Pixel-art çerçeve
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.border_color, tick_offset=25)
+        
         self.setup_ui()
         self.setup_styling()
         
@@ -182,6 +232,7 @@ class RetroChatbox(QWidget):
         
         # Yanıt durumunu sıfırla
         self.response_received = False
+        self.is_streaming = False
         
         # Önce doğal dil işleme ile komut algılama
         detected_command = self._detect_command(message)
@@ -194,13 +245,18 @@ class RetroChatbox(QWidget):
         else:
             # Komut algılanmadı, LLM'e gönder
             if self.llm_client:
+                # Önceki yanıt hâlâ geliyorsa iptal et
+                if self.worker:
+                    self.worker.cancel()
                 self.start_typing_animation()
                 # LLM'i daha akıllı kullan
                 self.worker = LLMWorker(self.llm_client, message, self.router)
                 self.worker.response_ready.connect(self.handle_llm_response)
+                self.worker.partial_response.connect(self.handle_llm_partial)
                 self.worker.command_detected.connect(self.handle_llm_command)
                 self.worker.error_occurred.connect(self.handle_llm_error)
-                self.worker.start()
+                # LLM şeridi yeni işi alınca bekleyen/çalışan eski işi iptal eder
+                self.task_pool.submit(TaskPool.LLM, self.worker.run, on_cancel=self.worker.cancel)
             else:
                 self.add_system_message("LLM istemcisi bulunamadı.")
     
@@ -208,6 +264,10 @@ class RetroChatbox(QWidget):
         """Doğal dil işleme ile komut algılama"""
         message_lower = message.lower()
         
+        # İçerik araması ve tekrarlayan hatırlatıcı router'a değiştirilmeden gider
+        if _PASSTHROUGH.match(message_lower):
+            return message
+        
         # Hatırlatıcı komutları
         if any(keyword in message_lower for keyword in ['hatırlat', 'hatırlatıcı', 'reminder']):
             return f"reminder: {message}"
@@ -251,8 +311,54 @@ class RetroChatbox(QWidget):
         dots = "." * self.typing_dots
         self.add_system_message(f"Kahya yazıyor{dots}")
         
+    def _is_stale(self):
+        """Sinyal, yerini yenisine bırakmış eski bir LLM işinden mi geliyor?"""
+        sender = self.sender()
+        return isinstance(sender, LLMWorker) and sender is not self.worker
+        
+    def handle_llm_partial(self, chunk):
+        """Akıştan gelen yanıt parçasını sohbete ekle"""
+        if self.response_received or self._is_stale():
+            return
+            
+        if not self.is_streaming:
+            # İlk parça: yazma animasyonunu bitir ve Kahya satırını aç
+            self.is_streaming = True
+            self.is_typing = False
+            self.typing_timer.stop()
+            self.add_kahya_message("")
+            chunk = " " + chunk.lstrip()
+            
+        # Parçalar "Kahya:" etiketinin kalın biçimini devralmasın
+        text_format = QTextCharFormat()
+        text_format.setForeground(self.text_color)
+        cursor = self.chat_area.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(chunk, text_format)
+        self.chat_area.setTextCursor(cursor)
+        
+        # Her parçada ağzı oynat, parça gelmezse kısa süre sonra kapat
+        self.kahya_talking.emit(True)
+        self.talk_idle_timer.start(400)
+        
+    def _finish_stream(self):
+        """Akışla yazılan yanıtı tamamla; yanıt zaten yazıldıysa True döndür"""
+        if not self.is_streaming:
+            return False
+        self.is_streaming = False
+        self.response_received = True
+        self.talk_idle_timer.stop()
+        self.kahya_talking.emit(False)
+        self.scroll_to_bottom()
+        return True
+        
     def handle_llm_response(self, response):
         """LLM yanıtını işle"""
+        if self._is_stale():
+            return
+        if self._finish_stream():
+            return
+            
         if not self.response_received:
             self.response_received = True
             self.is_typing = False
@@ -264,6 +370,9 @@ class RetroChatbox(QWidget):
             
     def handle_llm_error(self, error):
         """LLM hatasını işle"""
+        if self._is_stale():
+            return
+        self._finish_stream()
         self.is_typing = False
         self.typing_timer.stop()
         self.kahya_talking.emit(False)
@@ -271,6 +380,11 @@ class RetroChatbox(QWidget):
         
     def handle_llm_command(self, response):
         """LLM komut yanıtını işle"""
+        if self._is_stale():
+            return
+        if self._finish_stream():
+            return
+            
         if not self.response_received:
             self.response_received = True
             self.is_typing = False
@@ -314,45 +428,12 @@ class RetroChatbox(QWidget):
         
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, False)  # Pixel art için
-        
-        # Widget boyutları
-        w, h = self.width(), self.height()
-        
-        # Arka plan (gridli pixel art)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        
-        # Grid çizgileri
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.border_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 12
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        
-        # Köşe detayları
-        painter.setPen(QPen(self.border_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.border_color, 4))
-        painter.drawLine(margin-8, h//2-25, margin, h//2-25)
-        painter.drawLine(margin-8, h//2+25, margin, h//2+25)
-        painter.drawLine(w-margin+8, h//2-25, w-margin, h//2-25)
-        painter.drawLine(w-margin+8, h//2+25, w-margin, h//2+25)
-        
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+24, margin-8, w-margin-24, margin-8)
-        painter.drawLine(margin+24, h-margin+8, w-margin-24, h-margin+8)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
         
     def cleanup(self):
         """Temizlik"""
-        self.typing_timer.stop() 
\ No newline at end of file
+        if self.worker:
+            self.worker.cancel()
+        self.typing_timer.stop()
+        self.talk_idle_timer.stop() 
\ No newline at end of file
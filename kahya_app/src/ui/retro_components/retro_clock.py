@@ -1,19 +1,20 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
 from datetime import datetime
 import math
+from .retro_frame import RetroFrame, ScanLines
+from .animation_clock import AnimationClock
+
+# Glow animasyonu: saniyede 100 alfa birimi, 50 ms'de bir adım
+GLOW_SPEED = 100
+GLOW_INTERVAL = 0.05
 
 class RetroClock(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(200, 100)
         
-        # Zamanlayıcı
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start(1000)  # Her saniye güncelle
-        
         # Renkler - pixel art teması
         self.bg_color = QColor(8, 20, 10)  # Koyu yeşil arka plan
         self.grid_color = QColor(40, 80, 40, 60)  # Grid çizgileri
@@ -22,33 +23,38 @@ class RetroClock(QWidget):
         self.detail_color = QColor(80, 255, 120)  # Detay rengi
         self.glow_color = QColor(80, 255, 120, 50)  # Yeşil glow efekti
         
+        # Pixel-art çerçeve
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.border_color, tick_offset=20,
+                                corner_color=self.detail_color)
+        self.scan_lines = ScanLines(QColor(80, 255, 120, 15))
+        
         # Font - pixel art için
         self.time_font = QFont("Courier", 18, QFont.Bold)
         self.date_font = QFont("Courier", 10, QFont.Bold)
         
-        # Animasyon
+        # Animasyon (ortak kare saatiyle; glow her adımda yeniden çizdiği
+        # için saniye göstergesi de ayrı bir zamanlayıcı olmadan güncellenir)
         self.glow_alpha = 0
         self.glow_direction = 1
+        self.animation_clock = AnimationClock.shared()
         
-        # Glow animasyon zamanlayıcısı
-        self.glow_timer = QTimer()
-        self.glow_timer.timeout.connect(self.update_glow)
-        self.glow_timer.start(50)  # 50ms
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.animation_clock.start(self, self.update_glow, GLOW_INTERVAL)
         
-    def update_time(self):
-        """Zamanı güncelle"""
-        self.update()
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.animation_clock.stop(self)
         
-    def update_glow(self):
+    def update_glow(self, dt):
         """Glow efektini güncelle"""
-        self.glow_alpha += self.glow_direction * 5
+        self.glow_alpha += self.glow_direction * GLOW_SPEED * dt
         if self.glow_alpha >= 100:
             self.glow_alpha = 100
             self.glow_direction = -1
         elif self.glow_alpha <= 0:
             self.glow_alpha = 0
             self.glow_direction = 1
-        self.update()
         
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -57,39 +63,8 @@ class RetroClock(QWidget):
         # Widget boyutları
         w, h = self.width(), self.height()
         
-        # Arka plan (gridli pixel art)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        
-        # Grid çizgileri
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.border_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 12
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        
-        # Köşe detayları
-        painter.setPen(QPen(self.border_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.border_color, 4))
-        painter.drawLine(margin-8, h//2-20, margin, h//2-20)
-        painter.drawLine(margin-8, h//2+20, margin, h//2+20)
-        painter.drawLine(w-margin+8, h//2-20, w-margin, h//2-20)
-        painter.drawLine(w-margin+8, h//2+20, w-margin, h//2+20)
-        
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+24, margin-8, w-margin-24, margin-8)
-        painter.drawLine(margin+24, h-margin+8, w-margin-24, h-margin+8)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
         
         # Şu anki zaman
         now = datetime.now()
@@ -99,7 +74,7 @@ class RetroClock(QWidget):
         
         # Glow efekti
         glow_color = QColor(self.glow_color)
-        glow_color.setAlpha(self.glow_alpha)
+        glow_color.setAlpha(int(self.glow_alpha))
         painter.setPen(QPen(glow_color, 3))
         
         # Saat metni (glow)
@@ -126,49 +101,16 @@ class RetroClock(QWidget):
         day_y = h // 2 + 30
         painter.drawText(day_x, day_y, day_str)
         
-        # Köşe dekorasyonları
-        self.draw_corners(painter, w, h)
-        
-        # Scan line efekti
-        self.draw_scan_lines(painter, w, h)
-        
-    def draw_corners(self, painter, width, height):
-        """Köşe dekorasyonlarını çiz"""
-        corner_size = 12
-        corner_color = self.detail_color
-        
-        painter.setPen(QPen(corner_color, 3))
-        
-        # Sol üst köşe
-        painter.drawLine(4, 4, corner_size, 4)
-        painter.drawLine(4, 4, 4, corner_size)
-        
-        # Sağ üst köşe
-        painter.drawLine(width - corner_size, 4, width - 4, 4)
-        painter.drawLine(width - 4, 4, width - 4, corner_size)
-        
-        # Sol alt köşe
-        painter.drawLine(4, height - corner_size, 4, height - 4)
-        painter.drawLine(4, height - 4, corner_size, height - 4)
-        
-        # Sağ alt köşe
-        painter.drawLine(width - corner_size, height - 4, width - 4, height - 4)
-        painter.drawLine(width - 4, height - corner_size, width - 4, height - 4)
-        
-    def draw_scan_lines(self, painter, width, height):
-        """Scan line efektini çiz"""
-        scan_color = QColor(80, 255, 120, 15)
-        painter.setPen(QPen(scan_color, 1))
+        # Scan line efekti (metnin üstünde, önbellekteki katman)
+        self.scan_lines.draw(painter, self)
         
-        for y in range(0, height, 4):
-            painter.drawLine(0, y, width, y)
-            
     def resizeEvent(self, event):
         """Widget yeniden boyutlandırıldığında"""
         super().resizeEvent(event)
+        self.frame.invalidate()
+        self.scan_lines.invalidate()
         self.update()
         
     def cleanup(self):
         """Temizlik"""
-        self.timer.stop()
-        self.glow_timer.stop() 
\ No newline at end of file
+        self.animation_clock.stop(self) 
\ No newline at end of file
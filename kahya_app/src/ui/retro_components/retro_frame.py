@@ -0,0 +1,182 @@
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QRect
+from PyQt5.QtGui import QPainter, QColor, QPen, QPixmap
+
+# Paylaşılan pixmap önbelleği: (tür, tema, genişlik, yükseklik, DPR) -> QPixmap
+MAX_CACHED_PIXMAPS = 32
+_pixmap_cache = OrderedDict()
+stats = {'renders': 0, 'hits': 0}
+
+
+def _cached_pixmap(key, render):
+    """Önbellekteki pixmap'i döndür, yoksa render() ile üret (LRU)"""
+    pixmap = _pixmap_cache.get(key)
+    if pixmap is not None:
+        _pixmap_cache.move_to_end(key)
+        stats['hits'] += 1
+        return pixmap
+    pixmap = render()
+    stats['renders'] += 1
+    _pixmap_cache[key] = pixmap
+    if len(_pixmap_cache) > MAX_CACHED_PIXMAPS:
+        _pixmap_cache.popitem(last=False)
+    return pixmap
+
+
+def clear_cache():
+    _pixmap_cache.clear()
+
+
+class CachedChrome:
+    """Widget'ın statik süslemesini bir QPixmap'te tutan temel sınıf
+
+    Süsleme (tür, tema, boyut, devicePixelRatio) anahtarıyla bir kez çizilir ve
+    paylaşılan önbellekte saklanır; aynı boyut ve temadaki widget'lar aynı
+    pixmap'i kullanır. Boyut, tema ya da ekran ölçeği değişince anahtar değişir
+    ve süsleme yeniden çizilir. paintEvent yalnızca pixmap'i basıp dinamik
+    içeriği çizer.
+    """
+
+    def __init__(self):
+        self.theme = ()
+        self._key = None
+        self._pixmap = None
+
+    def render(self, painter, w, h):
+        """Süslemeyi mantıksal koordinatlarda çiz (alt sınıflar uygular)"""
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Widget'ın tuttuğu pixmap'i bırak (ör. resizeEvent'te)"""
+        self._key = None
+        self._pixmap = None
+
+    def pixmap(self, widget):
+        w, h = widget.width(), widget.height()
+        dpr = widget.devicePixelRatioF()
+        key = (type(self).__name__, self.theme, w, h, dpr)
+        if key != self._key:
+            self._pixmap = _cached_pixmap(key, lambda: self._render_pixmap(w, h, dpr))
+            self._key = key
+        return self._pixmap
+
+    def draw(self, painter, widget):
+        """Önbellekteki süslemeyi widget'ın sol üst köşesine bas"""
+        if widget.width() > 0 and widget.height() > 0:
+            painter.drawPixmap(0, 0, self.pixmap(widget))
+
+    def _render_pixmap(self, w, h, dpr):
+        pixmap = QPixmap(max(1, round(w * dpr)), max(1, round(h * dpr)))
+        pixmap.setDevicePixelRatio(dpr)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        try:
+            self.render(painter, w, h)
+        finally:
+            painter.end()
+        return pixmap
+
+
+class RetroFrame(CachedChrome):
+    """Pixel-art widget arka planı: gridli zemin, kalın çerçeve, yan çıkıntılar,
+    üst/alt detay çizgileri ve isteğe bağlı köşe dekorasyonları"""
+
+    def __init__(self, bg_color, grid_color, border_color, margin=12, tick_offset=30,
+                 tick_length=8, line_inset=24, corner_color=None, grid_size=8):
+        super().__init__()
+        self.set_theme(bg_color, grid_color, border_color, margin, tick_offset,
+                       tick_length, line_inset, corner_color, grid_size)
+
+    def set_theme(self, bg_color, grid_color, border_color, margin=12, tick_offset=30,
+                  tick_length=8, line_inset=24, corner_color=None, grid_size=8):
+        """Renkleri/ölçüleri değiştir; sonraki çizimde süsleme yeniden üretilir"""
+        self.theme = (bg_color.rgba(), grid_color.rgba(), border_color.rgba(), margin,
+                      tick_offset, tick_length, line_inset,
+                      corner_color.rgba() if corner_color is not None else None, grid_size)
+
+    def render(self, painter, w, h):
+        bg, grid, border, margin, tick_offset, tick_length, line_inset, corner, grid_size = self.theme
+        border_color = QColor.fromRgba(border)
+        painter.setRenderHint(QPainter.Antialiasing, False)  # Pixel art için
+
+        # Arka plan ve grid çizgileri
+        painter.fillRect(0, 0, w, h, QColor.fromRgba(bg))
+        painter.setPen(QPen(QColor.fromRgba(grid), 1))
+        for x in range(0, w, grid_size):
+            painter.drawLine(x, 0, x, h)
+        for y in range(0, h, grid_size):
+            painter.drawLine(0, y, w, y)
+
+        # Dış çerçeve ve köşe noktaları
+        painter.setPen(QPen(border_color, 4))
+        painter.setBrush(Qt.NoBrush)
+        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
+        for dx in [0, w-2*margin]:
+            for dy in [0, h-2*margin]:
+                painter.drawPoint(margin+dx, margin+dy)
+
+        # Yan çıkıntılar
+        for y in (h//2 - tick_offset, h//2 + tick_offset):
+            painter.drawLine(margin-tick_length, y, margin, y)
+            painter.drawLine(w-margin+tick_length, y, w-margin, y)
+
+        # Üst ve alt detay çizgiler
+        painter.drawLine(margin+line_inset, margin-tick_length, w-margin-line_inset, margin-tick_length)
+        painter.drawLine(margin+line_inset, h-margin+tick_length, w-margin-line_inset, h-margin+tick_length)
+
+        if corner is not None:
+            self.render_corners(painter, w, h, QColor.fromRgba(corner))
+
+    @staticmethod
+    def render_corners(painter, w, h, color, corner_size=12):
+        """Widget köşelerindeki L biçimli dekorasyonlar"""
+        painter.setPen(QPen(color, 3))
+        # Sol üst, sağ üst, sol alt, sağ alt
+        painter.drawLine(4, 4, corner_size, 4)
+        painter.drawLine(4, 4, 4, corner_size)
+        painter.drawLine(w - corner_size, 4, w - 4, 4)
+        painter.drawLine(w - 4, 4, w - 4, corner_size)
+        painter.drawLine(4, h - corner_size, 4, h - 4)
+        painter.drawLine(4, h - 4, corner_size, h - 4)
+        painter.drawLine(w - corner_size, h - 4, w - 4, h - 4)
+        painter.drawLine(w - 4, h - corner_size, w - 4, h - 4)
+
+
+class ScanLines(CachedChrome):
+    """Dinamik içeriğin üstüne basılan yarı saydam scan line katmanı"""
+
+    def __init__(self, color, spacing=4):
+        super().__init__()
+        self.theme = (color.rgba(), spacing)
+
+    def render(self, painter, w, h):
+        color, spacing = self.theme
+        painter.setPen(QPen(QColor.fromRgba(color), 1))
+        for y in range(0, h, spacing):
+            painter.drawLine(0, y, w, y)
+
+
+class GlowOutline(CachedChrome):
+    """Saydam pencerelerin yuvarlak köşeli, yumuşak kenarlı parıltı çerçevesi"""
+
+    def __init__(self, color, outer_alpha=80, inner_alpha=30, radius=18):
+        super().__init__()
+        self.theme = (color.rgb(), outer_alpha, inner_alpha, radius)
+
+    def render(self, painter, w, h):
+        rgb, outer_alpha, inner_alpha, radius = self.theme
+        painter.setRenderHint(QPainter.Antialiasing)
+        rect = QRect(0, 0, w, h)
+
+        # Gölge efekti
+        outer = QColor(rgb)
+        outer.setAlpha(outer_alpha)
+        painter.setPen(QPen(outer, 4))
+        painter.setBrush(QColor(0, 0, 0, 0))
+        painter.drawRoundedRect(rect.adjusted(4, 4, 4, 4), radius, radius)
+
+        # İç gölge
+        inner = QColor(rgb)
+        inner.setAlpha(inner_alpha)
+        painter.setPen(QPen(inner, 2))
+        painter.drawRoundedRect(rect.adjusted(2, 2, -2, -2), radius - 2, radius - 2)
@@ -2,6 +2,7 @@ from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
                              QLabel, QPushButton, QFrame, QScrollArea)
 from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QPixmap
+from .retro_frame import RetroFrame
 
 class InventorySlot(QFrame):
     """Envanter slot'u - Minecraft tarzında"""
@@ -153,6 +154,9 @@ class RetroInventory(QWidget):
         self.border_color = QColor(80, 255, 120)  # Yeşil kenarlık
         self.detail_color = QColor(80, 255, 120)  # Detay rengi
         
+        # Pixel-art çerçeve
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.border_color, tick_offset=40)
+        
         self.setup_ui()
         self.setup_demo_items()
         
@@ -316,44 +320,8 @@ class RetroInventory(QWidget):
         
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, False)  # Pixel art için
-        
-        # Widget boyutları
-        w, h = self.width(), self.height()
-        
-        # Arka plan (gridli pixel art)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        
-        # Grid çizgileri
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.border_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 12
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        
-        # Köşe detayları
-        painter.setPen(QPen(self.border_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.border_color, 4))
-        painter.drawLine(margin-8, h//2-40, margin, h//2-40)
-        painter.drawLine(margin-8, h//2+40, margin, h//2+40)
-        painter.drawLine(w-margin+8, h//2-40, w-margin, h//2+40)
-        painter.drawLine(w-margin+8, h//2+40, w-margin, h//2+40)
-        
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+24, margin-8, w-margin-24, margin-8)
-        painter.drawLine(margin+24, h-margin+8, w-margin-24, h-margin+8)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
         
     def cleanup(self):
         """Temizlik"""
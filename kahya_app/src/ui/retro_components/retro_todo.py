@@ -1,10 +1,10 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, 
                              QListWidgetItem, QPushButton, QLineEdit, QLabel,
                              QCheckBox, QScrollArea, QFrame, QTextEdit)
-from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QFont, QFontMetrics
-from datetime import datetime
-import os
+from src.ui.change_bus import ChangeBus, NOTES
+from .retro_frame import RetroFrame
 
 class RetroNotes(QWidget):
     note_added = pyqtSignal(str)  # Yeni not eklendiğinde
@@ -12,7 +12,8 @@ class RetroNotes(QWidget):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.notes_file = "kahya_notes.txt"
+        self.note_manager = None
+        self._loaded_version = None  # Listelenen notların (değişiklik sayacı, not sayısı)
         
         self.setMinimumSize(300, 400)
         
@@ -23,14 +24,12 @@ class RetroNotes(QWidget):
         self.border_color = QColor(80, 255, 120)  # Yeşil kenarlık
         self.detail_color = QColor(80, 255, 120)  # Detay rengi
         
+        # Pixel-art çerçeve
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.border_color, tick_offset=40)
+        
         self.setup_ui()
         self.load_notes()
         
-        # Güncelleme zamanlayıcısı
-        self.update_timer = QTimer()
-        self.update_timer.timeout.connect(self.load_notes)
-        self.update_timer.start(5000)  # 5 saniyede bir güncelle
-        
     def setup_ui(self):
         """UI'yi kur"""
         layout = QVBoxLayout(self)
@@ -135,128 +134,72 @@ class RetroNotes(QWidget):
         """)
         layout.addWidget(self.stats_label)
         
+    def set_note_manager(self, note_manager):
+        """Not yöneticisini ayarla"""
+        self.note_manager = note_manager
+        self._loaded_version = None
+        # Notlar (widget, sohbet komutu ya da içe aktarma ile) değişince yeniden yükle
+        ChangeBus.shared().subscribe(NOTES, self.load_notes)
+        self.load_notes()
+        
     def add_note(self):
         """Yeni not ekle"""
         text = self.note_input.text().strip()
-        if text:
-            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M")
-            note_line = f"{timestamp}: {text}\n"
-            
-            try:
-                with open(self.notes_file, "a", encoding="utf-8") as f:
-                    f.write(note_line)
+        if text and self.note_manager:
+            if self.note_manager.add_note(text):
                 self.note_input.clear()
                 self.load_notes()
                 self.note_added.emit(text)
-            except Exception as e:
-                print(f"Not ekleme hatası: {e}")
             
     def load_notes(self):
         """Notları yükle"""
-        self.notes_list.clear()
-        
+        if not self.note_manager:
+            self.stats_label.setText("Toplam: 0 not")
+            return
+            
         try:
-            if os.path.exists(self.notes_file):
-                with open(self.notes_file, "r", encoding="utf-8") as f:
-                    notes = f.readlines()
-                
-                # Son 20 notu göster (en yeniden en eskiye)
-                recent_notes = notes[-20:]
-                for i, note in enumerate(reversed(recent_notes)):
-                    # Doğru index: en yeni notun index'i len(notes)-1, sonra len(notes)-2, ...
-                    original_index = len(notes) - i - 1
-                    item = NoteItem(note.strip(), original_index, self.notes_list)
-                    item.notes_widget = self
-                    list_item = QListWidgetItem()
-                    self.notes_list.addItem(list_item)
-                    self.notes_list.setItemWidget(list_item, item)
-                    list_item.setSizeHint(item.sizeHint())
-                
-                # İstatistikleri güncelle
-                self.stats_label.setText(f"Toplam: {len(notes)} not")
-            else:
-                self.stats_label.setText("Toplam: 0 not")
+            version = self.note_manager.get_version()
+            if version == self._loaded_version:
+                return
+            
+            self.notes_list.clear()
+            # Son 20 not (en yeniden en eskiye)
+            for note in self.note_manager.get_recent_notes(20):
+                item = NoteItem(self.note_manager.format_note(note), note[0], self.notes_list)
+                item.notes_widget = self
+                list_item = QListWidgetItem()
+                self.notes_list.addItem(list_item)
+                self.notes_list.setItemWidget(list_item, item)
+                list_item.setSizeHint(item.sizeHint())
+            
+            # İstatistikleri güncelle
+            self.stats_label.setText(f"Toplam: {version[1]} not")
+            self._loaded_version = version
                 
         except Exception as e:
             print(f"Not yükleme hatası: {e}")
             self.stats_label.setText("Hata: Notlar yüklenemedi")
         
-    def delete_note(self, note_index):
+    def delete_note(self, note_id):
         """Notu sil"""
-        print(f"delete_note çağrıldı: index={note_index}")
-        try:
-            if os.path.exists(self.notes_file):
-                with open(self.notes_file, "r", encoding="utf-8") as f:
-                    notes = f.readlines()
-                
-                print(f"Toplam not sayısı: {len(notes)}")
-                if 0 <= note_index < len(notes):
-                    print(f"Silinecek not: {notes[note_index]}")
-                    notes.pop(note_index)
-                    
-                    with open(self.notes_file, "w", encoding="utf-8") as f:
-                        f.writelines(notes)
-                    
-                    print("Not silindi, liste yenileniyor...")
-                    # UI güncellemesini ana thread'de yap
-                    self.note_deleted.emit(note_index)
-                    # Ana thread'de güncelle
-                    self.parent().parent().parent().load_notes()
-                else:
-                    print(f"Geçersiz index: {note_index}")
-        except Exception as e:
-            print(f"Not silme hatası: {e}")
+        if self.note_manager and self.note_manager.delete_note(note_id):
+            self.note_deleted.emit(note_id)
+            self.load_notes()
             
     def paintEvent(self, event):
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing, False)  # Pixel art için
-        
-        # Widget boyutları
-        w, h = self.width(), self.height()
-        
-        # Arka plan (gridli pixel art)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        
-        # Grid çizgileri
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.border_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 12
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        
-        # Köşe detayları
-        painter.setPen(QPen(self.border_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.border_color, 4))
-        painter.drawLine(margin-8, h//2-40, margin, h//2-40)
-        painter.drawLine(margin-8, h//2+40, margin, h//2+40)
-        painter.drawLine(w-margin+8, h//2-40, w-margin, h//2-40)
-        painter.drawLine(w-margin+8, h//2+40, w-margin, h//2+40)
-        
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+24, margin-8, w-margin-24, margin-8)
-        painter.drawLine(margin+24, h-margin+8, w-margin-24, h-margin+8)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
         
     def cleanup(self):
         """Temizlik"""
-        self.update_timer.stop()
+        ChangeBus.shared().unsubscribe(NOTES, self.load_notes)
 
 class NoteItem(QFrame):
-    def __init__(self, note_text, note_index, parent=None):
+    def __init__(self, note_text, note_id, parent=None):
         super().__init__(parent)
         self.note_text = note_text
-        self.note_index = note_index
+        self.note_id = note_id
         self.notes_widget = None
         
         self.setup_ui()
@@ -309,7 +252,7 @@ class NoteItem(QFrame):
     def delete_note(self):
         """Notu sil"""
         if self.notes_widget:
-            self.notes_widget.delete_note(self.note_index)
+            self.notes_widget.delete_note(self.note_id)
             
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -2,11 +2,21 @@ import numpy as np
 import sounddevice as sd
 import threading, time
 from PyQt5.QtWidgets import QWidget
-from PyQt5.QtCore import QTimer, Qt
+from PyQt5.QtCore import Qt, pyqtSignal
 from PyQt5.QtGui import QPainter, QColor, QPen, QBrush, QLinearGradient
 from PyQt5.QtGui import QFont
+from .retro_frame import RetroFrame
+from .animation_clock import AnimationClock, FRAME_INTERVAL
+
+# attack/release/decay oranları 60 Hz kare başına tanımlı
+RATE_FRAME = 1 / 60
+# Zarf hedefe bu kadar (piksel) yakınsa ve hedef değişmiyorsa yeniden çizme
+SETTLE_EPSILON = 0.5
 
 class SoundWave(QWidget):
+    # Ses thread'i, zarf oturmuşken yeni hedef ürettiğinde yayılır (UI thread'inde işlenir)
+    target_changed = pyqtSignal()
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setMinimumSize(320, 180)
@@ -35,6 +45,11 @@ class SoundWave(QWidget):
         self.text_color = QColor(80, 255, 120)  # Parlak yeşil metin
         self.border_color = QColor(80, 255, 120)  # Yeşil kenarlık
         self.detail_color = QColor(80, 255, 120)  # Detay rengi
+        
+        # Pixel-art çerçeve
+        self.frame_margin = 12
+        self.frame = RetroFrame(self.bg_color, self.grid_color, self.border_color,
+                                margin=self.frame_margin, tick_offset=30)
 
         # --- FFT frekans ekseni ve eşit bant indeksleri ---
         self.freqs = np.fft.rfftfreq(self.fft_size, 1/self.sample_rate)
@@ -48,10 +63,13 @@ class SoundWave(QWidget):
         if self.device is None:
             raise RuntimeError("VB-Cable Output bulunamadı")
 
-        # --- UI Timer & Audio Thread ---
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self._update)
-        self.timer.start(16)
+        # --- Animasyon (ortak kare saati) & Audio Thread ---
+        self.animation_clock = AnimationClock.shared()
+        self._drawn_target = None
+        # Zarf hedefe oturdu ve kare saatinden çıkıldı; hedef değişince yeniden başlar
+        self._settled = False
+        self._settled_at = None
+        self.target_changed.connect(self._wake)
         threading.Thread(target=self._audio_loop, daemon=True).start()
 
     def _audio_callback(self, indata, frames, t, status):
@@ -71,7 +89,9 @@ class SoundWave(QWidget):
                 rms = np.sqrt(np.mean(buf**2))
 
                 if rms < self.silence_threshold:
-                    self.target.fill(2.0)
+                    if not (self.target == 2.0).all():
+                        self.target.fill(2.0)
+                        self._notify_target()
                 else:
                     mag = np.abs(np.fft.rfft(buf))
                     vals = np.empty(self.num_bands, dtype=np.float32)
@@ -82,24 +102,56 @@ class SoundWave(QWidget):
                     # Hedef yükseklik: oran * pencere yüksekliği
                     h = self.height() - 40  # Margin için daha az alan
                     self.target = (vals / self.peaks) * h
+                    self._notify_target()
 
                 time.sleep(1/60)
 
-    def _update(self):
-        self.phase += 0.003
+    def _notify_target(self):
+        """Ses thread'i: durmuş animasyonu uyandır"""
+        if self._settled:
+            self._settled = False
+            self.target_changed.emit()
+
+    def _wake(self):
+        """Hedef değişti: kare saatine yeniden kaydol"""
+        self._settled = False
+        if self._settled_at is not None:
+            # Beklerken atlanan peak decay'i uygula
+            frames = (time.monotonic() - self._settled_at) / RATE_FRAME
+            self.peaks *= self.peak_decay ** frames
+            self._settled_at = None
+        if self.isVisible():
+            self.animation_clock.start(self, self._update, FRAME_INTERVAL)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._wake()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.animation_clock.stop(self)
+
+    def _update(self, dt):
+        frames = dt / RATE_FRAME
         # Peak decay burada uygulanıyor çok yavaş
-        self.peaks *= self.peak_decay
-
-        for i in range(self.num_bands):
-            t = self.target[i]
-            e = self.envelope[i]
-            if t > e:
-                e += (t - e) * self.attack_rate
-            else:
-                e += (t - e) * self.release_rate
-            self.envelope[i] = e
-
-        self.update()
+        self.peaks *= self.peak_decay ** frames
+
+        # Sessizlikte zarf hedefine oturmuşsa kare saatinden çık (renk kayması da bekler);
+        # ses thread'i yeni hedef ürettiğinde target_changed ile yeniden başlar
+        target = self.target
+        if target is self._drawn_target and np.abs(target - self.envelope).max() < SETTLE_EPSILON:
+            self._settled = True
+            self._settled_at = time.monotonic()
+            self.animation_clock.stop(self, self._update)
+            # Bayrak konmadan hemen önce gelen hedef kaçmasın
+            if self.target is not target or np.abs(self.target - self.envelope).max() >= SETTLE_EPSILON:
+                self._wake()
+            return False
+        self._drawn_target = target
+
+        self.phase += 0.003 * frames
+        rates = np.where(target > self.envelope, self.attack_rate, self.release_rate)
+        self.envelope += (target - self.envelope) * (1 - (1 - rates) ** frames)
 
     def paintEvent(self, event):
         painter = QPainter(self)
@@ -108,39 +160,9 @@ class SoundWave(QWidget):
         # Widget boyutları
         w, h = self.width(), self.height()
         
-        # Arka plan (gridli pixel art)
-        painter.fillRect(0, 0, w, h, self.bg_color)
-        
-        # Grid çizgileri
-        grid_size = 8
-        painter.setPen(QPen(self.grid_color, 1))
-        for x in range(0, w, grid_size):
-            painter.drawLine(x, 0, x, h)
-        for y in range(0, h, grid_size):
-            painter.drawLine(0, y, w, y)
-        
-        # Dış çerçeve (pixel-art)
-        painter.setPen(QPen(self.border_color, 4))
-        painter.setBrush(Qt.NoBrush)
-        margin = 12
-        painter.drawRect(margin, margin, w-2*margin, h-2*margin)
-        
-        # Köşe detayları
-        painter.setPen(QPen(self.border_color, 4))
-        for dx in [0, w-2*margin]:
-            for dy in [0, h-2*margin]:
-                painter.drawPoint(margin+dx, margin+dy)
-        
-        # Yan çıkıntılar
-        painter.setPen(QPen(self.border_color, 4))
-        painter.drawLine(margin-8, h//2-30, margin, h//2-30)
-        painter.drawLine(margin-8, h//2+30, margin, h//2+30)
-        painter.drawLine(w-margin+8, h//2-30, w-margin, h//2-30)
-        painter.drawLine(w-margin+8, h//2+30, w-margin, h//2+30)
-        
-        # Üst ve alt detay çizgiler
-        painter.drawLine(margin+24, margin-8, w-margin-24, margin-8)
-        painter.drawLine(margin+24, h-margin+8, w-margin-24, h-margin+8)
+        # Statik arka plan ve çerçeve (önbellekteki pixmap)
+        self.frame.draw(painter, self)
+        margin = self.frame_margin
 
         # Ses dalgaları (pixel art tarzında)
         spacing = 2
@@ -172,7 +194,7 @@ class SoundWave(QWidget):
         painter.drawText(margin + 15, margin + 20, "SES SPEKTRUM — PIXEL ART")
 
     def cleanup(self):
-        self.timer.stop()
+        self.animation_clock.stop(self)
     
     def toggle_listening(self):
         """Mikrofon dinleme durumunu değiştir"""
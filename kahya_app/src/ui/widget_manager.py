@@ -2,6 +2,7 @@ import json
 import os
 from PyQt5.QtWidgets import QApplication, QDesktopWidget
 from PyQt5.QtCore import QObject, pyqtSignal
+from src.ui.change_bus import ChangeBus, WIDGET_CONFIG
 from .draggable_widget import DraggableWidget
 
 class WidgetManager(QObject):
@@ -51,6 +52,7 @@ class WidgetManager(QObject):
             with open(self.config_file, 'w', encoding='utf-8') as f:
                 json.dump(self.config, f, indent=2, ensure_ascii=False)
             self.config_changed.emit()
+            ChangeBus.shared().publish(WIDGET_CONFIG)
         except Exception as e:
             print(f"Konfigürasyon kaydetme hatası: {e}")
             